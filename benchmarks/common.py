@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+import typing
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+_application = None
+
+
+def get_application() -> QApplication:
+    """
+    Return running QApplication or create new one.
+
+    Returns:
+        QApplication: application instance
+    """
+    global _application
+    if _application is None:
+        _application = QApplication.instance() or QApplication(sys.argv)
+    return _application
+
+
+def wait_until(condition: typing.Callable[[], bool], timeout: float = 120.0) -> None:
+    """
+    Process events until condition is true.
+
+    Args:
+        condition(typing.Callable[[], bool]): function returning True when waiting should stop
+        timeout(float): maximal waiting time in seconds
+    """
+    app = get_application()
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("condition not met in {} seconds".format(timeout))
+        app.processEvents()
+
+
+def report(name: str, seconds: float) -> None:
+    """
+    Print result of one benchmark case.
+
+    Args:
+        name(str): name of case
+        seconds(float): measured time
+    """
+    print("{:<50} {:>10.1f} ms".format(name, seconds * 1000))
@@ -0,0 +1,96 @@
+"""
+Measure memory and scroll latency of file tree model with many entries
+and compare it with QTreeWidget populated by QTreeWidgetItems.
+
+Usage: python -m benchmarks.file_tree [entries]
+"""
+import os
+import random
+import sys
+import time
+
+from benchmarks.common import get_application, report
+
+from PyQt5.QtWidgets import QTreeView, QTreeWidget, QTreeWidgetItem
+
+from pride.widgets.file_tree_model import FileTreeModel, FileNode
+
+
+DIRS = 1000
+
+
+def rss() -> int:
+    """
+    Returns:
+        int: resident memory of process in bytes
+    """
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def build_model(entries: int) -> FileTreeModel:
+    """
+    Build model with DIRS directories and entries files without touching disk.
+    """
+    model = FileTreeModel()
+    model.add_root("/synthetic")
+    root = model._roots[0]
+    files_per_dir = entries // DIRS
+    model.beginResetModel()
+    root.children = [FileNode("dir_{}".format(i), root, i, True) for i in range(DIRS)]
+    for directory in root.children:
+        directory.children = [FileNode("file_{}.py".format(i), directory, i, False) for i in range(files_per_dir)]
+    model.endResetModel()
+    return model
+
+
+def build_tree_widget(entries: int) -> QTreeWidget:
+    """
+    Build QTreeWidget with the same content as build_model.
+    """
+    tree_widget = QTreeWidget()
+    root = QTreeWidgetItem(tree_widget, ["/synthetic"])
+    files_per_dir = entries // DIRS
+    for i in range(DIRS):
+        directory = QTreeWidgetItem(root, ["dir_{}".format(i)])
+        directory.addChildren([QTreeWidgetItem(None, ["file_{}.py".format(j)]) for j in range(files_per_dir)])
+    return tree_widget
+
+
+def scroll_latency(view, steps: int = 200) -> float:
+    """
+    Expand whole tree, jump to random positions and repaint.
+
+    Returns:
+        float: average time of one scroll step
+    """
+    view.resize(400, 800)
+    view.show()
+    view.expandAll()
+    get_application().processEvents()
+    scroll_bar = view.verticalScrollBar()
+    random.seed(0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        scroll_bar.setValue(random.randint(0, scroll_bar.maximum()))
+        view.viewport().repaint()
+    return (time.perf_counter() - start) / steps
+
+
+if __name__ == "__main__":
+    get_application()
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    before = rss()
+    model = build_model(entries)
+    print("{:<50} {:>10.1f} MB".format("model memory ({} entries)".format(entries), (rss() - before) / 2 ** 20))
+    view = QTreeView()
+    view.setUniformRowHeights(True)
+    view.setHeaderHidden(True)
+    view.setModel(model)
+    report("model scroll step ({} entries)".format(entries), scroll_latency(view))
+
+    before = rss()
+    tree_widget = build_tree_widget(entries)
+    print("{:<50} {:>10.1f} MB".format("tree widget memory ({} entries)".format(entries), (rss() - before) / 2 ** 20))
+    report("tree widget scroll step ({} entries)".format(entries), scroll_latency(tree_widget))
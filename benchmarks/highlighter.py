@@ -0,0 +1,135 @@
+"""
+Measure keystroke to repaint latency of highlighted code editor
+on large python file. Incremental highlighter is compared with
+QSyntaxHighlighter, which highlights all affected blocks at once.
+
+Usage: python -m benchmarks.highlighter [lines]
+"""
+import statistics
+import sys
+import time
+
+from PyQt5.QtCore import Qt, QEvent
+from PyQt5.QtGui import QKeyEvent, QSyntaxHighlighter, QTextCursor, QTextDocument
+
+from benchmarks.common import get_application, wait_until, report
+
+from pride.highlighters import PythonHighlighter
+from pride.widgets.code_editor import CodeEditorWidget
+
+#  count of measured keystrokes of every case
+KEYSTROKES = 50
+
+_SOURCE = '''
+class Value{0}(object):
+    """
+    Generated class number {0}.
+    """
+
+    def __init__(self, name: str = "value_{0}", items=(1, 2, 3)):
+        self.name = name  # name of value
+        self.items = [item * 0x{0:X} for item in items]
+
+    @property
+    def size(self) -> int:
+        return len(self.items) + {0}
+'''
+
+
+class ReferenceHighlighter(QSyntaxHighlighter):
+    """
+    QSyntaxHighlighter using the same rules as PythonHighlighter.
+    """
+
+    def __init__(self, document: QTextDocument):
+        QSyntaxHighlighter.__init__(self, document)
+        self._rules = PythonHighlighter(QTextDocument())
+
+    def highlightBlock(self, text: str) -> None:
+        formats, state = self._rules.highlight_block(text, max(self.previousBlockState(), 0))
+        for start, length, text_format in formats:
+            self.setFormat(start, length, text_format)
+        self.setCurrentBlockState(state)
+
+
+def create_editor(lines: int, highlighter) -> CodeEditorWidget:
+    """
+    Create editor with generated python code and wait until it is highlighted.
+
+    Args:
+        lines(int): approximate count of lines
+        highlighter: None, "incremental" or "reference"
+
+    Returns:
+        CodeEditorWidget: editor widget
+    """
+    code_editor = CodeEditorWidget()
+    code_editor.resize(800, 600)
+    code_editor.show()
+    text = "".join(_SOURCE.format(i) for i in range(lines // _SOURCE.count("\n")))
+    document = code_editor._code_editor.document()
+    if highlighter == "incremental":
+        code_editor.set_highlighter(PythonHighlighter)
+    elif highlighter == "reference":
+        code_editor.reference = ReferenceHighlighter(document)
+    code_editor._code_editor.setPlainText(text)
+    if highlighter == "incremental":
+        wait_until(code_editor.highlighter.is_finished)
+    code_editor.go_to_line(document.blockCount() // 2)
+    get_application().processEvents()
+    return code_editor
+
+
+def type_keys(code_editor: CodeEditorWidget, text: str) -> list:
+    """
+    Type text to editor and measure time of each key press and following repaint.
+
+    Args:
+        code_editor(CodeEditorWidget): editor widget
+        text(str): typed text
+
+    Returns:
+        list: latencies in seconds
+    """
+    edit = code_editor._code_editor
+    latencies = []
+    for character in text:
+        key = Qt.Key_QuoteDbl if character == '"' else Qt.Key_A
+        start = time.perf_counter()
+        get_application().sendEvent(edit, QKeyEvent(QEvent.KeyPress, key, Qt.NoModifier, character))
+        edit.viewport().repaint()
+        latencies.append(time.perf_counter() - start)
+        get_application().processEvents()  # idle highlighting between keystrokes
+    return latencies
+
+
+def run_case(lines: int, highlighter) -> None:
+    """
+    Measure typing of plain characters and typing of quotes,
+    which open and close triple quoted string.
+
+    Args:
+        lines(int): approximate count of lines
+        highlighter: None, "incremental" or "reference"
+    """
+    code_editor = create_editor(lines, highlighter)
+    name = highlighter or "none"
+
+    latencies = type_keys(code_editor, "a" * KEYSTROKES)
+    report("typing, {} highlighter, median".format(name), statistics.median(latencies))
+    report("typing, {} highlighter, max".format(name), max(latencies))
+
+    cursor = code_editor.get_cursor()
+    cursor.movePosition(QTextCursor.StartOfBlock)
+    code_editor._code_editor.setTextCursor(cursor)
+    latencies = type_keys(code_editor, '"' * 6 * (KEYSTROKES // 6))
+    report("typing triple quotes, {} highlighter, median".format(name), statistics.median(latencies))
+    report("typing triple quotes, {} highlighter, max".format(name), max(latencies))
+    code_editor.close()
+
+
+if __name__ == "__main__":
+    get_application()
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    for case in (None, "reference", "incremental"):
+        run_case(line_count, case)
@@ -0,0 +1,104 @@
+"""
+Measure overhead of journal of unsaved changes per keystroke. Keystrokes
+are sent alternately to editor without journal and to editor with journal
+of the same file, so both are measured under the same conditions. Time
+of flush of buffered changes is measured too. Rewrite of the whole text,
+which journal replaces, is measured for comparison.
+
+Usage: python -m benchmarks.journal [lines]
+"""
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import typing
+
+from PyQt5.QtCore import Qt, QEvent
+from PyQt5.QtGui import QKeyEvent
+
+from benchmarks.common import get_application, wait_until, report
+
+from pride.common.edit_journal import JournalWriter
+from pride.common.save_pipeline import write_atomically
+from pride.widgets.code_editor import CodeEditorWidget
+
+#  count of measured keystrokes of every case
+KEYSTROKES = 2000
+
+
+def create_editor(file_path: str, journal_writer: JournalWriter) -> CodeEditorWidget:
+    """
+    Create editor with loaded file and cursor in the middle of it.
+
+    Args:
+        file_path(str): file path
+        journal_writer(JournalWriter): writer of journals
+
+    Returns:
+        CodeEditorWidget: editor widget
+    """
+    code_editor = CodeEditorWidget()
+    code_editor.journal_writer = journal_writer
+    code_editor.opened_file = file_path
+    code_editor.load_file(file_path)
+    wait_until(lambda: not code_editor.loading)
+    code_editor.go_to_line(code_editor.get_document().blockCount() // 2)
+    return code_editor
+
+
+def type_keys(code_editors: typing.List[CodeEditorWidget]) -> typing.List[typing.List[float]]:
+    """
+    Type words to editors, every key is pressed in all editors, and measure time of each key press.
+
+    Args:
+        code_editors(typing.List[CodeEditorWidget]): editor widgets
+
+    Returns:
+        typing.List[typing.List[float]]: latencies of every editor in seconds
+    """
+    latencies = [[] for _ in code_editors]
+    for idx in range(KEYSTROKES):
+        character = " " if idx % 6 == 5 else "a"
+        key = Qt.Key_Space if character == " " else Qt.Key_A
+        for code_editor, editor_latencies in zip(code_editors, latencies):
+            start = time.perf_counter()
+            get_application().sendEvent(code_editor._code_editor,
+                                        QKeyEvent(QEvent.KeyPress, key, Qt.NoModifier, character))
+            editor_latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+if __name__ == "__main__":
+    get_application()
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    work_directory = tempfile.mkdtemp(prefix="pride_journal_")
+    try:
+        path = os.path.join(work_directory, "module.py")
+        with open(path, 'w') as f:
+            f.writelines("value_{0} = [{0}, {0} * 2, {0} * 3]\n".format(i) for i in range(line_count))
+
+        writer = JournalWriter(os.path.join(work_directory, "journals"))
+        plain_editor = create_editor(path, JournalWriter())
+        editor = create_editor(path, writer)
+        without_journal, with_journal = type_keys([plain_editor, editor])
+        plain_editor.close()
+        start = time.perf_counter()
+        writer.flush()
+        flush = time.perf_counter() - start
+        writer.shutdown()
+
+        start = time.perf_counter()
+        write_atomically(os.path.join(work_directory, "snapshot.py"), editor.get_plain_text())
+        snapshot = time.perf_counter() - start
+        editor.close()
+    finally:
+        shutil.rmtree(work_directory)
+
+    report("keystroke without journal, median", statistics.median(without_journal))
+    report("keystroke with journal, median", statistics.median(with_journal))
+    print("{:<50} {:>10.1f} us".format("journal overhead per keystroke, median",
+                                       (statistics.median(with_journal) - statistics.median(without_journal)) * 1e6))
+    report("flush of {} buffered changes".format(KEYSTROKES), flush)
+    report("rewrite of whole text ({} lines)".format(line_count), snapshot)
@@ -0,0 +1,111 @@
+"""
+Measure paint time of line number bar while scrolling through large document.
+Previous implementation repainted the whole bar with new text layout of every number.
+
+Usage: python -m benchmarks.line_numbers [lines]
+"""
+import sys
+import time
+
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QPaintEvent, QPainter, QColor
+from PyQt5.QtWidgets import QWidget, QHBoxLayout
+
+from benchmarks.common import get_application, report
+
+from pride.widgets.code_editor import CodeEdit, LinesNumberBar
+
+#  scrolled lines per step, like fast mouse wheel
+SCROLL_STEP = 3
+
+
+class TimedLinesNumberBar(LinesNumberBar):
+    """
+    LinesNumberBar which sums time spent in paintEvent.
+    """
+
+    paint_time = 0.0
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        start = time.perf_counter()
+        LinesNumberBar.paintEvent(self, event)
+        self.paint_time += time.perf_counter() - start
+
+
+class ReferenceLinesNumberBar(QWidget):
+    """
+    Previous implementation of LinesNumberBar.
+    """
+
+    paint_time = 0.0
+
+    def __init__(self, code_editor: CodeEdit, parent=None):
+        QWidget.__init__(self, parent)
+        self.editor = code_editor
+        self.editor.updateRequest.connect(self.update)
+        self.setFixedWidth(self.fontMetrics().width("100000") + 30)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        start = time.perf_counter()
+        font_height = self.fontMetrics().height()
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), QColor("#d3d7cf"))
+        painter.drawRect(0, 0, event.rect().width() - 1, event.rect().height() - 1)
+        font = painter.font()
+        block = self.editor.firstVisibleBlock()
+        line_number = block.blockNumber()
+        current_line = self.editor.textCursor().blockNumber()
+        while block.isValid():
+            block_top = self.editor.blockBoundingGeometry(block).translated(self.editor.contentOffset()).top()
+            if not block.isVisible() or block_top >= event.rect().bottom():
+                break
+            number_rect = QRect(5, int(block_top), self.width() - 5, font_height)
+            font.setBold(line_number == current_line)
+            painter.setFont(font)
+            painter.drawText(number_rect, Qt.AlignLeft, str(line_number + 1))
+            block = block.next()
+            line_number += 1
+        painter.end()
+        self.paint_time += time.perf_counter() - start
+
+
+def scroll_through(bar_class, lines: int) -> float:
+    """
+    Scroll through whole document and return time spent painting the bar.
+
+    Args:
+        bar_class: class of line number bar
+        lines(int): count of lines of document
+
+    Returns:
+        float: paint time in seconds
+    """
+    app = get_application()
+    widget = QWidget()
+    editor = CodeEdit(widget)
+    bar = bar_class(editor, widget)
+    layout = QHBoxLayout(widget)
+    layout.addWidget(bar)
+    layout.addWidget(editor)
+    widget.resize(800, 1000)
+    widget.show()
+
+    editor.setPlainText("\n".join("value_{0} = {0}".format(i) for i in range(lines)))
+    app.processEvents()
+    bar.paint_time = 0.0
+
+    scroll_bar = editor.verticalScrollBar()
+    for value in range(0, scroll_bar.maximum(), SCROLL_STEP):
+        scroll_bar.setValue(value)
+        app.processEvents()
+    widget.close()
+    return bar.paint_time
+
+
+if __name__ == "__main__":
+    get_application()
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    report("line numbers scroll, previous ({} lines)".format(line_count),
+           scroll_through(ReferenceLinesNumberBar, line_count))
+    report("line numbers scroll, cached ({} lines)".format(line_count),
+           scroll_through(TimedLinesNumberBar, line_count))
@@ -0,0 +1,69 @@
+"""
+Compare per line loading of file to code editor with chunked background loading.
+
+Usage: python -m benchmarks.load_file [lines]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.common import get_application, wait_until, report
+
+from pride.widgets.code_editor import CodeEditorWidget
+
+
+def create_file(lines: int) -> str:
+    """
+    Create generated python module with given count of lines.
+
+    Args:
+        lines(int): count of lines
+
+    Returns:
+        str: file path
+    """
+    fd, file_path = tempfile.mkstemp(suffix=".py")
+    with os.fdopen(fd, 'w') as f:
+        for i in range(lines):
+            f.write("VALUE_{0} = {{'index': {0}, 'name': 'value_{0}'}}\n".format(i))
+    return file_path
+
+
+def load_per_line(file_path: str) -> float:
+    """
+    Previous implementation of CodeEditorWidget.load_file.
+    """
+    code_editor = CodeEditorWidget()
+    code_editor.show()
+    start = time.perf_counter()
+    with open(file_path, 'r') as f:
+        code_editor._code_editor.clear()
+        for line in f:
+            code_editor._code_editor.insertPlainText(line)
+    get_application().processEvents()
+    return time.perf_counter() - start
+
+
+def load_chunked(file_path: str) -> float:
+    """
+    Current implementation of CodeEditorWidget.load_file.
+    Measures time until the whole text is in document.
+    """
+    code_editor = CodeEditorWidget()
+    code_editor.show()
+    start = time.perf_counter()
+    code_editor.load_file(file_path)
+    wait_until(lambda: not code_editor.loading)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    get_application()
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    path = create_file(lines)
+    try:
+        report("load_file per line ({} lines)".format(lines), load_per_line(path))
+        report("load_file chunked ({} lines)".format(lines), load_chunked(path))
+    finally:
+        os.remove(path)
@@ -0,0 +1,88 @@
+"""
+Measure time to first paint of directory tree after OpenedFilesWidget.open_dir
+on synthetic tree and compare it with recursive population of whole tree.
+
+Usage: python -m benchmarks.open_dir [files]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.common import get_application, wait_until, report
+
+from PyQt5.QtWidgets import QTreeWidget, QTreeWidgetItem
+
+from pride.widgets.opened_files import OpenedFilesWidget
+
+
+def create_tree(files: int, files_per_dir: int = 100, dirs_per_dir: int = 50) -> str:
+    """
+    Create synthetic directory tree with two levels of directories.
+
+    Args:
+        files(int): count of files
+        files_per_dir(int): count of files in leaf directory
+        dirs_per_dir(int): count of subdirectories in directory
+
+    Returns:
+        str: root path
+    """
+    root = tempfile.mkdtemp(prefix="pride_tree_")
+    leaf_dirs = max(1, files // files_per_dir)
+    for leaf in range(leaf_dirs):
+        path = os.path.join(root, "package_{}".format(leaf // dirs_per_dir), "module_{}".format(leaf % dirs_per_dir))
+        os.makedirs(path)
+        for i in range(files_per_dir):
+            open(os.path.join(path, "file_{}.py".format(i)), 'w').close()
+    return root
+
+
+def populate_recursive(path: str, tree) -> None:
+    """
+    Previous implementation of OpenedFilesWidget._add_dirs.
+    """
+    for element in os.scandir(path):
+        parent_item = QTreeWidgetItem(tree, [os.path.basename(element)])
+
+        if element.is_dir():
+            populate_recursive(element.path, parent_item)
+
+
+def first_paint_recursive(root: str) -> float:
+    """
+    Time until tree populated by previous implementation is painted.
+    """
+    widget = QTreeWidget()
+    widget.show()
+    start = time.perf_counter()
+    parent_folder = QTreeWidgetItem(widget, [root])
+    populate_recursive(root, parent_folder)
+    widget.repaint()
+    return time.perf_counter() - start
+
+
+def first_paint_lazy(root: str) -> float:
+    """
+    Time until tree with root directory is painted.
+    """
+    widget = OpenedFilesWidget()
+    widget.show()
+    start = time.perf_counter()
+    widget.open_dir(root)
+    widget.repaint()
+    first_paint = time.perf_counter() - start
+    wait_until(lambda: not widget.tree_model.is_scanning())
+    return first_paint
+
+
+if __name__ == "__main__":
+    get_application()
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    root = create_tree(files)
+    try:
+        report("open_dir lazy first paint ({} files)".format(files), first_paint_lazy(root))
+        report("open_dir recursive first paint ({} files)".format(files), first_paint_recursive(root))
+    finally:
+        shutil.rmtree(root)
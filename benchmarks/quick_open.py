@@ -0,0 +1,76 @@
+"""
+Measure query latency of quick open path index.
+Every keystroke of typed query is measured until the first results
+(one time slice) and until all candidates are ranked.
+
+Usage: python -m benchmarks.quick_open [paths]
+"""
+import random
+import sys
+import time
+
+from benchmarks.common import get_application, report
+
+from pride.common.path_index import PathIndex, _LENGTH_SHIFT
+
+#  time slice of matching used by quick open dialog (s)
+TIME_SLICE = 0.008
+
+_WORDS = ("core", "util", "widget", "model", "view", "test", "data", "io", "net", "http",
+          "parser", "lexer", "token", "common", "config", "main", "app", "server", "client", "api")
+
+
+def create_index(count: int) -> PathIndex:
+    """
+    Create index of generated paths without walking file system.
+
+    Args:
+        count(int): count of paths
+
+    Returns:
+        PathIndex: path index
+    """
+    generator = random.Random(0)
+    paths = []
+    for i in range(count):
+        directories = "/".join(generator.choice(_WORDS) + str(generator.randint(0, 30))
+                               for _ in range(generator.randint(2, 6)))
+        paths.append("/home/user/project/{}/{}_{}.{}".format(
+            directories, generator.choice(_WORDS), i, generator.choice(("py", "txt", "c", "h", "js"))))
+
+    index = PathIndex()
+    lower_paths = [path[len("/home/user/"):].lower() for path in paths]
+    lower_names = [path.rsplit("/", 1)[1] for path in lower_paths]
+    length_ranks = [len(path) << _LENGTH_SHIFT for path in lower_paths]
+    index._roots["/home/user/project"] = (paths, lower_paths, lower_names, length_ranks, 0)
+    index._rebuild()
+    return index
+
+
+def type_query(index: PathIndex, query: str) -> None:
+    """
+    Type query char by char, reusing matcher of previous prefix.
+
+    Args:
+        index(PathIndex): path index
+        query(str): typed query
+    """
+    matcher = None
+    for length in range(1, len(query) + 1):
+        start = time.perf_counter()
+        matcher = index.match(query[:length], matcher)
+        matcher.advance(start + TIME_SLICE)
+        first_results = time.perf_counter() - start
+        while not matcher.advance(time.perf_counter() + TIME_SLICE):
+            pass
+        all_results = time.perf_counter() - start
+        report("'{}' first results".format(query[:length]), first_results)
+        report("'{}' all ranked ({} results)".format(query[:length], len(matcher.results())), all_results)
+
+
+if __name__ == "__main__":
+    get_application()
+    path_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    path_index = create_index(path_count)
+    type_query(path_index, "mainpy")
+    type_query(path_index, "widget_123")
@@ -0,0 +1,60 @@
+"""
+Measure startup of the IDE restoring session with many tabs and compare it
+with startup without session. Only file of current tab should be read,
+so restored session should add almost nothing to the first paint.
+
+Usage: python -m benchmarks.session [tabs] [runs]
+"""
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+
+from benchmarks.startup import run_once
+from pride.common.session import Session, SessionTab, save_session
+
+#  size of every file of session, big enough that reading all of them would show (bytes)
+_FILE_SIZE = 256 * 1024
+
+
+def create_session(directory: str, tabs: int) -> None:
+    """
+    Create files and session file with tab of every file in XDG state directory.
+
+    Args:
+        directory(str): directory used as XDG_STATE_HOME and for files
+        tabs(int): count of tabs
+    """
+    files_directory = os.path.join(directory, "files")
+    os.makedirs(files_directory)
+    line = "value = [{}]\n".format(", ".join(str(i) for i in range(20)))
+    paths = []
+    for i in range(tabs):
+        path = os.path.join(files_directory, "module_{}.py".format(i))
+        with open(path, 'w') as f:
+            f.write(line * (_FILE_SIZE // len(line)))
+        paths.append(path)
+
+    session_tabs = [SessionTab(path, (len(line) * i, 0)) for i, path in enumerate(paths)]
+    save_session(os.path.join(directory, "pride", "session.json"),
+                 Session(session_tabs, tabs // 2, [files_directory], [200, 800]))
+
+
+if __name__ == "__main__":
+    tab_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    run_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    state_directory = tempfile.mkdtemp(prefix="pride_session_")
+    try:
+        create_session(state_directory, tab_count)
+        without_session = [run_once() for _ in range(run_count)]
+        with_session = [run_once((), {"XDG_STATE_HOME": state_directory}) for _ in range(run_count)]
+    finally:
+        shutil.rmtree(state_directory)
+
+    print("{:<30} {:>13} {:>13}".format("", "no session", "{} tabs".format(tab_count)))
+    for name in ("restore session", "first paint", "initialized"):
+        print("{:<30} {:>10.1f} ms {:>10.1f} ms".format(
+            name,
+            statistics.median(run.get(name, 0.0) for run in without_session),
+            statistics.median(run.get(name, 0.0) for run in with_session)))
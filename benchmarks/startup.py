@@ -0,0 +1,70 @@
+"""
+Measure time to first paint of the IDE in fresh headless processes.
+Every run starts new interpreter, so imports are included. Steps of startup
+are taken from startup timeline of the child process.
+
+Usage: python -m benchmarks.startup [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+from pride.common.startup_timeline import STARTUP_TIMELINE_VARIABLE
+from pride.main import NO_SESSION_OPTION
+
+#  code of child process, it closes the window when hidden panels are created
+#  and exits when background workers are finished
+_CHILD = ("import sys\n"
+          "from PyQt5.QtCore import QThreadPool\n"
+          "from pride.main import start\n"
+          "app, window = start(['pride'] + sys.argv[1:])\n"
+          "window.initialized.connect(window.close)\n"
+          "app.exec_()\n"
+          "QThreadPool.globalInstance().waitForDone()\n")
+
+
+def run_once(arguments: typing.Sequence[str] = (NO_SESSION_OPTION,),
+             environment: typing.Optional[typing.Dict[str, str]] = None) -> dict:
+    """
+    Start IDE in child process and read its startup timeline.
+
+    Args:
+        arguments(typing.Sequence[str]): command line arguments of IDE
+        environment(typing.Optional[typing.Dict[str, str]]): additional environment variables
+
+    Returns:
+        dict: milliseconds of process, first paint, initialization and top level steps
+    """
+    fd, timeline_path = tempfile.mkstemp(prefix="pride_startup_", suffix=".json")
+    os.close(fd)
+    environment = dict(os.environ, QT_QPA_PLATFORM="offscreen", **{STARTUP_TIMELINE_VARIABLE: timeline_path},
+                       **(environment or dict()))
+    environment["PYTHONPATH"] = os.pathsep.join(filter(None, (os.getcwd(), environment.get("PYTHONPATH"))))
+    try:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", _CHILD] + list(arguments), env=environment, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        process_time = (time.perf_counter() - start) * 1000
+        with open(timeline_path, 'r', encoding="utf-8") as f:
+            events = json.load(f)["events"]
+    finally:
+        os.remove(timeline_path)
+
+    result = {"process": process_time}
+    for event in events:
+        if event["depth"] <= 1:
+            result[event["name"]] = event["start"] if event["duration"] == 0 else event["duration"]
+    return result
+
+
+if __name__ == "__main__":
+    run_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    runs = [run_once() for _ in range(run_count)]
+    for name in runs[0]:
+        values = [run[name] for run in runs if name in run]
+        print("{:<50} {:>10.1f} ms".format(name, statistics.median(values)))
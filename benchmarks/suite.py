@@ -0,0 +1,317 @@
+"""
+Suite of headless benchmarks of the editor and file tree. Every case is run
+several times and its median is reported. Results can be saved as JSON baseline
+and compared with it later, comparison fails when some case is slower than
+its baseline by more than threshold.
+
+Usage:
+    python -m benchmarks.suite [--repeat N] [--output results.json]
+                               [--compare baseline.json] [--threshold 0.25] [case ...]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import typing
+
+os.environ.setdefault("PRIDE_TRIGRAM_INDEX", "0")  # indexing of directories has own benchmark
+
+from PyQt5.QtCore import QThreadPool
+
+from benchmarks.common import get_application, wait_until
+from benchmarks.line_numbers import TimedLinesNumberBar, scroll_through
+from benchmarks.load_file import create_file
+from benchmarks.open_dir import create_tree
+
+from pride.widgets.code_editor import CodeEditorTabWidget, CodeEditorWidget
+from pride.widgets.opened_files import OpenedFilesWidget
+
+
+#  version of results format
+RESULTS_VERSION = 1
+#  relative slowdown against baseline reported as regression
+DEFAULT_THRESHOLD = 0.25
+#  slowdowns smaller than this are noise of short cases (s)
+MIN_REGRESSION = 0.005
+
+#  count of lines of file loaded and saved by cases
+_FILE_LINES = 200000
+#  count of files of synthetic directory tree
+_TREE_FILES = 100000
+#  count of lines of document scrolled by line numbers case
+_SCROLL_LINES = 10000
+#  count of tabs and lines of their files in tab switching case
+_TABS = 100
+_TAB_LINES = 2000
+
+
+def load_file(work_directory: str) -> typing.Callable[[], float]:
+    """
+    CodeEditorWidget.load_file of large file, until whole text is in document.
+    """
+    file_path = create_file(_FILE_LINES)
+    shutil.move(file_path, work_directory)
+
+    def run() -> float:
+        code_editor = CodeEditorWidget()
+        code_editor.show()
+        start = time.perf_counter()
+        code_editor.load_file(os.path.join(work_directory, os.path.basename(file_path)))
+        wait_until(lambda: not code_editor.loading)
+        elapsed = time.perf_counter() - start
+        code_editor.close()
+        code_editor.deleteLater()
+        return elapsed
+    return run
+
+
+def open_dir(work_directory: str) -> typing.Callable[[], float]:
+    """
+    OpenedFilesWidget.open_dir of synthetic tree, until the root is scanned and painted.
+    """
+    root = create_tree(_TREE_FILES)
+    shutil.move(root, work_directory)
+    root = os.path.join(work_directory, os.path.basename(root))
+
+    def run() -> float:
+        widget = OpenedFilesWidget()
+        widget.show()
+        start = time.perf_counter()
+        widget.open_dir(root)
+        wait_until(lambda: not widget.tree_model.is_scanning())
+        widget.repaint()
+        elapsed = time.perf_counter() - start
+        # indexes deliver their results to the widget, so it can't be deleted before them
+        wait_until(lambda: not (widget.path_index.is_indexing() or widget.symbol_index.is_indexing()
+                                or widget.trigram_indexes.is_updating()))
+        widget.symbol_index.shutdown()
+        widget.trigram_indexes.shutdown()
+        widget.close()
+        widget.deleteLater()
+        QThreadPool.globalInstance().waitForDone()
+        return elapsed
+    return run
+
+
+def line_numbers_scroll(work_directory: str) -> typing.Callable[[], float]:
+    """
+    Time spent in LinesNumberBar.paintEvent while scrolling through large document.
+    """
+    return lambda: scroll_through(TimedLinesNumberBar, _SCROLL_LINES)
+
+
+def tab_switch(work_directory: str) -> typing.Callable[[], float]:
+    """
+    Activating every tab of CodeEditorTabWidget with many tabs twice,
+    the first activation loads the file.
+    """
+    file_paths = []
+    for i in range(_TABS):
+        file_path = create_file(_TAB_LINES)
+        shutil.move(file_path, work_directory)
+        file_paths.append(os.path.join(work_directory, os.path.basename(file_path)))
+
+    def run() -> float:
+        tab_widget = CodeEditorTabWidget()
+        tab_widget.set_new_cursor_position_function = lambda line, column: None
+        tab_widget.resize(1000, 800)
+        tab_widget.show()
+        for file_path in file_paths:
+            tab_widget.open_file(file_path)
+        wait_until(lambda: not tab_widget.get_current_widget().loading)
+
+        start = time.perf_counter()
+        for _ in range(2):
+            for idx in range(tab_widget.tab_widget.count()):
+                tab_widget.tab_widget.setCurrentIndex(idx)
+                wait_until(lambda: not tab_widget.get_current_widget().loading)
+        elapsed = time.perf_counter() - start
+        tab_widget.close()
+        tab_widget.deleteLater()
+        return elapsed
+    return run
+
+
+def save_file(work_directory: str) -> typing.Callable[[], float]:
+    """
+    CodeEditorTabWidget.save_file of modified large file, until the file is written.
+    """
+    file_path = create_file(_FILE_LINES)
+    shutil.move(file_path, work_directory)
+    file_path = os.path.join(work_directory, os.path.basename(file_path))
+
+    def run() -> float:
+        tab_widget = CodeEditorTabWidget()
+        tab_widget.set_new_cursor_position_function = lambda line, column: None
+        tab_widget.show()
+        tab_widget.open_file(file_path)
+        wait_until(lambda: not tab_widget.get_current_widget().loading)
+        tab_widget.get_current_widget().get_cursor().insertText("# modified\n")
+
+        saved = []
+        tab_widget.save_pipeline.file_saved.connect(saved.append)
+        start = time.perf_counter()
+        tab_widget.save_file()
+        wait_until(lambda: bool(saved))
+        elapsed = time.perf_counter() - start
+        tab_widget.close()
+        tab_widget.deleteLater()
+        return elapsed
+    return run
+
+
+def reload_file(work_directory: str) -> typing.Callable[[], float]:
+    """
+    CodeEditorTabWidget.reload_file of large file with two externally changed lines, until document is updated.
+    """
+    file_path = create_file(_FILE_LINES)
+    shutil.move(file_path, work_directory)
+    file_path = os.path.join(work_directory, os.path.basename(file_path))
+    with open(file_path) as f:
+        lines = f.read().split("\n")
+
+    def run() -> float:
+        with open(file_path, 'w') as f:
+            f.write("\n".join(lines))
+        tab_widget = CodeEditorTabWidget()
+        tab_widget.set_new_cursor_position_function = lambda line, column: None
+        tab_widget.show()
+        tab_widget.open_file(file_path)
+        code_editor = tab_widget.get_current_widget()
+        wait_until(lambda: not code_editor.loading)
+        tab_widget.file_watcher.unwatch(file_path)  # reload is started only by the case
+
+        changed_lines = list(lines)
+        changed_lines[10] = "# changed"
+        changed_lines[len(lines) // 2] = "# changed"
+        with open(file_path, 'w') as f:
+            f.write("\n".join(changed_lines))
+        document = code_editor.get_document()
+        start = time.perf_counter()
+        tab_widget.reload_file(file_path)
+        wait_until(lambda: document.findBlockByNumber(len(lines) // 2).text() == "# changed")
+        elapsed = time.perf_counter() - start
+        tab_widget.close()
+        tab_widget.deleteLater()
+        return elapsed
+    return run
+
+
+#  cases by name, case prepares its data in work directory and returns function measuring one run
+CASES = {
+    "load_file": load_file,
+    "open_dir": open_dir,
+    "line_numbers_scroll": line_numbers_scroll,
+    "tab_switch": tab_switch,
+    "save_file": save_file,
+    "reload_file": reload_file,
+}
+
+
+def run_cases(names: typing.List[str], repeat: int) -> typing.Dict[str, typing.List[float]]:
+    """
+    Run cases and measure them.
+
+    Args:
+        names(typing.List[str]): names of run cases
+        repeat(int): count of runs of every case
+
+    Returns:
+        typing.Dict[str, typing.List[float]]: measured times by case (s)
+    """
+    get_application()
+    results = dict()
+    for name in names:
+        work_directory = tempfile.mkdtemp(prefix="pride_benchmark_")
+        try:
+            run = CASES[name](work_directory)
+            run()  # warm up caches of file system and imports
+            results[name] = [run() for _ in range(repeat)]
+        finally:
+            shutil.rmtree(work_directory)
+        print("{:<30} {:>10.1f} ms".format(name, statistics.median(results[name]) * 1000))
+    return results
+
+
+def compare(results: typing.Dict[str, typing.List[float]], baseline: dict, threshold: float) -> typing.List[str]:
+    """
+    Print medians of results against baseline.
+
+    Args:
+        results(typing.Dict[str, typing.List[float]]): measured times by case (s)
+        baseline(dict): saved results
+        threshold(float): relative slowdown reported as regression
+
+    Returns:
+        typing.List[str]: names of regressed cases
+    """
+    regressions = []
+    print("\n{:<30} {:>13} {:>13} {:>9}".format("case", "baseline", "current", "change"))
+    for name, times in results.items():
+        current = statistics.median(times)
+        if name not in baseline["cases"]:
+            print("{:<30} {:>13} {:>10.1f} ms".format(name, "-", current * 1000))
+            continue
+        previous = baseline["cases"][name]["median"]
+        change = (current - previous) / previous if previous else 0.0
+        regressed = change > threshold and current - previous > MIN_REGRESSION
+        if regressed:
+            regressions.append(name)
+        print("{:<30} {:>10.1f} ms {:>10.1f} ms {:>+8.0%}{}".format(
+            name, previous * 1000, current * 1000, change, "  REGRESSION" if regressed else ""))
+    return regressions
+
+
+def main(argv: typing.List[str]) -> int:
+    """
+    Run benchmark suite by command line arguments.
+
+    Args:
+        argv(typing.List[str]): command line arguments without program name
+
+    Returns:
+        int: exit status, 1 if some case regressed
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description="Headless benchmarks of pride")
+    parser.add_argument("cases", nargs="*", metavar="case",
+                        help="cases to run, all by default: {}".format(", ".join(CASES)))
+    parser.add_argument("--repeat", type=int, default=5, help="count of runs of every case")
+    parser.add_argument("--output", help="write results to JSON file, it can be used as baseline")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare results with JSON baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown which fails comparison (default {})".format(DEFAULT_THRESHOLD))
+    arguments = parser.parse_args(argv)
+    unknown_cases = [name for name in arguments.cases if name not in CASES]
+    if unknown_cases:
+        parser.error("unknown cases: {}".format(", ".join(unknown_cases)))
+
+    baseline = None
+    if arguments.compare:
+        with open(arguments.compare, 'r', encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("version") != RESULTS_VERSION:
+            parser.error("baseline has unsupported version")
+
+    results = run_cases(arguments.cases or list(CASES), arguments.repeat)
+
+    if arguments.output:
+        with open(arguments.output, 'w', encoding="utf-8") as f:
+            json.dump({
+                "version": RESULTS_VERSION,
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+                "cases": {name: {"median": statistics.median(times), "times": times} for name, times in results.items()},
+            }, f, indent=1)
+
+    if baseline is not None and compare(results, baseline, arguments.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
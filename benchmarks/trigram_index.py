@@ -0,0 +1,107 @@
+"""
+Measure trigram index of find in files on synthetic source tree:
+build time, size of index, update time without changes, time of check
+of changed files done by every indexed search and query time of indexed
+search compared with search of all files.
+
+Usage: python -m benchmarks.trigram_index [files]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.common import report
+
+from pride.common.file_search import search_files
+from pride.common.file_system import walk_files
+from pride.common.trigram_index import TrigramIndex, update_index
+
+_WORDS = ("self", "return", "value", "index", "model", "widget", "result", "path", "count", "items",
+          "parent", "document", "cursor", "signal", "thread", "search", "query", "buffer", "layout", "event")
+
+#  queries as literal or regular expression, rare ones profit from index
+_QUERIES = (("unique_identifier_42", False), ("document", False), (r"def \w+_7\(", True),
+            (r"class Widget9\d+", True), ("not present anywhere", False))
+
+
+def create_tree(files: int, lines: int = 200) -> str:
+    """
+    Create synthetic tree of python files.
+
+    Args:
+        files(int): count of files
+        lines(int): count of lines of every file
+
+    Returns:
+        str: root path
+    """
+    generator = random.Random(0)
+    root = tempfile.mkdtemp(prefix="pride_trigrams_")
+    for i in range(files):
+        path = os.path.join(root, "package_{}".format(i // 100))
+        os.makedirs(path, exist_ok=True)
+        content = ["class Widget{}:".format(i)]
+        for line in range(lines):
+            if line % 20 == 0:
+                content.append("    def {}_{}(self):".format(generator.choice(_WORDS), generator.randint(0, 99)))
+            else:
+                content.append("        " + " ".join(generator.choice(_WORDS) for _ in range(6)))
+        if i == files // 2:
+            content.append("unique_identifier_42 = 1")
+        with open(os.path.join(path, "module_{}.py".format(i)), 'w') as f:
+            f.write("\n".join(content))
+    return root
+
+
+def measure(root: str) -> None:
+    """
+    Report build, size and query times of index of root.
+
+    Args:
+        root(str): directory path
+    """
+    index_path = os.path.join(tempfile.mkdtemp(prefix="pride_index_"), "index")
+    source_size = sum(os.path.getsize(path) for path in walk_files(root))
+
+    start = time.perf_counter()
+    update_index(root, index_path)
+    report("build index", time.perf_counter() - start)
+    print("{:<50} {:>10.1f} MB ({:.0f} % of sources)".format(
+        "index size", os.path.getsize(index_path) / 2 ** 20, os.path.getsize(index_path) * 100 / source_size))
+
+    start = time.perf_counter()
+    update_index(root, index_path)
+    report("update unchanged index", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    index = TrigramIndex.load(root, index_path)
+    report("load index", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    assert not any(map(index.is_changed, walk_files(root)))
+    report("check changed files", time.perf_counter() - start)
+
+    for query, regex in _QUERIES:
+        start = time.perf_counter()
+        matches = search_files(walk_files(root), query, regex, False)
+        report("'{}' all files ({} matches)".format(query, len(matches)), time.perf_counter() - start)
+
+        start = time.perf_counter()
+        candidates = index.candidates(query, regex)
+        indexed_matches = search_files(candidates, query, regex, False)
+        assert len(indexed_matches) == len(matches)
+        report("'{}' indexed ({} candidates)".format(query, len(candidates)), time.perf_counter() - start)
+
+    shutil.rmtree(os.path.dirname(index_path))
+
+
+if __name__ == "__main__":
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    tree = create_tree(file_count)
+    try:
+        measure(tree)
+    finally:
+        shutil.rmtree(tree)
@@ -35,11 +35,11 @@ class Ui_OpenedFilesWidget(object):
         self.label.setFont(font)
         self.label.setObjectName("label")
         self.verticalLayout_2.addWidget(self.label)
-        self.tree_widget = QtWidgets.QTreeWidget(self.widget)
-        self.tree_widget.setHeaderHidden(True)
-        self.tree_widget.setObjectName("tree_widget")
-        self.tree_widget.headerItem().setText(0, "1")
-        self.verticalLayout_2.addWidget(self.tree_widget)
+        self.tree_view = QtWidgets.QTreeView(self.widget)
+        self.tree_view.setUniformRowHeights(True)
+        self.tree_view.setHeaderHidden(True)
+        self.tree_view.setObjectName("tree_view")
+        self.verticalLayout_2.addWidget(self.tree_view)
         self.widget_2 = QtWidgets.QWidget(self.splitter)
         self.widget_2.setObjectName("widget_2")
         self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.widget_2)
@@ -52,9 +52,9 @@ class Ui_OpenedFilesWidget(object):
         self.label_2.setFont(font)
         self.label_2.setObjectName("label_2")
         self.verticalLayout_3.addWidget(self.label_2)
-        self.list_widget = QtWidgets.QListWidget(self.widget_2)
-        self.list_widget.setObjectName("list_widget")
-        self.verticalLayout_3.addWidget(self.list_widget)
+        self.list_view = QtWidgets.QListView(self.widget_2)
+        self.list_view.setObjectName("list_view")
+        self.verticalLayout_3.addWidget(self.list_view)
         self.verticalLayout.addWidget(self.splitter)
 
         self.retranslateUi(OpenedFilesWidget)
@@ -0,0 +1,135 @@
+import itertools
+import os
+import typing
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+#  memory which can be held by editors of inactive unmodified documents (bytes)
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+
+class Document:
+    """
+    Opened document. Tab is object showing the document, it has to provide
+    methods is_loaded, is_modified, memory_usage and release.
+    """
+
+    def __init__(self, path: str, tab):
+        self.path = path
+        self.tab = tab
+        self.last_access = 0
+
+
+class DocumentRegistry(QObject):
+    """
+    Registry of all opened documents keyed by normalized real path.
+    It tracks order of activation, so editors of least recently used
+    documents can be released when they take more memory than the budget.
+    """
+
+    document_opened = pyqtSignal(str)
+    document_closed = pyqtSignal(str)
+    document_activated = pyqtSignal(str)
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET, parent=None):
+        QObject.__init__(self, parent)
+        self.memory_budget = memory_budget
+        self._documents = dict()
+        self._access_counter = itertools.count(1)
+
+    @staticmethod
+    def normalize(path: str) -> str:
+        """
+        Return normalized real path, so one file has always the same key.
+
+        Args:
+            path(str): file path
+
+        Returns:
+            str: normalized path
+        """
+        return os.path.normcase(os.path.realpath(path))
+
+    def __contains__(self, path: str) -> bool:
+        return self.normalize(path) in self._documents
+
+    def __iter__(self) -> typing.Iterator[Document]:
+        return iter(list(self._documents.values()))
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def get(self, path: str) -> typing.Optional[Document]:
+        """
+        Return document of path.
+
+        Args:
+            path(str): file path
+
+        Returns:
+            typing.Optional[Document]: document or None if path isn't opened
+        """
+        return self._documents.get(self.normalize(path))
+
+    def open(self, path: str, tab) -> Document:
+        """
+        Register new document.
+
+        Args:
+            path(str): file path
+            tab: object showing the document
+
+        Returns:
+            Document: registered document
+        """
+        document = Document(self.normalize(path), tab)
+        self._documents[document.path] = document
+        self.document_opened.emit(document.path)
+        return document
+
+    def close(self, path: str) -> None:
+        """
+        Unregister document.
+
+        Args:
+            path(str): file path
+        """
+        document = self._documents.pop(self.normalize(path), None)
+        if document is not None:
+            self.document_closed.emit(document.path)
+
+    def activate(self, path: str) -> None:
+        """
+        Mark document as the most recently used one.
+
+        Args:
+            path(str): file path
+        """
+        document = self.get(path)
+        if document is not None:
+            document.last_access = next(self._access_counter)
+            self.document_activated.emit(document.path)
+
+    def memory_usage(self) -> int:
+        """
+        Returns:
+            int: estimated memory used by loaded documents (bytes)
+        """
+        return sum(document.tab.memory_usage() for document in self._documents.values())
+
+    def release_inactive(self) -> None:
+        """
+        Release editors of least recently used unmodified documents
+        until memory of loaded documents fits into budget.
+        The most recently used document is never released.
+        """
+        usage = self.memory_usage()
+        documents = sorted(self._documents.values(), key=lambda document: document.last_access)[:-1]
+        for document in documents:
+            if usage <= self.memory_budget:
+                break
+            tab = document.tab
+            if tab.is_loaded() and not tab.is_modified():
+                usage -= tab.memory_usage()
+                tab.release()
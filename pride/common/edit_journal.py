@@ -0,0 +1,372 @@
+import json
+import os
+import typing
+import uuid
+
+from PyQt5.QtCore import QObject, QThreadPool, QTimer
+from PyQt5.QtGui import QTextCursor, QTextDocument
+
+from pride.common.file_format import FALLBACK_ENCODING, sniff_format
+from pride.common.file_system import STATE_DIRECTORY
+from pride.common.save_pipeline import write_atomically
+from pride.common.workers import Worker
+
+
+#  directory with journals of unsaved changes, one journal per modified document
+JOURNAL_DIRECTORY = os.path.join(STATE_DIRECTORY, "journals")
+#  version of journal format, journals of other versions are ignored
+JOURNAL_VERSION = 1
+#  extension of journal files
+JOURNAL_SUFFIX = ".jsonl"
+#  recorded changes are written and synced to disk in background after this interval (ms)
+SYNC_INTERVAL = 500
+#  journal is compacted to snapshot of text when it is this many times bigger than the text...
+COMPACT_RATIO = 4
+#  ...and bigger than this size (characters)
+COMPACT_MIN_SIZE = 1024 * 1024
+
+
+class FileState(typing.NamedTuple):
+    """
+    Size and modification time of file, journal is replayed only on file in the same state.
+    """
+
+    size: int
+    mtime_ns: int
+
+
+class SavedJournal(typing.NamedTuple):
+    """
+    Journal left on disk. Changes are applied either to saved file in state base or to text.
+    """
+
+    journal_path: str
+    file_path: typing.Optional[str]
+    pid: int
+    base: typing.Optional[FileState]
+    text: typing.Optional[str]
+    changes: typing.List[typing.Tuple[int, int, str]]
+
+
+def file_state(file: typing.Union[str, int]) -> typing.Optional[FileState]:
+    """
+    Args:
+        file(typing.Union[str, int]): file path or descriptor of opened file
+
+    Returns:
+        typing.Optional[FileState]: state of file or None if it can't be read
+    """
+    try:
+        stat = os.stat(file)
+    except OSError:
+        return None
+    return FileState(stat.st_size, stat.st_mtime_ns)
+
+
+def read_journal(journal_path: str) -> typing.Optional[SavedJournal]:
+    """
+    Read journal. Incomplete record at the end, written during crash, is ignored.
+
+    Args:
+        journal_path(str): path of journal file
+
+    Returns:
+        typing.Optional[SavedJournal]: journal or None if it is damaged or of other version
+    """
+    try:
+        with open(journal_path, 'r', encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != JOURNAL_VERSION:
+                return None
+
+            base = None
+            text = None
+            changes = []
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if isinstance(record, list):
+                    changes.append((int(record[0]), int(record[1]), str(record[2])))
+                elif "text" in record:
+                    base, text, changes = None, str(record["text"]), []
+                else:
+                    base, text, changes = FileState(*record["base"]), None, []
+        if base is None and text is None:
+            return None
+        return SavedJournal(journal_path, header.get("path"), int(header.get("pid", 0)), base, text, changes)
+    except (OSError, ValueError, TypeError, KeyError, AttributeError, IndexError):
+        return None
+
+
+def find_journals(directory: str) -> typing.List[SavedJournal]:
+    """
+    Find journals left by previous runs. Journals of running processes are skipped.
+
+    Args:
+        directory(str): journal directory
+
+    Returns:
+        typing.List[SavedJournal]: readable journals sorted by file path
+    """
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+
+    journals = []
+    for name in names:
+        if not name.endswith(JOURNAL_SUFFIX):
+            continue
+        journal = read_journal(os.path.join(directory, name))
+        if journal is not None and not _is_running(journal.pid):
+            journals.append(journal)
+    journals.sort(key=lambda journal: journal.file_path or "")
+    return journals
+
+
+def replay_journal(journal: SavedJournal) -> typing.Optional[str]:
+    """
+    Apply changes of journal to its base text.
+
+    Args:
+        journal(SavedJournal): journal
+
+    Returns:
+        typing.Optional[str]: recovered text or None if saved file was changed since the journal was started
+
+    Raises:
+        OSError: saved file can't be read
+    """
+    text = journal.text
+    if text is None:
+        if journal.file_path is None or file_state(journal.file_path) != journal.base:
+            return None
+        encoding = sniff_format(journal.file_path).encoding or FALLBACK_ENCODING
+        try:
+            with open(journal.file_path, 'r', encoding=encoding) as f:  # read the same way as by editor
+                text = f.read()
+        except UnicodeDecodeError:
+            with open(journal.file_path, 'r', encoding=FALLBACK_ENCODING) as f:
+                text = f.read()
+
+    document = QTextDocument()
+    document.setUndoRedoEnabled(False)
+    document.setPlainText(text)
+    cursor = QTextCursor(document)
+    for position, removed, added in journal.changes:
+        end = document.characterCount() - 1
+        cursor.setPosition(min(position, end))
+        cursor.setPosition(min(position + removed, end), QTextCursor.KeepAnchor)
+        cursor.insertText(added)
+    return document.toPlainText()
+
+
+class EditJournal:
+    """
+    Append-only journal of unsaved changes of one document. It starts with state
+    of saved file or with snapshot of text, then every change is one record
+    with position, count of removed characters and added text. Records are
+    buffered and written by JournalWriter in background.
+    """
+
+    def __init__(self, writer: "JournalWriter", journal_path: str, file_path: typing.Optional[str],
+                 document: QTextDocument):
+        self.writer = writer
+        self.journal_path = journal_path
+        self.file_path = file_path
+        self.document = document
+        self.size = 0
+        self._pending = []
+
+    def start(self, base: typing.Optional[FileState]) -> None:
+        """
+        Write new journal over the old one.
+
+        Args:
+            base(typing.Optional[FileState]): state of saved file equal to text before recorded changes,
+                snapshot of current text is written if None
+        """
+        header = {"version": JOURNAL_VERSION, "path": self.file_path, "pid": os.getpid()}
+        state = {"base": list(base)} if base is not None else {"text": self.document.toPlainText()}
+        data = json.dumps(header) + "\n" + json.dumps(state, ensure_ascii=False) + "\n"
+        self._pending.clear()
+        self.size = len(data)
+        self.writer.submit(_replace_journal, self.journal_path, data)
+
+    def record(self, position: int, removed: int, added: str) -> None:
+        """
+        Buffer change of document, it is written on next flush.
+
+        Args:
+            position(int): position of change
+            removed(int): count of removed characters
+            added(str): added text
+        """
+        line = json.dumps([position, removed, added], ensure_ascii=False) + "\n"
+        self._pending.append(line)
+        self.size += len(line)
+        self.writer.schedule(self)
+
+    def flush(self) -> None:
+        """
+        Pass buffered changes to writer, or compact journal when it is too big.
+        """
+        if self.size > max(COMPACT_MIN_SIZE, COMPACT_RATIO * self.document.characterCount()):
+            self.start(None)
+        elif self._pending:
+            data = "".join(self._pending)
+            self._pending.clear()
+            self.writer.submit(_append_journal, self.journal_path, data)
+
+    def discard(self) -> None:
+        """
+        Remove journal, e.g. when its changes were saved.
+        """
+        self._pending.clear()
+        self.writer.remove(self)
+
+
+class JournalWriter(QObject):
+    """
+    Writer of journals of all documents. Buffered changes are flushed
+    by timer and written and synced in one background thread, so writes
+    of one journal stay in order and typing never waits for disk.
+    Journals aren't written when directory is None.
+    """
+
+    def __init__(self, directory: typing.Optional[str] = None, parent=None):
+        QObject.__init__(self, parent)
+        self.directory = directory
+
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(1)
+        self._scheduled = dict()  # journals with buffered changes in order of scheduling
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(SYNC_INTERVAL)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def create(self, file_path: typing.Optional[str], document: QTextDocument,
+               base: typing.Optional[FileState]) -> typing.Optional[EditJournal]:
+        """
+        Start journal of document.
+
+        Args:
+            file_path(typing.Optional[str]): path of saved file, None for new file
+            document(QTextDocument): journaled document
+            base(typing.Optional[FileState]): state of saved file equal to current text,
+                snapshot of current text is written if None
+
+        Returns:
+            typing.Optional[EditJournal]: new journal or None if journals are disabled
+        """
+        if self.directory is None:
+            return None
+        journal_path = os.path.join(self.directory, uuid.uuid4().hex + JOURNAL_SUFFIX)
+        journal = EditJournal(self, journal_path, file_path, document)
+        journal.start(base)
+        return journal
+
+    def schedule(self, journal: EditJournal) -> None:
+        """
+        Flush journal on next tick of timer.
+
+        Args:
+            journal(EditJournal): journal with buffered changes
+        """
+        self._scheduled[journal] = None
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self) -> None:
+        """
+        Pass buffered changes of all journals to background thread.
+        This method is called when timeout signal of flush timer is emitted.
+        """
+        scheduled = list(self._scheduled)
+        self._scheduled.clear()
+        for journal in scheduled:
+            journal.flush()
+
+    def submit(self, function: typing.Callable, *args) -> None:
+        """
+        Call function in background thread after previously submitted functions.
+
+        Args:
+            function(typing.Callable): function writing journal
+        """
+        self._thread_pool.start(Worker(function, *args))
+
+    def remove(self, journal: typing.Union[EditJournal, str]) -> None:
+        """
+        Remove journal file in background thread.
+
+        Args:
+            journal(typing.Union[EditJournal, str]): journal or path of journal file
+        """
+        if isinstance(journal, EditJournal):
+            self._scheduled.pop(journal, None)
+            journal = journal.journal_path
+        self.submit(_remove_journal, journal)
+
+    def shutdown(self) -> None:
+        """
+        Flush all journals and wait until they are written. Used before exit.
+        """
+        self._flush_timer.stop()
+        self.flush()
+        self._thread_pool.waitForDone()
+
+
+def _replace_journal(journal_path: str, data: str) -> None:
+    """
+    Args:
+        journal_path(str): path of journal file
+        data(str): new content of journal
+    """
+    os.makedirs(os.path.dirname(journal_path), exist_ok=True)
+    write_atomically(journal_path, data, encoding="utf-8")
+
+
+def _append_journal(journal_path: str, data: str) -> None:
+    """
+    Args:
+        journal_path(str): path of journal file
+        data(str): appended records
+    """
+    with open(journal_path, 'a', encoding="utf-8") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _remove_journal(journal_path: str) -> None:
+    """
+    Args:
+        journal_path(str): path of journal file
+    """
+    try:
+        os.remove(journal_path)
+    except FileNotFoundError:
+        pass
+
+
+def _is_running(pid: int) -> bool:
+    """
+    Args:
+        pid(int): process identifier
+
+    Returns:
+        bool: True if other process with pid is running, it is never checked on Windows
+    """
+    if pid <= 0 or pid == os.getpid() or os.name != "posix":
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
@@ -0,0 +1,98 @@
+import codecs
+import typing
+
+
+#  size of beginning of file which is examined for encoding and binary content (bytes)
+SNIFF_SIZE = 8192
+#  encoding of new files and of files which decode as UTF-8
+DEFAULT_ENCODING = "utf-8"
+#  encoding of other text files, it decodes any bytes and encodes them back unchanged
+FALLBACK_ENCODING = "latin-1"
+#  file with larger share of control characters in examined part is binary
+BINARY_CONTROL_RATIO = 0.1
+
+#  byte order marks and encodings of files starting with them, longer marks first.
+#  Marks of UTF-16 and UTF-32 stay in text as U+FEFF, so they are written back with the same byte order.
+_BYTE_ORDER_MARKS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+#  control characters which are common in text files: bell, backspace, tab, new lines, form feed and escape
+_TEXT_CONTROLS = frozenset(b"\a\b\t\n\f\r\x1b")
+#  all other control characters
+_BINARY_CONTROLS = bytes(byte for byte in range(32) if byte not in _TEXT_CONTROLS) + b"\x7f"
+
+
+class FileFormat(typing.NamedTuple):
+    """
+    Format of file detected from its beginning.
+    """
+
+    binary: bool
+    encoding: typing.Optional[str]  # None for binary file
+    newline: typing.Optional[str]  # the first line ending of file, None if there is no line ending
+
+
+def sniff_format(file_path: str) -> FileFormat:
+    """
+    Detect format of file from its first SNIFF_SIZE bytes.
+
+    Args:
+        file_path(str): file path
+
+    Returns:
+        FileFormat: detected format
+
+    Raises:
+        OSError: file can't be read
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(SNIFF_SIZE)
+    return detect_format(sample, len(sample) < SNIFF_SIZE)
+
+
+def detect_format(sample: bytes, complete: bool = True) -> FileFormat:
+    """
+    Detect format of file from its beginning. File with byte order mark is text, file
+    with null bytes or many control characters is binary. Other files are UTF-8 if they
+    can be decoded so, otherwise they are read by fallback encoding.
+
+    Args:
+        sample(bytes): beginning of file
+        complete(bool): sample is the whole file, otherwise it can end in the middle of character
+
+    Returns:
+        FileFormat: detected format
+    """
+    encoding = next((encoding for mark, encoding in _BYTE_ORDER_MARKS if sample.startswith(mark)), None)
+    if encoding is None:
+        if b"\0" in sample or len(sample.translate(None, _BINARY_CONTROLS)) < len(sample) * (1 - BINARY_CONTROL_RATIO):
+            return FileFormat(True, None, None)
+        try:
+            codecs.getincrementaldecoder(DEFAULT_ENCODING)().decode(sample, final=complete)
+            encoding = DEFAULT_ENCODING
+        except UnicodeDecodeError:
+            encoding = FALLBACK_ENCODING
+
+    text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(sample)
+    return FileFormat(False, encoding, _detect_newline(text))
+
+
+def _detect_newline(text: str) -> typing.Optional[str]:
+    """
+    Args:
+        text(str): beginning of text
+
+    Returns:
+        typing.Optional[str]: the first line ending of text or None if there is no line ending
+    """
+    line_feed = text.find("\n")
+    carriage_return = text.find("\r")
+    if carriage_return == -1:
+        return None if line_feed == -1 else "\n"
+    if line_feed == -1 or carriage_return < line_feed:
+        return "\r\n" if line_feed == carriage_return + 1 else "\r"
+    return "\n"
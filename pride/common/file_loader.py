@@ -0,0 +1,49 @@
+import os
+import typing
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+#  size of one chunk (in characters) handed over to the document
+CHUNK_SIZE = 1 << 20
+
+
+class FileLoader(QThread):
+    """
+    Thread which reads and decodes file outside of GUI thread
+    and hands over its text in a few big line aligned chunks.
+    Failed decoding is reported separately, so file can be loaded
+    again by other encoding.
+    """
+
+    chunk_loaded = pyqtSignal(str)
+    progress_changed = pyqtSignal(int)
+    loading_failed = pyqtSignal(str)
+    decoding_failed = pyqtSignal()
+
+    def __init__(self, file: typing.TextIO, chunk_size: int = CHUNK_SIZE, parent=None):
+        QThread.__init__(self, parent)
+        self.file = file
+        self.chunk_size = chunk_size
+
+    def run(self) -> None:
+        """
+        Read file chunk by chunk until the end of file
+        or until interruption is requested. File is closed at the end.
+        """
+        try:
+            with self.file:
+                file_size = os.fstat(self.file.fileno()).st_size or 1
+                while not self.isInterruptionRequested():
+                    chunk = self.file.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    if not chunk.endswith("\n"):
+                        chunk += self.file.readline()  # chunks always end on line boundary
+
+                    self.chunk_loaded.emit(chunk)
+                    self.progress_changed.emit(min(100, self.file.buffer.tell() * 100 // file_size))
+        except UnicodeDecodeError:
+            self.decoding_failed.emit()
+        except Exception as e:
+            self.loading_failed.emit(str(e))
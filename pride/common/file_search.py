@@ -0,0 +1,278 @@
+import mmap
+import os
+import re
+import typing
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+from functools import lru_cache
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from pride.common.file_system import IGNORED_DIRECTORIES, iter_files
+
+
+#  count of files searched by one task of executor
+SEARCH_BATCH_SIZE = 64
+#  search stops after this count of matches
+MAX_MATCHES = 10000
+#  length of beginning of file checked for zero bytes to detect binary file
+BINARY_CHECK_SIZE = 8192
+#  text of matched line is cut to this length
+MAX_LINE_LENGTH = 300
+#  how often the search thread checks interruption while waiting for tasks (s)
+INTERRUPTION_CHECK_INTERVAL = 0.05
+#  trigram index of directory is outdated when more files changed after its update
+MAX_CHANGED_FILES = 100
+#  count of batches submitted to executor ahead, listing of files continues when some is finished
+MAX_SUBMITTED_BATCHES = 64
+
+
+class Match(typing.NamedTuple):
+    """
+    One match of find in files.
+    """
+
+    path: str
+    line_number: int
+    column: int
+    line: str
+
+
+@lru_cache(maxsize=16)
+def compile_query(query: str, regex: bool, case_sensitive: bool) -> typing.Pattern:
+    """
+    Compile query to bytes pattern, so mapped files don't have to be decoded.
+
+    Args:
+        query(str): searched text or regular expression
+        regex(bool): query is regular expression
+        case_sensitive(bool): match case
+
+    Returns:
+        typing.Pattern: compiled pattern
+
+    Raises:
+        re.error: query is not valid regular expression
+    """
+    source = query.encode("utf-8")
+    if not regex:
+        source = re.escape(source)
+    return re.compile(source, re.MULTILINE | (0 if case_sensitive else re.IGNORECASE))
+
+
+def search_file(path: str, pattern: typing.Pattern, max_matches: int = MAX_MATCHES) -> typing.List[Match]:
+    """
+    Find matches in memory mapped file. Binary and unreadable files are skipped.
+    Only the first match of every line is reported.
+
+    Args:
+        path(str): file path
+        pattern(typing.Pattern): compiled bytes pattern
+        max_matches(int): maximal count of reported matches
+
+    Returns:
+        typing.List[Match]: matches in file
+    """
+    matches = []
+    try:
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return matches
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if mapped.find(b"\0", 0, BINARY_CHECK_SIZE) != -1:
+                    return matches
+
+                line_number = 1
+                counted_to = 0
+                line_end = -1
+                for match in pattern.finditer(mapped):
+                    start = match.start()
+                    if start <= line_end:
+                        continue  # line is already reported
+                    line_number += mapped[counted_to:start].count(b"\n")
+                    counted_to = start
+                    line_start = mapped.rfind(b"\n", 0, start) + 1
+                    line_end = mapped.find(b"\n", start)
+                    if line_end == -1:
+                        line_end = len(mapped)
+                    line = mapped[line_start:min(line_end, line_start + MAX_LINE_LENGTH)]
+                    column = len(mapped[line_start:start].decode("utf-8", errors="replace")) + 1
+                    matches.append(Match(path, line_number, column,
+                                         line.decode("utf-8", errors="replace").rstrip("\r")))
+                    if len(matches) >= max_matches:
+                        break
+    except (OSError, ValueError):
+        pass
+    return matches
+
+
+def search_files(paths: typing.List[str], query: str, regex: bool, case_sensitive: bool) -> typing.List[Match]:
+    """
+    Search batch of files. This function is called in executor.
+
+    Args:
+        paths(typing.List[str]): file paths
+        query(str): searched text or regular expression
+        regex(bool): query is regular expression
+        case_sensitive(bool): match case
+
+    Returns:
+        typing.List[Match]: matches in all files
+    """
+    pattern = compile_query(query, regex, case_sensitive)
+    matches = []
+    for path in paths:
+        matches.extend(search_file(path, pattern, MAX_MATCHES - len(matches)))
+        if len(matches) >= MAX_MATCHES:
+            break
+    return matches
+
+
+class FileSearch(QThread):
+    """
+    Thread which lists files of directories and searches them
+    in batches by executor. Files are listed while batches are searched,
+    matches of every finished batch are emitted at once.
+    When interruption is requested, listing stops, waiting batches are cancelled
+    and results of running ones are dropped.
+
+    Directories with trigram index search only candidate files of the index
+    and files of paths marked dirty after its update, other directories search all files.
+    Directories whose index has too many changed files are listed in outdated_indexes.
+    """
+
+    matches_found = pyqtSignal(object)
+    progress_changed = pyqtSignal(int)
+
+    def __init__(self, executor: Executor, directories: typing.Iterable[str], query: str,
+                 regex: bool = False, case_sensitive: bool = False,
+                 indexes: typing.Optional[typing.Dict[str, typing.Tuple[typing.Any, typing.List[str]]]] = None,
+                 parent=None):
+        QThread.__init__(self, parent)
+        self.executor = executor
+        self.directories = list(directories)
+        self.query = query
+        self.regex = regex
+        self.case_sensitive = case_sensitive
+        self.indexes = indexes or dict()
+        self.outdated_indexes = []
+
+    def run(self) -> None:
+        """
+        Submit batches of files as they are listed and emit matches as batches finish.
+        """
+        batches = self._batches()
+        listing = True
+        futures = set()
+        total = 0
+        found = 0
+        while listing or futures:
+            if self.isInterruptionRequested() or found >= MAX_MATCHES:
+                for future in futures:
+                    future.cancel()
+                return
+
+            while listing and len(futures) < MAX_SUBMITTED_BATCHES:
+                batch = next(batches, None)
+                if batch is None:
+                    listing = False
+                else:
+                    futures.add(self.executor.submit(search_files, batch, self.query, self.regex,
+                                                     self.case_sensitive))
+                    total += 1
+            if not futures:
+                continue
+
+            done, futures = wait(futures, INTERRUPTION_CHECK_INTERVAL, FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled() or future.exception() is not None:
+                    continue
+                matches = future.result()[:MAX_MATCHES - found]
+                if matches:
+                    found += len(matches)
+                    self.matches_found.emit(matches)
+            if not listing:
+                self.progress_changed.emit((total - len(futures)) * 100 // max(total, 1))
+
+    def _batches(self) -> typing.Iterator[typing.List[str]]:
+        """
+        Yield batches of searched files of all directories.
+
+        Returns:
+            typing.Iterator[typing.List[str]]: file paths
+        """
+        batch = []
+        for directory in self.directories:
+            for path in self._files(directory):
+                batch.append(path)
+                if len(batch) == SEARCH_BATCH_SIZE:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def _files(self, directory: str) -> typing.Iterator[str]:
+        """
+        Yield files of directory which have to be searched. Listing stops when interruption is requested.
+
+        Args:
+            directory(str): directory path
+
+        Returns:
+            typing.Iterator[str]: file paths
+        """
+        index, dirty_paths = self.indexes.get(directory, (None, []))
+        if index is None:
+            for path in iter_files(directory):
+                if self.isInterruptionRequested():
+                    return
+                yield path
+            return
+
+        files = index.candidates(self.query, self.regex)
+        yield from files
+        known_files = set(files)
+        changed_files = 0
+        for path in self._changed_files(index, dirty_paths):
+            if self.isInterruptionRequested():
+                return
+            if path not in known_files:
+                known_files.add(path)
+                changed_files += 1
+                yield path
+        if changed_files > MAX_CHANGED_FILES:
+            self.outdated_indexes.append(directory)
+
+    @staticmethod
+    def _changed_files(index: typing.Any, dirty_paths: typing.List[str]) -> typing.Iterator[str]:
+        """
+        Yield files of dirty paths which can differ from index. Dirty files are yielded always,
+        from dirty directories their changed files and all files of subdirectories unknown to index.
+        Only one level of dirty directory is listed, watchers report every changed directory.
+
+        Args:
+            index(TrigramIndex): index of directory
+            dirty_paths(typing.List[str]): files and directories changed after update of index
+
+        Returns:
+            typing.Iterator[str]: file paths
+        """
+        for path in dirty_paths:
+            if not os.path.isdir(path):
+                yield path
+                continue
+
+            try:
+                iterator = os.scandir(path)
+            except OSError:
+                continue
+            with iterator:
+                for entry in iterator:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if not is_dir:
+                        if index.is_changed(entry.path):
+                            yield entry.path
+                    elif entry.name not in IGNORED_DIRECTORIES and not index.has_directory(entry.path):
+                        yield from iter_files(entry.path)
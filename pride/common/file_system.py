@@ -0,0 +1,95 @@
+import hashlib
+import os
+import typing
+
+
+#  directory of persistent caches like indexes of opened directories
+CACHE_DIRECTORY = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                               "pride")
+#  directory of persistent state like saved session and logs
+STATE_DIRECTORY = os.path.join(
+    os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state"), "pride")
+
+
+def scan_directory(path: str) -> typing.List[typing.Tuple[str, str, bool]]:
+    """
+    Scan one level of directory. Directories are first,
+    then files, both sorted by name.
+
+    Args:
+        path(str): directory path
+
+    Returns:
+        typing.List[typing.Tuple[str, str, bool]]: name, path and is dir flag of every entry
+    """
+    entries = []
+    with os.scandir(path) as iterator:
+        for entry in iterator:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            entries.append((entry.name, entry.path, is_dir))
+
+    entries.sort(key=lambda entry: (not entry[2], entry[0].lower()))
+    return entries
+
+
+#  directories which are skipped when all files of tree are listed
+IGNORED_DIRECTORIES = frozenset((".git", ".hg", ".svn", "__pycache__", ".mypy_cache", ".tox", "node_modules"))
+
+
+def walk_files(path: str) -> typing.List[str]:
+    """
+    List paths of all files in directory tree. Ignored directories
+    and symbolic links to directories are skipped, unreadable directories too.
+
+    Args:
+        path(str): directory path
+
+    Returns:
+        typing.List[str]: file paths
+    """
+    return list(iter_files(path))
+
+
+def iter_files(path: str) -> typing.Iterator[str]:
+    """
+    Yield paths of all files in directory tree as they are found, like walk_files.
+
+    Args:
+        path(str): directory path
+
+    Returns:
+        typing.Iterator[str]: file paths
+    """
+    directories = [path]
+    while directories:
+        try:
+            iterator = os.scandir(directories.pop())
+        except OSError:
+            continue
+        with iterator:
+            for entry in iterator:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if not is_dir:
+                    yield entry.path
+                elif entry.name not in IGNORED_DIRECTORIES:
+                    directories.append(entry.path)
+
+
+def cache_path(kind: str, key: str) -> str:
+    """
+    Return path of cache file. The directory of cache kind isn't created here.
+
+    Args:
+        kind(str): kind of cache, name of its directory
+        key(str): key of cached item, e.g. path of indexed directory
+
+    Returns:
+        str: file path
+    """
+    return os.path.join(CACHE_DIRECTORY, kind, hashlib.sha1(key.encode("utf-8")).hexdigest())
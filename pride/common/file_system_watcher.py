@@ -0,0 +1,196 @@
+import os
+import typing
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, QElapsedTimer, pyqtSignal
+
+
+#  time without new event after which changes are reported (ms)
+DEBOUNCE_INTERVAL = 300
+#  maximal delay of reporting when events keep coming (ms)
+MAX_DEBOUNCE_DELAY = 2000
+
+
+class DebouncedWatcher(QObject):
+    """
+    Base of watchers which merge bursts of file system events
+    and report all changed paths at once by method report.
+    """
+
+    def __init__(self, interval: int = DEBOUNCE_INTERVAL, max_delay: int = MAX_DEBOUNCE_DELAY, parent=None):
+        QObject.__init__(self, parent)
+        self.interval = interval
+        self.max_delay = max_delay
+
+        self._watcher = QFileSystemWatcher(self)
+
+        self._changed_paths = set()
+        self._first_change = QElapsedTimer()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._report_changes)
+
+    def report(self, paths: typing.List[str]) -> None:
+        """
+        Report changed paths, implemented by subclasses.
+
+        Args:
+            paths(typing.List[str]): changed paths sorted by name
+        """
+        raise NotImplementedError
+
+    def _add_changes(self, paths: typing.Iterable[str]) -> None:
+        """
+        Remember changed paths and postpone reporting.
+
+        Args:
+            paths(typing.Iterable[str]): changed paths
+        """
+        if not self._changed_paths:
+            self._first_change.start()
+        self._changed_paths.update(paths)
+
+        # restart interval, but don't postpone reporting longer than max delay
+        self._timer.start(self.interval if self._first_change.elapsed() < self.max_delay else 0)
+
+    def _report_changes(self) -> None:
+        """
+        Report all changed paths collected since last report.
+        """
+        changed_paths = sorted(self._changed_paths)
+        self._changed_paths.clear()
+        if changed_paths:
+            self.report(changed_paths)
+
+
+class DebouncedDirectoryWatcher(DebouncedWatcher):
+    """
+    Watcher of directories which merges bursts of file system events
+    and reports all changed directories at once.
+    """
+
+    directories_changed = pyqtSignal(list)
+
+    def __init__(self, interval: int = DEBOUNCE_INTERVAL, max_delay: int = MAX_DEBOUNCE_DELAY, parent=None):
+        DebouncedWatcher.__init__(self, interval, max_delay, parent)
+        self._watcher.directoryChanged.connect(self._directory_changed)
+
+    def watch(self, path: str) -> None:
+        """
+        Start watching directory.
+
+        Args:
+            path(str): directory path
+        """
+        self._watcher.addPath(path)
+
+    def unwatch(self, paths: typing.Iterable[str]) -> None:
+        """
+        Stop watching directories.
+
+        Args:
+            paths(typing.Iterable[str]): directory paths
+        """
+        paths = list(paths)
+        if paths:
+            self._watcher.removePaths(paths)
+        self._changed_paths.difference_update(paths)
+
+    def report(self, paths: typing.List[str]) -> None:
+        """
+        Emit changed directories.
+
+        Args:
+            paths(typing.List[str]): changed directories
+        """
+        self.directories_changed.emit(paths)
+
+    def _directory_changed(self, path: str) -> None:
+        """
+        Remember changed directory and postpone reporting.
+        This method is called when directoryChanged signal is emitted.
+
+        Args:
+            path(str): changed directory
+        """
+        self._add_changes((path,))
+
+
+class DebouncedFileWatcher(DebouncedWatcher):
+    """
+    Watcher of files which merges bursts of file system events and reports
+    all changed files at once. Directories of files are watched too, so files
+    replaced by rename or deleted and created again are reported and watched again.
+    Reported files don't have to be changed, e.g. when other file of directory was created.
+    """
+
+    files_changed = pyqtSignal(list)
+
+    def __init__(self, interval: int = DEBOUNCE_INTERVAL, max_delay: int = MAX_DEBOUNCE_DELAY, parent=None):
+        DebouncedWatcher.__init__(self, interval, max_delay, parent)
+        self._watcher.fileChanged.connect(self._file_changed)
+        self._watcher.directoryChanged.connect(self._directory_changed)
+        self._files = dict()  # watched files by directory
+
+    def watch(self, path: str) -> None:
+        """
+        Start watching file.
+
+        Args:
+            path(str): file path
+        """
+        directory = os.path.dirname(path)
+        if directory not in self._files:
+            self._files[directory] = set()
+            if os.path.isdir(directory):
+                self._watcher.addPath(directory)
+        self._files[directory].add(path)
+        if os.path.exists(path):
+            self._watcher.addPath(path)
+
+    def unwatch(self, path: str) -> None:
+        """
+        Stop watching file.
+
+        Args:
+            path(str): file path
+        """
+        directory = os.path.dirname(path)
+        files = self._files.get(directory, set())
+        files.discard(path)
+        self._watcher.removePaths([path] + ([directory] if not files else []))
+        if not files:
+            self._files.pop(directory, None)
+        self._changed_paths.discard(path)
+
+    def report(self, paths: typing.List[str]) -> None:
+        """
+        Watch again replaced files and emit changed files.
+
+        Args:
+            paths(typing.List[str]): changed files
+        """
+        watched_files = set(self._watcher.files())
+        for path in paths:
+            if path not in watched_files and os.path.exists(path):
+                self._watcher.addPath(path)
+        self.files_changed.emit(paths)
+
+    def _file_changed(self, path: str) -> None:
+        """
+        Remember changed file and postpone reporting.
+        This method is called when fileChanged signal is emitted.
+
+        Args:
+            path(str): changed file
+        """
+        self._add_changes((path,))
+
+    def _directory_changed(self, path: str) -> None:
+        """
+        Remember all watched files of changed directory and postpone reporting.
+        This method is called when directoryChanged signal is emitted.
+
+        Args:
+            path(str): changed directory
+        """
+        self._add_changes(self._files.get(path, ()))
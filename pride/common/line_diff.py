@@ -0,0 +1,189 @@
+import bisect
+import difflib
+import typing
+from collections import Counter
+
+
+#  changed parts with smaller product of line counts are compared by SequenceMatcher
+MAX_MATCHED_PRODUCT = 2500
+#  lines following the first difference are searched for equal lines up to this distance...
+MAX_SYNC_DISTANCE = 64
+#  ...and this many equal lines must follow, so repeated lines like blank ones aren't matched alone
+SYNC_LINES = 8
+
+
+def line_changes(old_lines: typing.Sequence[str],
+                 new_lines: typing.Sequence[str]) -> typing.List[typing.Tuple[int, int, int, int]]:
+    """
+    Compute changed ranges of lines. Common beginning and end of every compared part
+    are skipped and small parts are compared by SequenceMatcher. In large parts equal
+    lines are searched near the first difference, so local changes cost little more
+    than comparison of equal lines. Otherwise lines which are unique in both parts are
+    matched in order like in patience diff and parts between them are compared again,
+    part without unique lines is one changed range. Time is proportional to size
+    of text, SequenceMatcher can take quadratic time on large texts with repeated lines.
+
+    Args:
+        old_lines(typing.Sequence[str]): lines of old text
+        new_lines(typing.Sequence[str]): lines of new text
+
+    Returns:
+        typing.List[typing.Tuple[int, int, int, int]]: ranges in order, old_lines[i1:i2]
+            are replaced by new_lines[j1:j2] in each range i1, i2, j1, j2
+    """
+    changes = []
+    parts = [(0, len(old_lines), 0, len(new_lines))]
+    while parts:
+        i1, i2, j1, j2 = parts.pop()
+        length = _common_length(old_lines, i1, i2, new_lines, j1, j2, False)
+        i1, j1 = i1 + length, j1 + length
+        length = _common_length(old_lines, i1, i2, new_lines, j1, j2, True)
+        i2, j2 = i2 - length, j2 - length
+
+        if i1 == i2 and j1 == j2:
+            continue
+        if i1 == i2 or j1 == j2:
+            changes.append((i1, i2, j1, j2))
+        elif (i2 - i1) * (j2 - j1) <= MAX_MATCHED_PRODUCT:
+            matcher = difflib.SequenceMatcher(None, old_lines[i1:i2], new_lines[j1:j2], autojunk=False)
+            changes.extend((i1 + k1, i1 + k2, j1 + l1, j1 + l2)
+                           for tag, k1, k2, l1, l2 in matcher.get_opcodes() if tag != "equal")
+        else:
+            sync = _synchronize(old_lines, i1, i2, new_lines, j1, j2)
+            if sync is not None:
+                i, j = sync
+                changes.append((i1, i, j1, j))
+                parts.append((i, i2, j, j2))
+                continue
+            anchors = _unique_anchors(old_lines, i1, i2, new_lines, j1, j2)
+            if not anchors:
+                changes.append((i1, i2, j1, j2))
+                continue
+            for i, j in anchors:
+                if i < i1:  # inside of equal lines following previous anchor
+                    continue
+                parts.append((i1, i, j1, j))
+                length = _common_length(old_lines, i, i2, new_lines, j, j2, False)
+                i1, j1 = i + length, j + length
+            parts.append((i1, i2, j1, j2))
+
+    changes.sort()
+    return changes
+
+
+def _synchronize(old_lines: typing.Sequence[str], i1: int, i2: int, new_lines: typing.Sequence[str], j1: int,
+                 j2: int) -> typing.Optional[typing.Tuple[int, int]]:
+    """
+    Find the nearest lines after the first difference which are followed by SYNC_LINES equal lines.
+
+    Args:
+        old_lines(typing.Sequence[str]): lines of old text
+        i1(int): start of part of old lines, old_lines[i1] differs from new_lines[j1]
+        i2(int): end of part of old lines
+        new_lines(typing.Sequence[str]): lines of new text
+        j1(int): start of part of new lines
+        j2(int): end of part of new lines
+
+    Returns:
+        typing.Optional[typing.Tuple[int, int]]: indexes of the first equal lines in old and new lines
+            or None if they aren't within MAX_SYNC_DISTANCE
+    """
+    for distance in range(1, MAX_SYNC_DISTANCE + 1):
+        for old_distance in range(distance + 1):
+            i = i1 + old_distance
+            j = j1 + distance - old_distance
+            if (i + SYNC_LINES <= i2 and j + SYNC_LINES <= j2 and old_lines[i] == new_lines[j] and
+                    old_lines[i:i + SYNC_LINES] == new_lines[j:j + SYNC_LINES]):
+                return i, j
+    return None
+
+
+def _unique_anchors(old_lines: typing.Sequence[str], i1: int, i2: int, new_lines: typing.Sequence[str], j1: int,
+                    j2: int) -> typing.List[typing.Tuple[int, int]]:
+    """
+    Match lines which occur once in both parts. The longest sequence of matches
+    in the same order in both parts is returned.
+
+    Args:
+        old_lines(typing.Sequence[str]): lines of old text
+        i1(int): start of part of old lines
+        i2(int): end of part of old lines
+        new_lines(typing.Sequence[str]): lines of new text
+        j1(int): start of part of new lines
+        j2(int): end of part of new lines
+
+    Returns:
+        typing.List[typing.Tuple[int, int]]: indexes of matched lines in old and new lines in order
+    """
+    old_part = old_lines[i1:i2]
+    new_part = new_lines[j1:j2]
+    old_counts = Counter(old_part)
+    new_counts = Counter(new_part)
+    unique_lines = ({line for line, count in old_counts.items() if count == 1} &
+                    {line for line, count in new_counts.items() if count == 1})
+    if not unique_lines:
+        return []
+    new_indexes = {line: j for j, line in enumerate(new_part, j1) if line in unique_lines}
+    matches = [(i, new_indexes[line]) for i, line in enumerate(old_part, i1) if line in unique_lines]
+    new_order = [j for _, j in matches]
+    if new_order == sorted(new_order):  # lines weren't moved
+        return matches
+
+    # longest increasing sequence of new indexes by patience sorting
+    tops = []  # the smallest new index which ends sequence of every length
+    top_matches = []
+    previous = []
+    for idx, (_, j) in enumerate(matches):
+        length = bisect.bisect_left(tops, j)
+        if length == len(tops):
+            tops.append(j)
+            top_matches.append(idx)
+        else:
+            tops[length] = j
+            top_matches[length] = idx
+        previous.append(top_matches[length - 1] if length else -1)
+
+    anchors = []
+    idx = top_matches[-1] if top_matches else -1
+    while idx >= 0:
+        anchors.append(matches[idx])
+        idx = previous[idx]
+    anchors.reverse()
+    return anchors
+
+
+def _common_length(old_lines: typing.Sequence[str], i1: int, i2: int, new_lines: typing.Sequence[str], j1: int,
+                   j2: int, from_end: bool) -> int:
+    """
+    Count equal lines at the beginning or at the end of parts. Lines are compared
+    by slices of growing length, so long equal parts are compared quickly.
+
+    Args:
+        old_lines(typing.Sequence[str]): lines of old text
+        i1(int): start of part of old lines
+        i2(int): end of part of old lines
+        new_lines(typing.Sequence[str]): lines of new text
+        j1(int): start of part of new lines
+        j2(int): end of part of new lines
+        from_end(bool): count equal lines at the end of parts
+
+    Returns:
+        int: count of equal lines
+    """
+    limit = min(i2 - i1, j2 - j1)
+    length = 0
+    step = 1
+    while length < limit:
+        end = min(length + step, limit)
+        if from_end:
+            equal = old_lines[i2 - end:i2 - length] == new_lines[j2 - end:j2 - length]
+        else:
+            equal = old_lines[i1 + length:i1 + end] == new_lines[j1 + length:j1 + end]
+        if equal:
+            length = end
+            step *= 2
+        elif step > 1:
+            step //= 2
+        else:
+            break
+    return length
@@ -0,0 +1,58 @@
+import ast
+import typing
+
+
+class OutlineNode(typing.NamedTuple):
+    """
+    Class or function of outline with its nested classes and functions.
+    """
+
+    name: str
+    kind: str
+    line: int
+    end_line: int
+    children: typing.Tuple["OutlineNode", ...]
+
+
+def _nodes(body: typing.List[ast.stmt], in_class: bool) -> typing.Tuple[OutlineNode, ...]:
+    """
+    Create outline nodes of statements. Definitions inside compound statements
+    (if, try, with, ...) are included too.
+
+    Args:
+        body(typing.List[ast.stmt]): statements
+        in_class(bool): statements are body of class
+
+    Returns:
+        typing.Tuple[OutlineNode, ...]: nodes in order of source
+    """
+    nodes = []
+    for node in body:
+        if isinstance(node, ast.ClassDef):
+            nodes.append(OutlineNode(node.name, "class", node.lineno, node.end_lineno, _nodes(node.body, True)))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            nodes.append(OutlineNode(node.name, "method" if in_class else "function", node.lineno,
+                                     node.end_lineno, _nodes(node.body, False)))
+        else:
+            for field in ("body", "orelse", "finalbody", "handlers", "cases"):
+                statements = getattr(node, field, None)
+                if isinstance(statements, list):
+                    nodes.extend(_nodes(statements, in_class))
+    return tuple(nodes)
+
+
+def parse_outline(source: str) -> typing.Optional[typing.Tuple[OutlineNode, ...]]:
+    """
+    Parse classes and functions of python source. This function is called in thread pool.
+
+    Args:
+        source(str): python source
+
+    Returns:
+        typing.Optional[typing.Tuple[OutlineNode, ...]]: top level nodes or None if source has syntax error
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+    return _nodes(tree.body, False)
@@ -0,0 +1,250 @@
+import operator
+import os
+import re
+import time
+import typing
+from itertools import compress, repeat
+
+from PyQt5.QtCore import QObject, QThreadPool, pyqtSignal
+
+from pride.common.file_system import walk_files
+from pride.common.workers import Worker
+
+
+#  count of candidate paths checked at once by PathMatcher
+MATCH_BATCH_SIZE = 2048
+#  count of best matches kept by PathMatcher
+MAX_RESULTS = 100
+#  refresh rebuilds only indexes older than this (s)
+REFRESH_INTERVAL = 30
+
+#  rank of match is int packed from tier, length of path and id, lower is better
+_LENGTH_SHIFT = 24
+_ID_MASK = (1 << _LENGTH_SHIFT) - 1
+#  rank of tier by count of passed checks (query in name, characters of query in name, query in path)
+_TIER_RANKS = tuple((3 - passed) << 48 for passed in range(4))
+
+
+def index_directory(dir_path: str) -> typing.Tuple[typing.List[str], ...]:
+    """
+    List all files of directory tree and prepare lower case texts for matching.
+    Matched path is relative to parent of the directory, so it starts with directory name.
+
+    Args:
+        dir_path(str): directory path
+
+    Returns:
+        typing.Tuple[typing.List[str], ...]: file paths, lower case matched paths,
+            lower case file names and lengths of paths shifted to their place in rank
+    """
+    files = walk_files(dir_path)
+    prefix_length = len(os.path.dirname(dir_path.rstrip(os.sep))) + 1
+    lower_paths = [path[prefix_length:].lower() for path in files]
+    lower_names = [os.path.basename(path) for path in lower_paths]
+    length_ranks = [len(path) << _LENGTH_SHIFT for path in lower_paths]
+    return files, lower_paths, lower_names, length_ranks
+
+
+def _subsequence_pattern(query: str) -> typing.Pattern:
+    """
+    Compile regular expression finding characters of query in the same order.
+    Every gap is negated class of the next character, so the search doesn't backtrack.
+
+    Args:
+        query(str): lower case query
+
+    Returns:
+        typing.Pattern: compiled expression
+    """
+    parts = [re.escape(query[0])]
+    for character in query[1:]:
+        parts.append("[^{0}]*{0}".format(re.escape(character)))
+    return re.compile("".join(parts))
+
+
+class PathMatcher:
+    """
+    Fuzzy matcher of one query. Candidates are checked in batches,
+    so matching can be split into short time slices. Matcher of longer
+    query reuses candidates matched by matcher of its prefix.
+
+    Matches are ranked by tier and length of path. Query found
+    in file name is the best tier, then characters of query in file name,
+    then query found in path and characters of query in path.
+    """
+
+    def __init__(self, index: "PathIndex", query: str, previous: typing.Optional["PathMatcher"] = None):
+        self.query = query
+        self._paths = index.paths
+        self._lower_paths = index.lower_paths
+        self._lower_names = index.lower_names
+        self._base_ranks = index.base_ranks
+
+        if (previous is not None and previous._lower_paths is self._lower_paths
+                and previous.query and query.startswith(previous.query)):
+            self._candidates = previous._matched + list(previous._candidates[previous._position:])
+        else:
+            self._candidates = range(len(self._lower_paths)) if query else range(0)
+        self._position = 0
+        self._matched = []
+        self._top = []
+        self._search = _subsequence_pattern(query).search if query else None
+
+    def is_finished(self) -> bool:
+        """
+        Returns:
+            bool: True if all candidates were checked
+        """
+        return self._position >= len(self._candidates)
+
+    def advance(self, deadline: float) -> bool:
+        """
+        Check batches of candidates until deadline. At least one batch is checked.
+
+        Args:
+            deadline(float): time.perf_counter value when matching has to stop
+
+        Returns:
+            bool: True if all candidates were checked
+        """
+        while not self.is_finished():
+            batch = self._candidates[self._position:self._position + MATCH_BATCH_SIZE]
+            self._position += len(batch)
+            matched = list(compress(batch, map(self._search, map(self._lower_paths.__getitem__, batch))))
+            self._matched.extend(matched)
+            self._rank(matched)
+            if time.perf_counter() > deadline:
+                break
+        return self.is_finished()
+
+    def results(self) -> typing.List[str]:
+        """
+        Returns:
+            typing.List[str]: best matching paths of already checked candidates
+        """
+        return [self._paths[key & _ID_MASK] for key in self._top]
+
+    def _rank(self, path_ids: typing.List[int]) -> None:
+        """
+        Merge new matches into best results. Only builtin functions
+        are called per path, so ranking of batch is fast.
+
+        Args:
+            path_ids(typing.List[int]): ids of matched paths
+        """
+        names = list(map(self._lower_names.__getitem__, path_ids))
+        query = repeat(self.query)
+        in_name = list(map(operator.contains, names, query))
+        if len(self._top) == MAX_RESULTS and self._top[-1] < _TIER_RANKS[2]:
+            # results are full of paths with query in name, other tiers can't get there
+            keys = list(map(self._base_ranks.__getitem__, compress(path_ids, in_name)))
+        else:
+            passed = map(operator.add, map(operator.add, in_name, map(operator.truth, map(self._search, names))),
+                         map(operator.contains, map(self._lower_paths.__getitem__, path_ids), query))
+            keys = list(map(operator.or_, map(_TIER_RANKS.__getitem__, passed),
+                            map(self._base_ranks.__getitem__, path_ids)))
+        if len(self._top) == MAX_RESULTS:
+            keys = list(compress(keys, map(operator.lt, keys, repeat(self._top[-1]))))
+        if keys:
+            keys.extend(self._top)
+            keys.sort()
+            self._top = keys[:MAX_RESULTS]
+
+
+class PathIndex(QObject):
+    """
+    Index of all files in opened directories for quick open.
+    Directories are walked in thread pool, whole index is replaced
+    when some directory is indexed, so running matchers aren't affected.
+    """
+
+    index_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        QObject.__init__(self, parent)
+        self.paths = []
+        self.lower_paths = []
+        self.lower_names = []
+        self.base_ranks = []
+
+        self._roots = dict()
+        self._indexing = dict()
+
+    def add_root(self, dir_path: str) -> None:
+        """
+        Start indexing of new directory.
+
+        Args:
+            dir_path(str): directory path
+        """
+        if dir_path not in self._roots:
+            self._index_root(dir_path)
+
+    def refresh(self) -> None:
+        """
+        Index again directories which were indexed before more than REFRESH_INTERVAL seconds.
+        """
+        now = time.monotonic()
+        for dir_path, (*_, indexed_at) in list(self._roots.items()):
+            if now - indexed_at > REFRESH_INTERVAL:
+                self._index_root(dir_path)
+
+    def is_indexing(self) -> bool:
+        """
+        Returns:
+            bool: True if some directory is being indexed
+        """
+        return bool(self._indexing)
+
+    def match(self, query: str, previous: typing.Optional[PathMatcher] = None) -> PathMatcher:
+        """
+        Create matcher of query.
+
+        Args:
+            query(str): searched text
+            previous(typing.Optional[PathMatcher]): matcher of previous query, reused if query is longer
+
+        Returns:
+            PathMatcher: matcher, which has to be advanced to get results
+        """
+        return PathMatcher(self, query.lower(), previous)
+
+    def _index_root(self, dir_path: str) -> None:
+        """
+        Walk directory in thread pool.
+
+        Args:
+            dir_path(str): directory path
+        """
+        if dir_path in self._indexing:
+            return
+
+        worker = Worker(index_directory, dir_path)
+        worker.signals.finished.connect(lambda result: self._root_indexed(dir_path, result))
+        worker.signals.failed.connect(lambda error: self._root_indexed(dir_path, ([], [], [], [])))
+        self._indexing[dir_path] = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def _root_indexed(self, dir_path: str, result: tuple) -> None:
+        """
+        Store index of directory and rebuild whole index.
+
+        Args:
+            dir_path(str): directory path
+            result(tuple): result of index_directory
+        """
+        self._indexing.pop(dir_path, None)
+        self._roots[dir_path] = (*result, time.monotonic())
+        self._rebuild()
+        self.index_changed.emit()
+
+    def _rebuild(self) -> None:
+        """
+        Join indexes of all directories into new lists.
+        """
+        self.paths, self.lower_paths, self.lower_names, self.base_ranks = [], [], [], []
+        for paths, lower_paths, lower_names, length_ranks, _ in self._roots.values():
+            self.base_ranks.extend(map(operator.or_, length_ranks, range(len(self.paths), len(self.paths) + len(paths))))
+            self.paths.extend(paths)
+            self.lower_paths.extend(lower_paths)
+            self.lower_names.extend(lower_names)
@@ -0,0 +1,69 @@
+"""
+Run python file under cProfile and optionally sample its lines.
+This script is started by the IDE in subprocess, so it doesn't import anything from pride.
+
+Usage: python profile_runner.py stats_path samples_path|- file [arguments]
+"""
+import cProfile
+import json
+import os
+import runpy
+import sys
+import threading
+
+
+#  interval of line sampling (s)
+SAMPLE_INTERVAL = 0.001
+
+
+def sample_lines(thread_id: int, samples: dict, stop: threading.Event) -> None:
+    """
+    Count executed lines of thread until stop is set. Only the innermost frame
+    is counted, so lines show their own cost, cost of calls is shown by cProfile.
+
+    Args:
+        thread_id(int): identifier of sampled thread
+        samples(dict): count of samples by file name and line
+        stop(threading.Event): event which stops sampling
+    """
+    while not stop.wait(SAMPLE_INTERVAL):
+        frame = sys._current_frames().get(thread_id)
+        if frame is not None:
+            key = (frame.f_code.co_filename, frame.f_lineno)
+            samples[key] = samples.get(key, 0) + 1
+
+
+def main() -> None:
+    """
+    Run file given by command line arguments and write its stats and samples.
+    """
+    stats_path, samples_path, file_path = sys.argv[1:4]
+    sys.argv = sys.argv[3:]
+    sys.path[0] = os.path.dirname(os.path.abspath(file_path))
+
+    samples = dict()
+    stop = threading.Event()
+    sampler = None
+    if samples_path != "-":
+        sampler = threading.Thread(target=sample_lines, args=(threading.get_ident(), samples, stop), daemon=True)
+        sampler.start()
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(runpy.run_path, file_path, run_name="__main__")
+    finally:
+        stop.set()
+        if sampler is not None:
+            sampler.join()
+        profiler.dump_stats(stats_path)
+        if sampler is not None:
+            lines = dict()
+            for (file_name, line), count in samples.items():
+                if file_name != __file__:
+                    lines.setdefault(file_name, dict())[line] = count
+            with open(samples_path, 'w', encoding="utf-8") as f:
+                json.dump(lines, f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import json
+import os
+import pstats
+import typing
+
+
+#  script which runs profiled file in subprocess
+PROFILE_RUNNER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profile_runner.py")
+
+
+class FunctionStats(typing.NamedTuple):
+    """
+    Profile of one function.
+    """
+
+    name: str
+    path: str
+    line: int
+    calls: int
+    self_time: float
+    cumulative_time: float
+
+
+def load_stats(stats_path: str) -> typing.List[FunctionStats]:
+    """
+    Load stats written by cProfile. This function is called in thread pool.
+
+    Args:
+        stats_path(str): path of stats file
+
+    Returns:
+        typing.List[FunctionStats]: functions sorted by cumulative time
+    """
+    stats = pstats.Stats(stats_path).stats
+    functions = [FunctionStats(name, path, line, calls, self_time, cumulative_time)
+                 for (path, line, name), (_, calls, self_time, cumulative_time, _) in stats.items()]
+    functions.sort(key=lambda function: function.cumulative_time, reverse=True)
+    return functions
+
+
+def load_line_samples(samples_path: str) -> typing.Dict[str, typing.Dict[int, int]]:
+    """
+    Load line samples written by profile runner. This function is called in thread pool.
+
+    Args:
+        samples_path(str): path of samples file
+
+    Returns:
+        typing.Dict[str, typing.Dict[int, int]]: count of samples by real file path and line
+    """
+    try:
+        with open(samples_path, 'r', encoding="utf-8") as f:
+            samples = json.load(f)
+    except (OSError, ValueError):
+        return dict()
+    return {os.path.realpath(path): {int(line): count for line, count in lines.items()}
+            for path, lines in samples.items()}
+
+
+def line_heat(samples: typing.Dict[int, int]) -> typing.Dict[int, float]:
+    """
+    Scale counts of samples of file lines to heat between 0 and 1.
+
+    Args:
+        samples(typing.Dict[int, int]): count of samples by line
+
+    Returns:
+        typing.Dict[int, float]: heat by one based line number
+    """
+    if not samples:
+        return dict()
+    maximum = max(samples.values())
+    return {line: count / maximum for line, count in samples.items()}
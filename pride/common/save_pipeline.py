@@ -0,0 +1,139 @@
+import os
+import tempfile
+import typing
+
+from PyQt5.QtCore import QCoreApplication, QObject, QThreadPool, pyqtSignal
+
+from pride.common.workers import Worker
+
+
+#  count of files which can be written at once
+MAX_PARALLEL_SAVES = 4
+
+#  umask can be read only by setting it, so read it once in main thread at import
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def write_atomically(file_path: str, text: typing.Union[str, bytes], encoding: typing.Optional[str] = None,
+                     newline: typing.Optional[str] = None, fsync: bool = True) -> None:
+    """
+    Write text to temporary file next to the target and rename it over the target,
+    so the target is never left half written.
+
+    Args:
+        file_path(str): file path
+        text(typing.Union[str, bytes]): text of file, bytes are written as they are
+        encoding(typing.Optional[str]): encoding of file, default encoding if None
+        newline(typing.Optional[str]): line ending written instead of new line characters
+        fsync(bool): flush file to disk before rename
+    """
+    file_path = os.path.realpath(file_path)  # replace target of symlink, not the link
+    directory, file_name = os.path.split(file_path)
+    fd, temp_path = tempfile.mkstemp(prefix=".{}.".format(file_name), suffix=".tmp", dir=directory)
+    try:
+        if isinstance(text, bytes):
+            f = os.fdopen(fd, 'wb')
+        else:
+            f = os.fdopen(fd, 'w', encoding=encoding, newline=newline)
+        with f:
+            f.write(text)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+
+        try:
+            mode = os.stat(file_path).st_mode
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SavePipeline(QObject):
+    """
+    Pipeline which writes files atomically in own thread pool.
+    When file is saved again while it is being written, only the newest
+    text is written after the current write is finished.
+    """
+
+    file_saved = pyqtSignal(str)
+    save_failed = pyqtSignal(str, object)
+
+    def __init__(self, max_parallel: int = MAX_PARALLEL_SAVES, fsync: bool = True, parent=None):
+        QObject.__init__(self, parent)
+        self.fsync = fsync
+
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(max_parallel)
+        self._in_progress = dict()
+        self._pending = dict()
+
+    def save(self, file_path: str, text: str, encoding: typing.Optional[str] = None,
+             newline: typing.Optional[str] = None) -> None:
+        """
+        Save text to file in background.
+
+        Args:
+            file_path(str): file path
+            text(str): snapshot of text
+            encoding(typing.Optional[str]): encoding of file, default encoding if None
+            newline(typing.Optional[str]): line ending written instead of new line characters
+        """
+        if file_path in self._in_progress:
+            self._pending[file_path] = (text, encoding, newline)  # replace older waiting snapshot
+            return
+
+        worker = Worker(write_atomically, file_path, text, encoding, newline, self.fsync)
+        worker.signals.finished.connect(lambda _: self._write_finished(file_path, None))
+        worker.signals.failed.connect(lambda error: self._write_finished(file_path, error))
+        self._in_progress[file_path] = worker
+        self._thread_pool.start(worker)
+
+    def is_saving(self, file_path: str) -> bool:
+        """
+        Args:
+            file_path(str): file path
+
+        Returns:
+            bool: True if file is being written
+        """
+        return file_path in self._in_progress
+
+    def wait_for_done(self) -> None:
+        """
+        Block until all writes are finished and report their results. Used before exit.
+        """
+        while self._in_progress:
+            self._thread_pool.waitForDone()
+            QCoreApplication.sendPostedEvents()  # results of finished writes are delivered by queued signals
+            if not self._thread_pool.activeThreadCount():
+                for file_path in list(self._in_progress):
+                    self._write_finished(file_path, None, report=False)
+
+    def _write_finished(self, file_path: str, error: typing.Optional[Exception], report: bool = True) -> None:
+        """
+        Start write of waiting snapshot or report result.
+
+        Args:
+            file_path(str): file path
+            error(typing.Optional[Exception]): raised exception or None
+            report(bool): emit signals about result
+        """
+        if self._in_progress.pop(file_path, None) is None:
+            return
+
+        pending = self._pending.pop(file_path, None)
+        if pending is not None:
+            self.save(file_path, *pending)
+        elif error is not None:
+            if report:
+                self.save_failed.emit(file_path, error)
+        elif report:
+            self.file_saved.emit(file_path)
@@ -0,0 +1,74 @@
+import json
+import os
+import typing
+
+from pride.common.file_system import STATE_DIRECTORY
+from pride.common.save_pipeline import write_atomically
+
+
+#  file where session of main window is saved on exit and restored from on start
+SESSION_FILE = os.path.join(STATE_DIRECTORY, "session.json")
+#  version of session format, sessions of other versions are ignored
+SESSION_VERSION = 1
+
+
+class SessionTab(typing.NamedTuple):
+    """
+    Tab of saved session.
+    """
+
+    path: str
+    view_state: typing.Optional[typing.Tuple[int, int]]
+
+
+class Session(typing.NamedTuple):
+    """
+    State of main window restored on next start.
+    """
+
+    tabs: typing.List[SessionTab]
+    current_tab: int
+    directories: typing.List[str]
+    splitter_sizes: typing.List[int]
+
+
+def load_session(session_path: str) -> typing.Optional[Session]:
+    """
+    Load saved session. Missing or damaged session is ignored.
+
+    Args:
+        session_path(str): path of session file
+
+    Returns:
+        typing.Optional[Session]: saved session or None
+    """
+    try:
+        with open(session_path, 'r', encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != SESSION_VERSION:
+            return None
+        tabs = [SessionTab(tab["path"], tuple(tab["view_state"]) if tab.get("view_state") else None)
+                for tab in data["tabs"]]
+        return Session(tabs, int(data["current_tab"]), list(data["directories"]),
+                       [int(size) for size in data["splitter_sizes"]])
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+
+def save_session(session_path: str, session: Session) -> None:
+    """
+    Write session to file.
+
+    Args:
+        session_path(str): path of session file
+        session(Session): session of main window
+    """
+    data = {
+        "version": SESSION_VERSION,
+        "tabs": [{"path": tab.path, "view_state": tab.view_state} for tab in session.tabs],
+        "current_tab": session.current_tab,
+        "directories": session.directories,
+        "splitter_sizes": session.splitter_sizes,
+    }
+    os.makedirs(os.path.dirname(session_path), exist_ok=True)
+    write_atomically(session_path, json.dumps(data, indent=1), encoding="utf-8", fsync=False)
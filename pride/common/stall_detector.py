@@ -0,0 +1,172 @@
+import collections
+import faulthandler
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import typing
+
+from PyQt5.QtCore import Qt, QObject, QTimer, pyqtSignal
+
+from pride.common.file_system import STATE_DIRECTORY
+
+
+#  environment variable enabling stall detector, its value is threshold of stall (ms)
+STALL_THRESHOLD_VARIABLE = "PRIDE_STALL_THRESHOLD"
+#  environment variable with path of stall log
+STALL_LOG_VARIABLE = "PRIDE_STALL_LOG"
+#  default log of stalls, one JSON record per line
+STALL_LOG_FILE = os.path.join(STATE_DIRECTORY, "stalls.jsonl")
+#  interval of heartbeat timer in GUI thread (ms)
+HEARTBEAT_INTERVAL = 50
+#  worst latency is reported from this period (s)
+LATENCY_WINDOW = 10.0
+
+#  header of thread in traceback dumped by faulthandler
+_THREAD_PATTERN = re.compile(r"^(?:Current thread|Thread) (0x[0-9a-fA-F]+)")
+#  frame in traceback dumped by faulthandler
+_FRAME_PATTERN = re.compile(r'^\s+File "(.*)", line (\d+) in (.*)$')
+
+
+class StackFrame(typing.NamedTuple):
+    """
+    Frame of captured stack.
+    """
+
+    path: str
+    line: int
+    function: str
+
+
+def parse_traceback_dump(text: str, thread_id: int) -> typing.List[StackFrame]:
+    """
+    Extract stack of thread from tracebacks dumped by faulthandler.
+
+    Args:
+        text(str): dumped tracebacks of all threads
+        thread_id(int): identifier of thread
+
+    Returns:
+        typing.List[StackFrame]: frames of thread, the outermost first
+    """
+    frames = []
+    in_thread = False
+    for line in text.splitlines():
+        thread_match = _THREAD_PATTERN.match(line)
+        if thread_match:
+            in_thread = int(thread_match.group(1), 16) == thread_id
+            continue
+        frame_match = _FRAME_PATTERN.match(line)
+        if in_thread and frame_match:
+            frames.append(StackFrame(frame_match.group(1), int(frame_match.group(2)), frame_match.group(3)))
+    frames.reverse()
+    return frames
+
+
+class StallDetector(QObject):
+    """
+    Watchdog of GUI thread. Heartbeat timer measures latency of event loop,
+    latency over threshold is a stall. Stack of GUI thread is captured
+    during the stall by watchdog thread of faulthandler, which works without GIL,
+    so the stack is captured even when the thread is blocked in Qt call.
+    Stalls are appended to log as JSON records with duration and stack.
+    """
+
+    latency_changed = pyqtSignal(float)
+    stall_detected = pyqtSignal(dict)
+
+    def __init__(self, threshold: float, log_path: typing.Optional[str] = STALL_LOG_FILE, parent=None):
+        QObject.__init__(self, parent)
+        self.threshold = threshold
+        self.log_path = log_path
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(HEARTBEAT_INTERVAL)
+        self._timer.timeout.connect(self.heartbeat)
+
+        self._latencies = collections.deque()  # time and latency of recent heartbeats
+        self._worst_latency = None
+        self._last_beat = 0.0
+        self._dump_file = None
+        self._thread_id = None
+
+    def start(self) -> None:
+        """
+        Start watching of GUI thread. This method has to be called in GUI thread.
+        """
+        if self._timer.isActive():
+            return
+        self._dump_file = tempfile.TemporaryFile()
+        self._thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._arm()
+        self._timer.start()
+
+    def stop(self) -> None:
+        """
+        Stop watching. Used before exit.
+        """
+        if not self._timer.isActive():
+            return
+        self._timer.stop()
+        faulthandler.cancel_dump_traceback_later()
+        self._dump_file.close()
+        self._dump_file = None
+
+    def heartbeat(self) -> None:
+        """
+        Measure latency since last heartbeat and report stall.
+        This method is called when timeout signal of heartbeat timer is emitted.
+        """
+        now = time.perf_counter()
+        latency = max(0.0, (now - self._last_beat) * 1000 - HEARTBEAT_INTERVAL)
+        self._last_beat = now
+        if latency >= self.threshold:
+            self._report_stall(latency)
+        self._arm()
+
+        self._latencies.append((now, latency))
+        while self._latencies[0][0] < now - LATENCY_WINDOW:
+            self._latencies.popleft()
+        worst_latency = round(max(latency for _, latency in self._latencies))
+        if worst_latency != self._worst_latency:
+            self._worst_latency = worst_latency
+            self.latency_changed.emit(worst_latency)
+
+    def _arm(self) -> None:
+        """
+        Schedule dump of tracebacks for the moment when next heartbeat is late by threshold.
+        """
+        faulthandler.dump_traceback_later((HEARTBEAT_INTERVAL + self.threshold) / 1000, file=self._dump_file)
+
+    def _report_stall(self, duration: float) -> None:
+        """
+        Log stall with stack captured during it.
+
+        Args:
+            duration(float): latency of heartbeat (ms)
+        """
+        self._dump_file.seek(0)
+        dump = self._dump_file.read().decode("utf-8", errors="replace")
+        self._dump_file.seek(0)
+        self._dump_file.truncate()
+        dump = dump[max(0, dump.rfind("Timeout (")):]  # dump of heartbeat late just under threshold can precede
+
+        stack = parse_traceback_dump(dump, self._thread_id)
+        record = {
+            "time": time.time() - duration / 1000,
+            "duration": round(duration, 1),
+            "threshold": self.threshold,
+            "stack": [frame._asdict() for frame in stack],
+        }
+        if self.log_path is not None:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+                with open(self.log_path, 'a', encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError:
+                pass
+        self.stall_detected.emit(record)
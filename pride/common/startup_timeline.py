@@ -0,0 +1,78 @@
+import contextlib
+import json
+import os
+import time
+import typing
+
+
+#  environment variable with path of file where startup timeline is written
+STARTUP_TIMELINE_VARIABLE = "PRIDE_STARTUP_TIMELINE"
+
+
+class StartupTimeline:
+    """
+    Timeline of application startup. Imports and construction of components
+    are measured as nested spans, moments like first paint are marked.
+    Events are always recorded, they are few and cheap, but written only
+    when output path is set. Times are relative to import of this module.
+    """
+
+    def __init__(self, output_path: typing.Optional[str] = None):
+        self.output_path = output_path
+        self.events = []
+        self._origin = time.perf_counter()
+        self._depth = 0
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Returns:
+            bool: True if timeline is written
+        """
+        return self.output_path is not None
+
+    @contextlib.contextmanager
+    def measure(self, name: str) -> typing.Iterator[None]:
+        """
+        Measure duration of block.
+
+        Args:
+            name(str): name of measured step
+        """
+        event = {"name": name, "start": self._now(), "duration": None, "depth": self._depth}
+        self.events.append(event)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            event["duration"] = self._now() - event["start"]
+
+    def mark(self, name: str) -> None:
+        """
+        Record moment of startup.
+
+        Args:
+            name(str): name of moment
+        """
+        self.events.append({"name": name, "start": self._now(), "duration": 0.0, "depth": self._depth})
+
+    def write(self) -> None:
+        """
+        Write recorded events to output file as JSON, times are in milliseconds.
+        """
+        if not self.enabled:
+            return
+        with open(self.output_path, 'w', encoding="utf-8") as f:
+            json.dump({"events": self.events}, f, indent=1)
+
+    def _now(self) -> float:
+        """
+        Returns:
+            float: milliseconds since origin of timeline
+        """
+        return (time.perf_counter() - self._origin) * 1000
+
+
+#  timeline of this process
+timeline = StartupTimeline(os.environ.get(STARTUP_TIMELINE_VARIABLE) or None)
@@ -0,0 +1,339 @@
+import ast
+import json
+import multiprocessing
+import os
+import typing
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from PyQt5.QtCore import QObject, QThreadPool, pyqtSignal
+
+from pride.common.file_system import walk_files, cache_path
+from pride.common.save_pipeline import write_atomically
+from pride.common.workers import Worker
+
+
+#  extensions of indexed python files
+PYTHON_EXTENSIONS = (".py", ".pyw", ".pyi")
+#  count of files parsed by one task of process pool
+PARSE_BATCH_SIZE = 64
+#  count of symbols returned by find
+MAX_RESULTS = 200
+
+#  version of cache file, cache with other version is ignored
+_CACHE_VERSION = 1
+#  order of definitions of one name
+_KIND_ORDER = {"class": 0, "function": 1, "method": 2, "variable": 3}
+
+
+class Symbol(typing.NamedTuple):
+    """
+    Definition of class, function, method or module level variable.
+    """
+
+    name: str
+    kind: str
+    path: str
+    line: int
+    container: str  # name of enclosing class, empty at module level
+
+
+def _extract(body: typing.List[ast.stmt], container: str, symbols: list) -> None:
+    """
+    Add definitions of statements to symbols. Classes are searched recursively,
+    bodies of functions are skipped.
+
+    Args:
+        body(typing.List[ast.stmt]): statements
+        container(str): qualified name of enclosing class, empty at module level
+        symbols(list): list of [name, kind, line, container] items
+    """
+    for node in body:
+        if isinstance(node, ast.ClassDef):
+            symbols.append([node.name, "class", node.lineno, container])
+            _extract(node.body, "{}.{}".format(container, node.name) if container else node.name, symbols)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols.append([node.name, "method" if container else "function", node.lineno, container])
+        elif not container and isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                for name in ast.walk(target):
+                    if isinstance(name, ast.Name):
+                        symbols.append([name.id, "variable", name.lineno, container])
+        elif isinstance(node, ast.If):
+            _extract(node.body + node.orelse, container, symbols)
+        elif isinstance(node, ast.Try):
+            _extract(node.body + node.orelse + node.finalbody, container, symbols)
+            for handler in node.handlers:
+                _extract(handler.body, container, symbols)
+
+
+def parse_symbols(source: typing.Union[str, bytes]) -> typing.List[list]:
+    """
+    Parse python source and return its definitions. Source with syntax error has no definitions.
+
+    Args:
+        source(typing.Union[str, bytes]): python source, bytes are decoded by encoding declaration
+
+    Returns:
+        typing.List[list]: definitions as name, kind, line and container
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    symbols = []
+    _extract(tree.body, "", symbols)
+    return symbols
+
+
+def parse_files(paths: typing.List[typing.Tuple[str, int, int]]) -> typing.Dict[str, list]:
+    """
+    Parse batch of files. This function is called in worker process.
+
+    Args:
+        paths(typing.List[typing.Tuple[str, int, int]]): file path, mtime and size of every file
+
+    Returns:
+        typing.Dict[str, list]: mtime, size and definitions by file path
+    """
+    result = dict()
+    for path, mtime, size in paths:
+        try:
+            with open(path, 'rb') as f:
+                source = f.read()
+        except OSError:
+            continue
+        result[path] = [mtime, size, parse_symbols(source)]
+    return result
+
+
+def index_directory(executor: Executor, dir_path: str, cache_file: str) -> typing.Dict[str, list]:
+    """
+    Parse python files of directory which changed since they were cached. Cache is keyed
+    by path, mtime and size of file. This function is called in thread pool.
+
+    Args:
+        executor(Executor): executor which parses files
+        dir_path(str): directory path
+        cache_file(str): path of cache file
+
+    Returns:
+        typing.Dict[str, list]: mtime, size and definitions by file path
+    """
+    try:
+        with open(cache_file, 'r', encoding="utf-8") as f:
+            cache = json.load(f)
+        cached = cache["files"] if cache.get("version") == _CACHE_VERSION else dict()
+    except (OSError, ValueError, KeyError, AttributeError):
+        cached = dict()
+
+    result = dict()
+    changed = []
+    for path in walk_files(dir_path):
+        if not path.endswith(PYTHON_EXTENSIONS):
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entry = cached.get(path)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            result[path] = entry
+        else:
+            changed.append((path, stat.st_mtime_ns, stat.st_size))
+
+    futures = [executor.submit(parse_files, changed[start:start + PARSE_BATCH_SIZE])
+               for start in range(0, len(changed), PARSE_BATCH_SIZE)]
+    for future in futures:
+        result.update(future.result())
+
+    if changed or len(result) != len(cached):
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        write_atomically(cache_file, json.dumps({"version": _CACHE_VERSION, "files": result}), "utf-8", fsync=False)
+    return result
+
+
+def parse_file(path: str) -> list:
+    """
+    Parse one file. This function is called in thread pool.
+
+    Args:
+        path(str): file path
+
+    Returns:
+        list: mtime, size and definitions of file
+    """
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        return [stat.st_mtime_ns, stat.st_size, parse_symbols(f.read())]
+
+
+class SymbolIndex(QObject):
+    """
+    Index of definitions in python files of opened directories for go to definition
+    and find symbol. Files are parsed in process pool and parsed definitions are cached
+    on disk, so only changed files are parsed again after restart.
+    Saved files are parsed again when update_file is called.
+    Threads waiting for the process pool are taken from own thread pool,
+    so they don't block other tasks of global pool.
+    """
+
+    index_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        QObject.__init__(self, parent)
+        self._roots = dict()
+        self._indexing = dict()
+        self._reparse = dict()
+        self._executor = None
+        self._thread_pool = QThreadPool(self)
+
+        self._files = dict()
+        self._definitions = dict()
+
+    def add_root(self, dir_path: str) -> None:
+        """
+        Start indexing of new directory.
+
+        Args:
+            dir_path(str): directory path
+        """
+        if dir_path in self._roots or dir_path in self._indexing:
+            return
+        if self._executor is None:
+            # spawned workers don't inherit state of Qt threads
+            self._executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+
+        cache_file = cache_path("symbols", os.path.realpath(dir_path))
+        worker = Worker(index_directory, self._executor, dir_path, cache_file)
+        worker.signals.finished.connect(lambda result: self._root_indexed(dir_path, result))
+        worker.signals.failed.connect(lambda error: self._root_indexed(dir_path, dict()))
+        self._indexing[dir_path] = worker
+        self._reparse[dir_path] = set()
+        self._thread_pool.start(worker)
+
+    def update_file(self, file_path: str) -> None:
+        """
+        Parse saved file again if it is in some opened directory.
+        File saved while its directory is being indexed is parsed after indexing.
+
+        Args:
+            file_path(str): file path
+        """
+        if not file_path.endswith(PYTHON_EXTENSIONS):
+            return
+
+        real_path = os.path.realpath(file_path)
+        for dir_path in list(self._roots) + list(self._indexing):
+            real_directory = os.path.join(os.path.realpath(dir_path), "")
+            if not real_path.startswith(real_directory):
+                continue
+            path = os.path.join(dir_path, real_path[len(real_directory):])
+            if dir_path in self._indexing:
+                self._reparse[dir_path].add(path)
+                continue
+
+            worker = Worker(parse_file, path)
+            worker.signals.finished.connect(lambda entry, d=dir_path, p=path: self._file_parsed(d, p, entry))
+            self._thread_pool.start(worker)
+
+    def is_indexing(self) -> bool:
+        """
+        Returns:
+            bool: True if some directory is being indexed
+        """
+        return bool(self._indexing)
+
+    def definitions(self, name: str) -> typing.List[Symbol]:
+        """
+        Return definitions of name.
+
+        Args:
+            name(str): name of symbol
+
+        Returns:
+            typing.List[Symbol]: classes first, then functions, methods and variables
+        """
+        files = self._definitions.get(name, dict())
+        return sorted((symbol for symbols in files.values() for symbol in symbols),
+                      key=lambda symbol: _KIND_ORDER[symbol.kind])
+
+    def find(self, query: str, max_results: int = MAX_RESULTS) -> typing.List[Symbol]:
+        """
+        Find symbols whose name contains query, case is ignored.
+        Names starting with query and shorter names are first.
+
+        Args:
+            query(str): part of name
+            max_results(int): maximal count of results
+
+        Returns:
+            typing.List[Symbol]: found symbols
+        """
+        query = query.lower()
+        if not query:
+            return []
+        found = [(not name.startswith(query), len(name), symbol)
+                 for symbols, lower_names in self._files.values()
+                 for symbol, name in zip(symbols, lower_names) if query in name]
+        found.sort(key=lambda item: item[:2])
+        return [symbol for *_, symbol in found[:max_results]]
+
+    def shutdown(self) -> None:
+        """
+        Stop worker processes. Used before exit.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _root_indexed(self, dir_path: str, result: typing.Dict[str, list]) -> None:
+        """
+        Store definitions of directory and parse files saved meanwhile.
+
+        Args:
+            dir_path(str): directory path
+            result(typing.Dict[str, list]): result of index_directory
+        """
+        self._indexing.pop(dir_path, None)
+        self._roots[dir_path] = result
+        for path, (_, _, definitions) in result.items():
+            self._set_file(path, definitions)
+        for path in self._reparse.pop(dir_path, ()):
+            self.update_file(path)
+        self.index_changed.emit()
+
+    def _file_parsed(self, dir_path: str, path: str, entry: list) -> None:
+        """
+        Replace definitions of parsed file.
+
+        Args:
+            dir_path(str): directory of file
+            path(str): file path
+            entry(list): result of parse_file
+        """
+        files = self._roots.get(dir_path)
+        if files is not None:
+            files[path] = entry
+            self._set_file(path, entry[2])
+            self.index_changed.emit()
+
+    def _set_file(self, path: str, definitions: list) -> None:
+        """
+        Replace symbols of one file in lookup tables, symbols of other files are kept.
+
+        Args:
+            path(str): file path
+            definitions(list): definitions as name, kind, line and container
+        """
+        old_symbols, _ = self._files.pop(path, ((), ()))
+        for name in {symbol.name for symbol in old_symbols}:
+            files = self._definitions[name]
+            del files[path]
+            if not files:
+                del self._definitions[name]
+
+        symbols = [Symbol(name, kind, path, line, container) for name, kind, line, container in definitions]
+        for symbol in symbols:
+            self._definitions.setdefault(symbol.name, dict()).setdefault(path, []).append(symbol)
+        self._files[path] = (symbols, [symbol.name.lower() for symbol in symbols])
@@ -0,0 +1,461 @@
+import json
+import multiprocessing
+import os
+import struct
+import typing
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from PyQt5.QtCore import QObject, QThreadPool, pyqtSignal
+
+try:
+    from re import _parser as sre_parse  # python 3.11+
+except ImportError:
+    import sre_parse
+
+from pride.common.file_search import BINARY_CHECK_SIZE
+from pride.common.file_system import IGNORED_DIRECTORIES, walk_files, cache_path
+from pride.common.save_pipeline import write_atomically
+from pride.common.workers import Worker
+
+
+#  trigram indexes are used by find in files, set PRIDE_TRIGRAM_INDEX=0 to disable them
+TRIGRAM_INDEX_ENABLED = os.environ.get("PRIDE_TRIGRAM_INDEX", "1") != "0"
+#  files bigger than this aren't indexed, they are always searched
+MAX_INDEXED_FILE_SIZE = 4 * 1024 * 1024
+
+_MAGIC = b"PRIDETRI"
+_VERSION = 1
+_HEADER = struct.Struct("<8sII")  # magic, version, length of json file table
+_TABLE_ENTRY = struct.Struct("<3sII")  # trigram, offset of posting list, count of ids
+_POSTING_TYPE = 'I'
+
+#  kinds of files in file table
+INDEXED = 0
+BINARY = 1
+NOT_INDEXED = 2
+
+
+def file_trigrams(data: bytes) -> typing.Set[bytes]:
+    """
+    Return set of lower case trigrams of text. Trigrams crossing
+    end of line aren't included, so repeated lines are processed once.
+
+    Args:
+        data(bytes): content of file
+
+    Returns:
+        typing.Set[bytes]: trigrams
+    """
+    trigrams = set()
+    for line in set(data.lower().split(b"\n")):
+        trigrams.update(zip(line, line[1:], line[2:]))
+    return set(map(bytes, trigrams))
+
+
+def query_literals(query: str, regex: bool) -> typing.List[bytes]:
+    """
+    Return literal texts which every match of query contains.
+
+    Args:
+        query(str): searched text or regular expression
+        regex(bool): query is regular expression
+
+    Returns:
+        typing.List[bytes]: lower case literals, empty if nothing is required
+    """
+    if not regex:
+        return [query.encode("utf-8").lower()]
+
+    try:
+        parsed = sre_parse.parse(query)
+    except Exception:
+        return []
+
+    literals = []
+    current = []
+
+    def visit(items) -> None:
+        for op, argument in items:
+            if op is sre_parse.LITERAL:
+                current.append(chr(argument))
+            elif op is sre_parse.SUBPATTERN:
+                visit(argument[-1])  # group is matched exactly once
+            else:
+                literals.append("".join(current))
+                current.clear()
+
+    visit(parsed)
+    literals.append("".join(current))
+    return [literal.encode("utf-8").lower() for literal in literals if literal]
+
+
+def literal_trigrams(literal: bytes) -> typing.Set[bytes]:
+    """
+    Return trigrams of query literal which are stored in index.
+
+    Args:
+        literal(bytes): lower case literal
+
+    Returns:
+        typing.Set[bytes]: trigrams
+    """
+    return {literal[i:i + 3] for i in range(len(literal) - 2) if b"\n" not in literal[i:i + 3]}
+
+
+class TrigramIndex:
+    """
+    Index of trigrams of files in directory. Every trigram has sorted
+    list of ids of files containing it. Files are identified by position
+    in file table which contains relative path, mtime, size and kind of file.
+
+    On disk the index is header, json file table, table of trigrams and
+    posting lists stored as raw arrays, which are decoded only when queried.
+    """
+
+    def __init__(self, directory: str, files: typing.List[list] = None,
+                 postings: typing.Dict[bytes, typing.Union[array, memoryview]] = None):
+        self.directory = directory
+        self.files = files or []
+        self.postings = postings or dict()
+        self._states = None
+        self._directories = None
+
+    @classmethod
+    def load(cls, directory: str, index_path: str) -> "TrigramIndex":
+        """
+        Load index from file.
+
+        Args:
+            directory(str): indexed directory
+            index_path(str): path of index file
+
+        Returns:
+            TrigramIndex: loaded index
+
+        Raises:
+            OSError: index can't be read
+            ValueError: index file is invalid
+        """
+        with open(index_path, 'rb') as f:
+            data = f.read()
+        magic, version, files_length = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("invalid trigram index")
+
+        position = _HEADER.size
+        files = json.loads(data[position:position + files_length].decode("utf-8"))
+        position += files_length
+        table_length, = struct.unpack_from("<I", data, position)
+        position += 4
+        table_end = position + table_length * _TABLE_ENTRY.size
+        view = memoryview(data)[table_end:]
+        item_size = array(_POSTING_TYPE).itemsize
+
+        postings = {trigram: view[offset * item_size:(offset + count) * item_size].cast(_POSTING_TYPE)
+                    for trigram, offset, count in _TABLE_ENTRY.iter_unpack(data[position:table_end])}
+        return cls(directory, files, postings)
+
+    def save(self, index_path: str) -> None:
+        """
+        Write index to file atomically.
+
+        Args:
+            index_path(str): path of index file
+        """
+        files = json.dumps(self.files).encode("utf-8")
+        trigrams = sorted(self.postings)
+        table = bytearray()
+        data = array(_POSTING_TYPE)
+        for trigram in trigrams:
+            posting = self.postings[trigram]
+            table += _TABLE_ENTRY.pack(trigram, len(data), len(posting))
+            data.extend(posting)
+
+        content = b"".join((_HEADER.pack(_MAGIC, _VERSION, len(files)), files,
+                            struct.pack("<I", len(trigrams)), table, data.tobytes()))
+        write_atomically(index_path, content, fsync=False)
+
+    def size(self) -> int:
+        """
+        Returns:
+            int: count of ids in all posting lists
+        """
+        return sum(map(len, self.postings.values()))
+
+    def candidates(self, query: str, regex: bool) -> typing.List[str]:
+        """
+        Return files which can contain match of query: indexed files which have
+        all trigrams of the query and files which aren't indexed.
+
+        Args:
+            query(str): searched text or regular expression
+            regex(bool): query is regular expression
+
+        Returns:
+            typing.List[str]: file paths
+        """
+        trigrams = set()
+        for literal in query_literals(query, regex):
+            trigrams.update(literal_trigrams(literal))
+
+        if trigrams:
+            postings = sorted((self.postings.get(trigram, ()) for trigram in trigrams), key=len)
+            ids = set(postings[0]).intersection(*postings[1:])
+        else:
+            ids = (file_id for file_id, (_, _, _, kind) in enumerate(self.files) if kind == INDEXED)
+
+        ids = sorted(set(ids).union(file_id for file_id, (_, _, _, kind) in enumerate(self.files)
+                                    if kind == NOT_INDEXED))
+        return [os.path.join(self.directory, self.files[file_id][0]) for file_id in ids]
+
+    def is_changed(self, path: str) -> bool:
+        """
+        Return whether file of directory was created or changed after the index was updated,
+        it is found by mtime and size like in update_index.
+
+        Args:
+            path(str): file path
+
+        Returns:
+            bool: True if file isn't in index or its mtime or size differs
+        """
+        if self._states is None:
+            self._states = {relative_path: [mtime, size] for relative_path, mtime, size, _ in self.files}
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return self._states.get(os.path.relpath(path, self.directory)) != [stat.st_mtime_ns, stat.st_size]
+
+    def has_directory(self, path: str) -> bool:
+        """
+        Return whether some indexed file is in directory or its subdirectories.
+
+        Args:
+            path(str): directory path
+
+        Returns:
+            bool: False for directory created after the index was updated or without files
+        """
+        if self._directories is None:
+            self._directories = set()
+            for relative_path, *_ in self.files:
+                directory = os.path.dirname(relative_path)
+                while directory and directory not in self._directories:
+                    self._directories.add(directory)
+                    directory = os.path.dirname(directory)
+        return os.path.relpath(path, self.directory) in self._directories
+
+
+def update_index(directory: str, index_path: str) -> typing.Tuple[int, int]:
+    """
+    Update index of directory on disk. Only new files and files
+    with changed mtime or size are read. This function is called in worker process.
+
+    Args:
+        directory(str): indexed directory
+        index_path(str): path of index file
+
+    Returns:
+        typing.Tuple[int, int]: count of all files and count of read files
+    """
+    try:
+        old_index = TrigramIndex.load(directory, index_path)
+    except (OSError, ValueError, struct.error):
+        old_index = TrigramIndex(directory)
+    old_ids = {relative_path: file_id for file_id, (relative_path, *_) in enumerate(old_index.files)}
+
+    kept = []
+    changed = []
+    for path in walk_files(directory):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        relative_path = os.path.relpath(path, directory)
+        old_id = old_ids.get(relative_path)
+        if old_id is not None and old_index.files[old_id][1:3] == [stat.st_mtime_ns, stat.st_size]:
+            kept.append(old_id)
+        else:
+            changed.append((relative_path, stat.st_mtime_ns, stat.st_size))
+
+    kept.sort()  # new ids keep order, so posting lists stay sorted
+    if not changed and len(kept) == len(old_index.files):
+        return len(kept), 0
+
+    mapping = {old_id: new_id for new_id, old_id in enumerate(kept)}
+    files = [old_index.files[old_id] for old_id in kept]
+    postings = dict()
+    for trigram, posting in old_index.postings.items():
+        ids = array(_POSTING_TYPE, map(mapping.__getitem__, filter(mapping.__contains__, posting)))
+        if ids:
+            postings[trigram] = ids
+
+    for relative_path, mtime, size in changed:
+        kind = INDEXED
+        trigrams = ()
+        if size > MAX_INDEXED_FILE_SIZE:
+            kind = NOT_INDEXED
+        else:
+            try:
+                with open(os.path.join(directory, relative_path), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                continue
+            if b"\0" in data[:BINARY_CHECK_SIZE]:
+                kind = BINARY
+            else:
+                trigrams = file_trigrams(data)
+
+        file_id = len(files)
+        files.append([relative_path, mtime, size, kind])
+        for trigram in trigrams:
+            posting = postings.get(trigram)
+            if posting is None:
+                postings[trigram] = array(_POSTING_TYPE, (file_id,))
+            else:
+                posting.append(file_id)
+
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    TrigramIndex(directory, files, postings).save(index_path)
+    return len(files), len(changed)
+
+
+class TrigramIndexes(QObject):
+    """
+    Trigram indexes of opened directories. Indexes are updated in worker process
+    and loaded in own thread pool, whose threads wait for the worker process,
+    so they don't take threads of global pool from other tasks.
+    Paths changed since the last update are marked dirty by file watchers and saves,
+    find in files checks only them instead of listing whole directories.
+    """
+
+    index_updated = pyqtSignal(str)
+
+    def __init__(self, enabled: bool = TRIGRAM_INDEX_ENABLED, parent=None):
+        QObject.__init__(self, parent)
+        self.enabled = enabled
+        self._indexes = dict()
+        self._updating = dict()
+        self._dirty_paths = set()
+        self._executor = None
+        self._thread_pool = QThreadPool(self)
+
+    def update(self, directory: str) -> None:
+        """
+        Start update of directory index.
+
+        Args:
+            directory(str): directory path
+        """
+        if not self.enabled or directory in self._updating:
+            return
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn"))
+
+        worker = Worker(self._update_and_load, self._executor, directory, set(self._dirty_paths))
+        worker.signals.finished.connect(lambda result: self._updated(directory, *result))
+        worker.signals.failed.connect(lambda error: self._updating.pop(directory, None))
+        self._updating[directory] = worker
+        self._thread_pool.start(worker)
+
+    def is_updating(self) -> bool:
+        """
+        Returns:
+            bool: True if index of some directory is being updated
+        """
+        return bool(self._updating)
+
+    def get(self, directory: str) -> typing.Optional[TrigramIndex]:
+        """
+        Args:
+            directory(str): directory path
+
+        Returns:
+            typing.Optional[TrigramIndex]: index of directory or None if it isn't loaded yet
+        """
+        return self._indexes.get(directory)
+
+    def mark_dirty(self, path: str) -> None:
+        """
+        Remember file or directory changed after index update, so it is checked
+        by find in files until next update. Saved file is searched always,
+        in changed directory its changed files and new subdirectories are searched.
+
+        Args:
+            path(str): file or directory path
+        """
+        self._dirty_paths.add(os.path.realpath(path))
+
+    def mark_dirty_paths(self, paths: typing.List[str]) -> None:
+        """
+        Remember files or directories changed after index update.
+        This method is called when directories_changed or files_changed signal of watcher is emitted.
+
+        Args:
+            paths(typing.List[str]): changed files or directories
+        """
+        for path in paths:
+            self.mark_dirty(path)
+
+    def dirty_paths(self, directory: str) -> typing.List[str]:
+        """
+        Return changed paths in directory, paths start with directory as it was opened.
+        Paths in ignored directories are skipped like in update of index.
+
+        Args:
+            directory(str): directory path
+
+        Returns:
+            typing.List[str]: file and directory paths
+        """
+        real_directory = os.path.realpath(directory)
+        prefix = os.path.join(real_directory, "")
+        dirty_paths = []
+        for path in self._dirty_paths:
+            if path != real_directory and not path.startswith(prefix):
+                continue
+            relative_path = os.path.relpath(path, real_directory)
+            if not IGNORED_DIRECTORIES.intersection(relative_path.split(os.sep)):
+                dirty_paths.append(os.path.normpath(os.path.join(directory, relative_path)))
+        return dirty_paths
+
+    def shutdown(self) -> None:
+        """
+        Stop worker process. Used before exit.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    @staticmethod
+    def _update_and_load(executor: ProcessPoolExecutor, directory: str, dirty_paths: typing.Set[str]) -> tuple:
+        """
+        Update index in worker process and load it. This method is called in thread pool.
+
+        Args:
+            executor(ProcessPoolExecutor): executor running the update
+            directory(str): directory path
+            dirty_paths(typing.Set[str]): changed paths known before update
+
+        Returns:
+            tuple: loaded index and dirty paths included in it
+        """
+        index_path = cache_path("trigrams", os.path.realpath(directory))
+        executor.submit(update_index, directory, index_path).result()
+        return TrigramIndex.load(directory, index_path), dirty_paths
+
+    def _updated(self, directory: str, index: TrigramIndex, dirty_paths: typing.Set[str]) -> None:
+        """
+        Use updated index.
+
+        Args:
+            directory(str): directory path
+            index(TrigramIndex): loaded index
+            dirty_paths(typing.Set[str]): changed paths which are part of the index
+        """
+        self._updating.pop(directory, None)
+        self._indexes[directory] = index
+        self._dirty_paths -= dirty_paths
+        self.index_updated.emit(directory)
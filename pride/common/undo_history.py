@@ -0,0 +1,578 @@
+import contextlib
+import itertools
+import sys
+import time
+import typing
+import weakref
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QTextCursor, QTextDocument
+
+
+#  memory which can be held by undo history of one document (bytes)
+DOCUMENT_UNDO_BUDGET = 16 * 1024 * 1024
+#  memory which can be held by undo history of all documents (bytes)
+GLOBAL_UNDO_BUDGET = 64 * 1024 * 1024
+#  typed characters are merged into one step only when typed within this interval (s)
+COALESCE_INTERVAL = 2.0
+#  estimated memory of one step without its texts (bytes)
+STEP_OVERHEAD = 120
+
+#  saved state which history can't return to
+_UNREACHABLE = object()
+
+
+class UndoStep:
+    """
+    One step of history, text removed at position and text added instead of it.
+    """
+
+    __slots__ = ("position", "removed", "added", "time", "sequence", "group", "memory")
+
+    def __init__(self, position: int, removed: str, added: str, sequence: int, group: typing.Optional[int] = None):
+        self.position = position
+        self.removed = removed
+        self.added = added
+        self.time = time.monotonic()
+        self.sequence = sequence
+        self.group = group  # steps of one group are undone and redone together
+        self.memory = 0
+        self.update_memory()
+
+    def update_memory(self) -> int:
+        """
+        Estimate memory of step again.
+
+        Returns:
+            int: change of memory (bytes)
+        """
+        memory = sys.getsizeof(self.removed) + sys.getsizeof(self.added) + STEP_OVERHEAD
+        change = memory - self.memory
+        self.memory = memory
+        return change
+
+
+class UndoBudget:
+    """
+    Memory budget shared by histories of all documents. When histories take
+    more memory than global budget, the oldest steps of all documents are dropped.
+    """
+
+    def __init__(self, document_budget: int = DOCUMENT_UNDO_BUDGET, global_budget: int = GLOBAL_UNDO_BUDGET):
+        self.document_budget = document_budget
+        self.global_budget = global_budget
+        self.memory = 0
+        self.histories = weakref.WeakSet()
+        self._sequence = itertools.count()
+
+    def next_sequence(self) -> int:
+        """
+        Returns:
+            int: order of new step among steps of all documents
+        """
+        return next(self._sequence)
+
+    def enforce(self) -> None:
+        """
+        Drop the oldest steps of all histories until they fit into global budget.
+        """
+        while self.memory > self.global_budget:
+            histories = [history for history in self.histories if history.undo_count() > 1]
+            if not histories:
+                return
+            min(histories, key=lambda history: history.oldest_sequence()).drop_oldest()
+
+
+#  budget of histories of this process
+undo_budget = UndoBudget()
+
+
+class UndoHistory(QObject):
+    """
+    Undo history of document which replaces unlimited undo stack of QTextDocument.
+    Changes are taken from contentsChange signal, which doesn't contain removed text,
+    so editor captures text which can be removed before every edit. Captured text
+    is kept in sync with following changes. Removal of text which wasn't captured
+    can't be undone and it drops the history. Typed and deleted characters are merged
+    into word steps. History keeps within memory budget of document and global budget
+    by dropping its oldest steps.
+    Every change of text, including undo and redo, is reported by text_changed
+    with position, count of removed characters and added text. Positions and counts
+    are in UTF-16 code units like positions of QTextCursor.
+    """
+
+    changed = pyqtSignal()
+    text_changed = pyqtSignal(int, int, str)
+
+    def __init__(self, document: QTextDocument, budget: UndoBudget = undo_budget, parent=None):
+        QObject.__init__(self, parent)
+        self.document = document
+        self.document.setUndoRedoEnabled(False)
+        self.budget = budget
+        self.budget.histories.add(self)
+
+        self.memory = 0
+        self._undo = []
+        self._redo = []
+        self._tracking = False
+        self._captured = None  # position and text which can be removed by the next change
+        self._clean = None  # step on top of undo stack when document was saved
+        self._saving = _UNREACHABLE  # step on top of undo stack when document was passed to save
+        self._coalesce = False
+        self._applying = False
+        self._group = None
+
+        self.document.contentsChange.connect(self.contents_changed)
+        self.document.destroyed.connect(lambda: self._release())
+        self.reset()
+
+    def reset(self, saved: bool = True) -> None:
+        """
+        Drop history and start tracking changes of current text of document.
+
+        Args:
+            saved(bool): current text is saved state, otherwise history can't return to saved state
+        """
+        self._tracking = True
+        self._captured = None
+        self._clear()
+        if not saved:
+            self._clean = _UNREACHABLE
+        self.changed.emit()
+
+    def suspend(self) -> None:
+        """
+        Drop history and stop tracking changes, e.g. while file is loaded. Tracking starts again by reset.
+        """
+        self._tracking = False
+        self._captured = None
+        self._clear()
+        self.changed.emit()
+
+    def undo_count(self) -> int:
+        """
+        Returns:
+            int: count of steps which can be undone
+        """
+        return len(self._undo)
+
+    def redo_count(self) -> int:
+        """
+        Returns:
+            int: count of steps which can be redone
+        """
+        return len(self._redo)
+
+    def capture(self, start: int, end: int) -> None:
+        """
+        Remember text which can be removed by the next changes. Captured text is kept
+        until the next capture, it is updated by changes which don't overlap it partially.
+
+        Args:
+            start(int): position of the first captured character
+            end(int): position after the last captured character
+        """
+        if self._tracking:
+            self._captured = (start, self._text(start, end))
+
+    @contextlib.contextmanager
+    def capturing(self, start: int, end: int) -> typing.Iterator[None]:
+        """
+        Capture text which can be removed by changes made in context and drop it after them.
+
+        Args:
+            start(int): position of the first captured character
+            end(int): position after the last captured character
+        """
+        self.capture(start, end)
+        try:
+            yield
+        finally:
+            self._captured = None
+
+    @contextlib.contextmanager
+    def grouped(self) -> typing.Iterator[None]:
+        """
+        Record all changes made in context as one step, which is undone and redone at once.
+        """
+        self._group = self.budget.next_sequence()
+        self._coalesce = False
+        try:
+            yield
+        finally:
+            self._group = None
+            self._coalesce = False
+
+    def oldest_sequence(self) -> int:
+        """
+        Returns:
+            int: order of the oldest step among steps of all documents
+        """
+        return self._undo[0].sequence if self._undo else sys.maxsize
+
+    def mark_clean(self) -> None:
+        """
+        Remember current state as saved, document isn't modified when history returns to it.
+        """
+        self._clean = self._top()
+        self._coalesce = False
+
+    def mark_saving(self) -> None:
+        """
+        Remember current state as state being written, it becomes saved state by mark_saved.
+        """
+        self._saving = self._top()
+        self._coalesce = False
+
+    def mark_saved(self) -> None:
+        """
+        Make state being written saved state, when its write succeeded.
+        """
+        self._clean = self._saving
+        self._saving = _UNREACHABLE
+        self._update_modified()
+        self.changed.emit()
+
+    def cancel_saving(self) -> None:
+        """
+        Forget state being written, when its write failed.
+        """
+        self._saving = _UNREACHABLE
+
+    def undo(self) -> typing.Optional[int]:
+        """
+        Revert the newest step.
+
+        Returns:
+            typing.Optional[int]: position of cursor after undo or None if there is nothing to undo
+        """
+        if not self._undo or not self._tracking:
+            return None
+        step = self._undo.pop()
+        self._redo.append(step)
+        self._apply(step.position, _utf16_length(step.added), step.removed)
+        while step.group is not None and self._undo and self._undo[-1].group == step.group:
+            step = self._undo.pop()
+            self._redo.append(step)
+            self._apply(step.position, _utf16_length(step.added), step.removed)
+        self._coalesce = False
+        self._update_modified()
+        self.changed.emit()
+        return step.position + _utf16_length(step.removed)
+
+    def redo(self) -> typing.Optional[int]:
+        """
+        Apply again the newest undone step.
+
+        Returns:
+            typing.Optional[int]: position of cursor after redo or None if there is nothing to redo
+        """
+        if not self._redo or not self._tracking:
+            return None
+        step = self._redo.pop()
+        self._undo.append(step)
+        self._apply(step.position, _utf16_length(step.removed), step.added)
+        while step.group is not None and self._redo and self._redo[-1].group == step.group:
+            step = self._redo.pop()
+            self._undo.append(step)
+            self._apply(step.position, _utf16_length(step.removed), step.added)
+        self._coalesce = False
+        self._update_modified()
+        self.changed.emit()
+        return step.position + _utf16_length(step.added)
+
+    def drop_oldest(self) -> None:
+        """
+        Drop the oldest step, state before it can't be restored anymore.
+        """
+        step = self._undo.pop(0)
+        if self._clean is None:
+            self._clean = _UNREACHABLE  # saved state was before the dropped step
+        elif self._clean is step:
+            self._clean = None
+        if self._saving is None:
+            self._saving = _UNREACHABLE
+        elif self._saving is step:
+            self._saving = None
+        self._add_memory(-step.memory)
+
+    def contents_changed(self, position: int, removed: int, added: int) -> None:
+        """
+        Record change of document as new step or merge it into the newest step.
+        This method is called when contentsChange signal of document is emitted.
+
+        Args:
+            position(int): position of change
+            removed(int): count of removed characters
+            added(int): count of added characters
+        """
+        if not self._tracking:
+            return
+        overflow = position + added - (self.document.characterCount() - 1)
+        if overflow > 0:  # the last paragraph separator is reported as changed sometimes, but it stays
+            removed -= overflow
+            added -= overflow
+        span = self._captured_span(position, removed, added)
+        if span is None:
+            if removed == added:
+                return  # change of formats, e.g. by highlighter, is reported as change of text too
+            if removed:
+                self._drop_uncaptured(position, removed, added)
+                return
+            removed_text = ""
+        added_text = self._text(position, position + added)
+        if span is not None:
+            start, text = self._captured
+            removed_text = text[span[0]:span[1]]
+            self._captured = (start, text[:span[0]] + added_text + text[span[1]:])
+        if removed_text == added_text:
+            return
+
+        # ranges reported by qt can be wider than the change
+        prefix = 0
+        while prefix < min(len(removed_text), len(added_text)) and removed_text[prefix] == added_text[prefix]:
+            prefix += 1
+        suffix = 0
+        while (suffix < min(len(removed_text), len(added_text)) - prefix
+               and removed_text[-1 - suffix] == added_text[-1 - suffix]):
+            suffix += 1
+        position += _utf16_length(removed_text[:prefix])
+        removed_text = removed_text[prefix:len(removed_text) - suffix]
+        added_text = added_text[prefix:len(added_text) - suffix]
+        self.text_changed.emit(position, _utf16_length(removed_text), added_text)
+        if self._applying:
+            return
+
+        self._record(position, removed_text, added_text)
+        self._update_modified()
+        self.changed.emit()
+
+    def _record(self, position: int, removed: str, added: str) -> None:
+        """
+        Add step to history and keep history within budget.
+
+        Args:
+            position(int): position of change
+            removed(str): removed text
+            added(str): added text
+        """
+        for step in self._redo:
+            self._add_memory(-step.memory)
+            if step is self._clean:
+                self._clean = _UNREACHABLE
+            if step is self._saving:
+                self._saving = _UNREACHABLE
+        self._redo.clear()
+
+        top = self._top()
+        if (self._coalesce and top is not None and top is not self._clean and top is not self._saving
+                and self._merge(top, position, removed, added)):
+            self._add_memory(top.update_memory())
+        else:
+            step = UndoStep(position, removed, added, self.budget.next_sequence(), self._group)
+            self._undo.append(step)
+            self._add_memory(step.memory)
+        self._coalesce = self._group is None
+
+        while self.memory > self.budget.document_budget and len(self._undo) > 1:
+            self.drop_oldest()
+        self.budget.enforce()
+
+    @staticmethod
+    def _merge(step: UndoStep, position: int, removed: str, added: str) -> bool:
+        """
+        Merge typed or deleted character into step, when it continues the same word.
+
+        Args:
+            step(UndoStep): the newest step
+            position(int): position of change
+            removed(str): removed text
+            added(str): added text
+
+        Returns:
+            bool: True if change was merged
+        """
+        if time.monotonic() - step.time > COALESCE_INTERVAL:
+            return False
+
+        if not removed and len(added) == 1 and added != "\n" and step.added:
+            # typing, space after word belongs to the word, next word starts new step
+            if (position != step.position + _utf16_length(step.added)
+                    or (_is_word(added) and not _is_word(step.added[-1]))):
+                return False
+            step.added += added
+        elif not added and len(removed) == 1 and removed != "\n" and step.removed and not step.added:
+            if position + _utf16_length(removed) == step.position:  # backspace
+                if _is_word(step.removed[0]) and not _is_word(removed):
+                    return False
+                step.removed = removed + step.removed
+                step.position = position
+            elif position == step.position:  # delete
+                if _is_word(step.removed[-1]) and not _is_word(removed):
+                    return False
+                step.removed += removed
+            else:
+                return False
+        else:
+            return False
+
+        step.time = time.monotonic()
+        return True
+
+    def _captured_span(self, position: int, removed: int, added: int) -> typing.Optional[typing.Tuple[int, int]]:
+        """
+        Find removed text in captured text. Captured text is moved by change before it
+        and it is dropped when change overlaps it partially.
+
+        Args:
+            position(int): position of change
+            removed(int): count of removed characters
+            added(int): count of added characters
+
+        Returns:
+            typing.Optional[typing.Tuple[int, int]]: start and end of removed text in captured string
+                or None if change isn't inside of captured text
+        """
+        if self._captured is None:
+            return None
+        start, text = self._captured
+        end = start + _utf16_length(text)
+        if start <= position and position + removed <= end:
+            return _string_index(text, position - start), _string_index(text, position + removed - start)
+        if position + removed <= start:
+            self._captured = (start + added - removed, text)
+        elif position < end:
+            self._captured = None
+        return None
+
+    def _drop_uncaptured(self, position: int, removed: int, added: int) -> None:
+        """
+        Drop history after removal of text which wasn't captured, the change can't be undone.
+
+        Args:
+            position(int): position of change
+            removed(int): count of removed characters
+            added(int): count of added characters
+        """
+        self._captured = None
+        self.text_changed.emit(position, removed, self._text(position, position + added))
+        self._clear()
+        self._clean = _UNREACHABLE
+        self._update_modified()
+        self.changed.emit()
+
+    def _text(self, start: int, end: int) -> str:
+        """
+        Args:
+            start(int): position of the first character
+            end(int): position after the last character
+
+        Returns:
+            str: text of document between positions with new lines
+        """
+        last = self.document.characterCount() - 1  # the last paragraph separator can't be selected
+        cursor = QTextCursor(self.document)
+        cursor.setPosition(min(start, last))
+        cursor.setPosition(min(end, last), QTextCursor.KeepAnchor)
+        return cursor.selectedText().replace("\u2029", "\n")
+
+    def _apply(self, position: int, length: int, text: str) -> None:
+        """
+        Replace text of document without recording it.
+
+        Args:
+            position(int): position of replaced text
+            length(int): length of replaced text
+            text(str): new text
+        """
+        cursor = QTextCursor(self.document)
+        cursor.setPosition(position)
+        cursor.setPosition(position + length, QTextCursor.KeepAnchor)
+        self._applying = True
+        try:
+            with self.capturing(position, position + length):
+                cursor.insertText(text)
+        finally:
+            self._applying = False
+
+    def _update_modified(self) -> None:
+        """
+        Document isn't modified when history is in saved state.
+        """
+        self.document.setModified(self._top() is not self._clean)
+
+    def _top(self) -> typing.Optional[UndoStep]:
+        """
+        Returns:
+            typing.Optional[UndoStep]: the newest step which can be undone
+        """
+        return self._undo[-1] if self._undo else None
+
+    def _release(self) -> None:
+        """
+        Drop history of destroyed document.
+        """
+        self._tracking = False
+        self._captured = None
+        self._clear()
+        self.budget.histories.discard(self)
+
+    def _clear(self) -> None:
+        """
+        Drop all steps, current state is saved state.
+        """
+        self._add_memory(-self.memory)
+        self._undo.clear()
+        self._redo.clear()
+        self._clean = None
+        self._saving = _UNREACHABLE
+        self._coalesce = False
+
+    def _add_memory(self, change: int) -> None:
+        """
+        Args:
+            change(int): change of memory of history (bytes)
+        """
+        self.memory += change
+        self.budget.memory += change
+
+
+def _is_word(character: str) -> bool:
+    """
+    Args:
+        character(str): one character
+
+    Returns:
+        bool: True if character is part of identifier or number
+    """
+    return character.isalnum() or character == "_"
+
+
+def _utf16_length(text: str) -> int:
+    """
+    Args:
+        text(str): text
+
+    Returns:
+        int: length of text in UTF-16 code units, characters outside of basic plane take two units
+    """
+    return len(text.encode("utf-16-le", "surrogatepass")) // 2
+
+
+def _string_index(text: str, offset: int) -> int:
+    """
+    Args:
+        text(str): text
+        offset(int): offset in UTF-16 code units
+
+    Returns:
+        int: index of character at offset in string
+    """
+    if offset <= 0 or len(text) == _utf16_length(text):
+        return offset
+    index = 0
+    units = 0
+    while units < offset and index < len(text):
+        units += 2 if text[index] > "\uffff" else 1
+        index += 1
+    return index
@@ -0,0 +1,37 @@
+import typing
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class WorkerSignals(QObject):
+    """
+    Signals of Worker. QRunnable isn't QObject so it can't have own signals.
+    """
+
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+
+class Worker(QRunnable):
+    """
+    Runnable which calls function in thread pool
+    and reports its result back by signals.
+    """
+
+    def __init__(self, function: typing.Callable, *args, **kwargs):
+        QRunnable.__init__(self)
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self) -> None:
+        """
+        Call function and emit its result or raised exception.
+        """
+        try:
+            result = self.function(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(result)
@@ -0,0 +1,29 @@
+import os
+import typing
+
+from .base import IncrementalHighlighter
+from .python import PythonHighlighter
+
+__all__ = ["IncrementalHighlighter", "PythonHighlighter", "HIGHLIGHTERS", "highlighter_for_file"]
+
+#  highlighter classes by file extension
+HIGHLIGHTERS = {
+    ".py": PythonHighlighter,
+    ".pyw": PythonHighlighter,
+    ".pyi": PythonHighlighter,
+}
+
+
+def highlighter_for_file(file_path: typing.Optional[str]) -> typing.Optional[typing.Type[IncrementalHighlighter]]:
+    """
+    Return highlighter class for file by its extension.
+
+    Args:
+        file_path(typing.Optional[str]): file path or None for new file
+
+    Returns:
+        typing.Optional[typing.Type[IncrementalHighlighter]]: highlighter class or None
+    """
+    if file_path is None:
+        return None
+    return HIGHLIGHTERS.get(os.path.splitext(file_path)[1].lower())
@@ -0,0 +1,195 @@
+import time
+import typing
+
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtGui import QTextDocument, QTextBlock, QTextLayout, QTextCharFormat
+
+
+#  time which can be spent by highlighting in one idle event loop iteration (s)
+IDLE_TIME_BUDGET = 0.005
+#  time which can be spent by highlighting directly after edit (s)
+EDIT_TIME_BUDGET = 0.002
+
+#  state of block which wasn't highlighted yet
+NOT_HIGHLIGHTED = -1
+
+
+class IncrementalHighlighter(QObject):
+    """
+    Base class of syntax highlighters. Every block stores its end state
+    (e.g. open string) in userState. After edit, highlighting starts at
+    the edited block and stops at first block after the edited range whose
+    end state didn't change. Work which doesn't fit into time budget
+    is finished in idle time in small slices.
+
+    Subclasses implement highlight_block.
+    """
+
+    def __init__(self, document: QTextDocument, parent=None):
+        QObject.__init__(self, parent)
+        self.document = document
+        self.document.contentsChange.connect(self._contents_changed)
+
+        self._pending = []  # start and end of ranges waiting for highlighting
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setInterval(0)
+        self._idle_timer.timeout.connect(self._highlight_pending)
+
+        self._schedule(0, document.characterCount())
+        self._idle_timer.start()
+
+    def highlight_block(self, text: str, state: int) -> typing.Tuple[typing.List[typing.Tuple[int, int, QTextCharFormat]], int]:
+        """
+        Highlight text of one block.
+
+        Args:
+            text(str): text of block
+            state(int): end state of previous block
+
+        Returns:
+            typing.Tuple[typing.List[typing.Tuple[int, int, QTextCharFormat]], int]: formats as start,
+                length and format and end state of block
+        """
+        raise NotImplementedError
+
+    def is_finished(self) -> bool:
+        """
+        Returns:
+            bool: True if there is nothing waiting for highlighting
+        """
+        return not self._pending
+
+    def detach(self) -> None:
+        """
+        Stop highlighting of document and remove all formats.
+        """
+        self.document.contentsChange.disconnect(self._contents_changed)
+        self._idle_timer.stop()
+        self._pending.clear()
+        block = self.document.firstBlock()
+        while block.isValid():
+            block.layout().clearFormats()
+            block.setUserState(NOT_HIGHLIGHTED)
+            block = block.next()
+        self.document.markContentsDirty(0, self.document.characterCount())
+
+    def _contents_changed(self, position: int, removed: int, added: int) -> None:
+        """
+        Highlight edited range. What doesn't fit into time budget
+        is highlighted in idle time.
+        This method is called when contentsChange signal of document is emitted.
+
+        Args:
+            position(int): position of change
+            removed(int): count of removed characters
+            added(int): count of added characters
+        """
+        for item in self._pending:
+            item[0] = self._shift(item[0], position, removed, added)
+            item[1] = self._shift(item[1], position, removed, added)
+
+        item = self._schedule(position, position + added)
+        if self._highlight_range(item, time.perf_counter() + EDIT_TIME_BUDGET):
+            self._pending.remove(item)
+        else:
+            self._idle_timer.start()
+
+    @staticmethod
+    def _shift(value: int, position: int, removed: int, added: int) -> int:
+        """
+        Move position of pending range by change of document.
+
+        Args:
+            value(int): position in document before change
+            position(int): position of change
+            removed(int): count of removed characters
+            added(int): count of added characters
+
+        Returns:
+            int: position in document after change
+        """
+        if value >= position + removed:
+            return value + added - removed
+        return min(value, position)
+
+    def _schedule(self, start: int, end: int) -> typing.List[int]:
+        """
+        Add range to pending ranges. QTextCursor can't be used to track the range,
+        cursors created while document is being cleared are lost by the document.
+
+        Args:
+            start(int): start position
+            end(int): end position
+
+        Returns:
+            typing.List[int]: pending range, it is moved by following changes
+        """
+        item = [start, end]
+        self._pending.append(item)
+        return item
+
+    def _highlight_pending(self) -> None:
+        """
+        Highlight pending ranges until idle time budget is spent.
+        """
+        deadline = time.perf_counter() + IDLE_TIME_BUDGET
+        self._pending.sort()
+        while self._pending:
+            if not self._highlight_range(self._pending[0], deadline):
+                return
+            self._pending.pop(0)
+        self._idle_timer.stop()
+
+    def _highlight_range(self, item: typing.List[int], deadline: float) -> bool:
+        """
+        Highlight blocks of range and following blocks while their end state changes.
+        At least one block is highlighted even if deadline passed.
+
+        Args:
+            item(typing.List[int]): start and end of range
+            deadline(float): time when highlighting has to stop
+
+        Returns:
+            bool: True if range was finished, False if deadline passed
+        """
+        block = self.document.findBlock(item[0])
+        first = True
+        while block.isValid():
+            if not first and time.perf_counter() > deadline:
+                item[0] = block.position()  # continue here next time
+                return False
+            first = False
+
+            old_state = block.userState()
+            new_state = self._highlight(block)
+            next_block = block.next()
+            if (block.position() + block.length() > item[1] and new_state == old_state
+                    and (not next_block.isValid() or next_block.userState() != NOT_HIGHLIGHTED)):
+                return True
+            block = next_block
+        return True
+
+    def _highlight(self, block: QTextBlock) -> int:
+        """
+        Highlight one block and store its end state.
+
+        Args:
+            block(QTextBlock): highlighted block
+
+        Returns:
+            int: end state of block
+        """
+        previous_state = block.previous().userState()
+        formats, state = self.highlight_block(block.text(), max(previous_state, 0))
+
+        format_ranges = []
+        for start, length, text_format in formats:
+            format_range = QTextLayout.FormatRange()
+            format_range.start = start
+            format_range.length = length
+            format_range.format = text_format
+            format_ranges.append(format_range)
+        block.layout().setFormats(format_ranges)
+        block.setUserState(state)
+        self.document.markContentsDirty(block.position(), block.length())
+        return state
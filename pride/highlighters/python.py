@@ -0,0 +1,176 @@
+import builtins
+import keyword
+import re
+import typing
+
+from PyQt5.QtGui import QColor, QFont, QTextCharFormat
+
+from pride.highlighters.base import IncrementalHighlighter
+
+
+#  bits of block state used by kind of unclosed triple quoted string
+STRING_STATE_MASK = 0b11
+#  block state is shifted by this to store depth of unclosed brackets
+BRACKET_DEPTH_SHIFT = 2
+#  depth of brackets is limited, so the state is small int
+MAX_BRACKET_DEPTH = 255
+
+#  unclosed triple quoted string kinds stored in block state
+_TRIPLE_QUOTES = ("", "'''", '"""')
+
+_KEYWORDS = frozenset(keyword.kwlist)
+_BUILTINS = frozenset(name for name in dir(builtins) if not name.startswith("_"))
+_OPENING_BRACKETS = "([{"
+
+_TOKEN_RE = re.compile(r"""
+    (?P<comment>\#.*)
+    |(?P<string>(?<![\w])[rRbBuUfF]{0,2}(?:'''|\"\"\"|'(?:[^'\\]|\\.)*'?|"(?:[^"\\]|\\.)*"?))
+    |(?P<decorator>^\s*@[\w.]+)
+    |(?P<number>\b(?:0[xXoObB][\da-fA-F_]+|\d[\d_]*\.?[\d_]*(?:[eE][+-]?\d+)?[jJ]?)\b)
+    |(?P<word>[A-Za-z_]\w*)
+    |(?P<bracket>[()\[\]{}])
+""", re.VERBOSE)
+
+
+def _text_format(color: str, bold: bool = False, italic: bool = False) -> QTextCharFormat:
+    """
+    Create format of highlighted token.
+
+    Args:
+        color(str): name of color
+        bold(bool): bold font
+        italic(bool): italic font
+
+    Returns:
+        QTextCharFormat: text format
+    """
+    text_format = QTextCharFormat()
+    text_format.setForeground(QColor(color))
+    if bold:
+        text_format.setFontWeight(QFont.Bold)
+    text_format.setFontItalic(italic)
+    return text_format
+
+
+class PythonHighlighter(IncrementalHighlighter):
+    """
+    Highlighter of Python code. End state of block holds
+    unclosed triple quoted string and depth of unclosed brackets.
+    """
+
+    FORMATS = {
+        "keyword": _text_format("#000080", bold=True),
+        "builtin": _text_format("#8A2BE2"),
+        "self": _text_format("#94558D", italic=True),
+        "definition": _text_format("#00627A", bold=True),
+        "string": _text_format("#067D17"),
+        "comment": _text_format("#8C8C8C", italic=True),
+        "number": _text_format("#1750EB"),
+        "decorator": _text_format("#9E880D"),
+    }
+
+    def highlight_block(self, text: str, state: int) -> typing.Tuple[typing.List[typing.Tuple[int, int, QTextCharFormat]], int]:
+        """
+        Highlight one line of Python code.
+
+        Args:
+            text(str): text of line
+            state(int): end state of previous line
+
+        Returns:
+            typing.Tuple[typing.List[typing.Tuple[int, int, QTextCharFormat]], int]: formats as start,
+                length and format and end state of line
+        """
+        formats = []
+        string_kind = state & STRING_STATE_MASK
+        depth = state >> BRACKET_DEPTH_SHIFT
+        position = 0
+
+        if string_kind:
+            string_end = self._string_end(text, 0, _TRIPLE_QUOTES[string_kind])
+            if string_end is None:
+                formats.append((0, len(text), self.FORMATS["string"]))
+                return formats, state
+            formats.append((0, string_end, self.FORMATS["string"]))
+            position = string_end
+            string_kind = 0
+
+        previous_word = None
+        for match in _TOKEN_RE.finditer(text, position):
+            token = match.lastgroup
+            start, end = match.span()
+            if token == "word":
+                word = match.group()
+                if word in _KEYWORDS:
+                    formats.append((start, end - start, self.FORMATS["keyword"]))
+                elif previous_word in ("def", "class"):
+                    formats.append((start, end - start, self.FORMATS["definition"]))
+                elif word in ("self", "cls"):
+                    formats.append((start, end - start, self.FORMATS["self"]))
+                elif word in _BUILTINS:
+                    formats.append((start, end - start, self.FORMATS["builtin"]))
+                previous_word = word
+                continue
+            previous_word = None
+
+            if token == "bracket":
+                if match.group() in _OPENING_BRACKETS:
+                    depth = min(depth + 1, MAX_BRACKET_DEPTH)
+                else:
+                    depth = max(depth - 1, 0)
+            elif token == "string":
+                quote = match.group().lstrip("rRbBuUfF")
+                if quote in _TRIPLE_QUOTES[1:]:
+                    string_end = self._string_end(text, end, quote)
+                    if string_end is None:
+                        formats.append((start, len(text) - start, self.FORMATS["string"]))
+                        string_kind = _TRIPLE_QUOTES.index(quote)
+                        break
+                    formats.append((start, string_end - start, self.FORMATS["string"]))
+                    # rest of line is matched again after the string
+                    return self._highlight_rest(text, string_end, formats, depth)
+                formats.append((start, end - start, self.FORMATS["string"]))
+            else:
+                formats.append((start, end - start, self.FORMATS[token]))
+
+        return formats, string_kind | (depth << BRACKET_DEPTH_SHIFT)
+
+    def _highlight_rest(self, text: str, position: int, formats: list,
+                        depth: int) -> typing.Tuple[typing.List[typing.Tuple[int, int, QTextCharFormat]], int]:
+        """
+        Highlight text of line after closed triple quoted string.
+
+        Args:
+            text(str): text of line
+            position(int): end of string
+            formats(list): formats of line before position
+            depth(int): depth of brackets at position
+
+        Returns:
+            typing.Tuple[typing.List[typing.Tuple[int, int, QTextCharFormat]], int]: formats and end state of line
+        """
+        rest_formats, state = self.highlight_block(text[position:], depth << BRACKET_DEPTH_SHIFT)
+        formats.extend((start + position, length, text_format) for start, length, text_format in rest_formats)
+        return formats, state
+
+    @staticmethod
+    def _string_end(text: str, position: int, quote: str) -> typing.Optional[int]:
+        """
+        Find end of triple quoted string.
+
+        Args:
+            text(str): text of line
+            position(int): position inside of string
+            quote(str): closing quotes
+
+        Returns:
+            typing.Optional[int]: position after closing quotes or None if string isn't closed
+        """
+        while True:
+            end = text.find(quote, position)
+            if end == -1:
+                return None
+            escapes = len(text[position:end]) - len(text[position:end].rstrip("\\"))
+            if escapes % 2 == 0:
+                return end + len(quote)
+            position = end + 1
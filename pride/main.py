@@ -1,12 +1,88 @@
+import math
+import os
 import sys
+import typing
 
-from PyQt5.QtWidgets import QApplication
+from pride.common.startup_timeline import timeline
 
-from pride.widgets import MainWindow
+with timeline.measure("import PyQt5"):
+    from PyQt5.QtWidgets import QApplication
+
+with timeline.measure("import pride.widgets"):
+    from pride.widgets import MainWindow
+
+from pride.common.edit_journal import JOURNAL_DIRECTORY
+from pride.common.session import SESSION_FILE
+from pride.common.stall_detector import STALL_LOG_FILE, STALL_LOG_VARIABLE, STALL_THRESHOLD_VARIABLE
+
+
+#  command line option enabling startup timeline, it is followed by path of output file
+STARTUP_TIMELINE_OPTION = "--startup-timeline"
+#  command line option which starts without restoring and saving of session and without journals of unsaved changes
+NO_SESSION_OPTION = "--no-session"
+#  command line option enabling stall detector, it is followed by threshold of stall in milliseconds
+STALL_THRESHOLD_OPTION = "--stall-threshold"
+
+
+def start(argv: typing.List[str]) -> typing.Tuple[QApplication, MainWindow]:
+    """
+    Create application and show main window.
+
+    Args:
+        argv(typing.List[str]): command line arguments
+
+    Returns:
+        typing.Tuple[QApplication, MainWindow]: application and main window
+    """
+    if STARTUP_TIMELINE_OPTION in argv[:-1]:
+        timeline.output_path = argv[argv.index(STARTUP_TIMELINE_OPTION) + 1]
+
+    with timeline.measure("QApplication"):
+        app = QApplication(argv)
+    with timeline.measure("MainWindow"):
+        window = MainWindow()
+    if NO_SESSION_OPTION not in argv:
+        with timeline.measure("restore session"):
+            window.restore_session(SESSION_FILE)
+        with timeline.measure("find journals"):
+            window.code_editor.start_journal(JOURNAL_DIRECTORY)
+
+    stall_threshold = os.environ.get(STALL_THRESHOLD_VARIABLE)
+    if STALL_THRESHOLD_OPTION in argv[:-1]:
+        stall_threshold = argv[argv.index(STALL_THRESHOLD_OPTION) + 1]
+    stall_threshold = _parse_stall_threshold(stall_threshold)
+    if stall_threshold is not None:
+        window.start_stall_detector(stall_threshold, os.environ.get(STALL_LOG_VARIABLE) or STALL_LOG_FILE)
+
+    with timeline.measure("show"):
+        window.showMaximized()
+    return app, window
+
+
+def _parse_stall_threshold(value: typing.Optional[str]) -> typing.Optional[float]:
+    """
+    Parse threshold of stall detector. Invalid value is reported and ignored,
+    zero or negative threshold would log every heartbeat as stall.
+
+    Args:
+        value(typing.Optional[str]): threshold in milliseconds, stall detector is disabled if empty
+
+    Returns:
+        typing.Optional[float]: threshold or None if stall detector isn't started
+    """
+    if not value:
+        return None
+    try:
+        threshold = float(value)
+    except ValueError:
+        threshold = math.nan
+    if not (math.isfinite(threshold) and threshold > 0):
+        print("Stall detector isn't started, threshold has to be positive number of milliseconds: {!r}".format(value),
+              file=sys.stderr)
+        return None
+    return threshold
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.showMaximized()
+    app, window = start(sys.argv)
     sys.exit(app.exec_())
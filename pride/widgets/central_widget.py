@@ -2,6 +2,8 @@ from PyQt5.QtWidgets import QWidget, QHBoxLayout, QSplitter
 from PyQt5.QtCore import Qt
 
 from pride.common.decorators import file_exception_handling
+from pride.common.document_registry import DocumentRegistry
+from pride.common.startup_timeline import timeline
 from pride.widgets import CodeEditorTabWidget
 from pride.widgets import OpenedFilesWidget
 
@@ -14,22 +16,22 @@ class CentralIDEWidget(QWidget):
 
     def __init__(self, parent=None):
         QWidget.__init__(self, parent)
-        self.opened_files_widget = OpenedFilesWidget(self)
-        self.code_editor_widget = CodeEditorTabWidget(self)
+        self.document_registry = DocumentRegistry(parent=self)
+        with timeline.measure("OpenedFilesWidget"):
+            self.opened_files_widget = OpenedFilesWidget(self.document_registry, self)
+        with timeline.measure("CodeEditorTabWidget"):
+            self.code_editor_widget = CodeEditorTabWidget(self.document_registry, self)
 
         self.opened_files_widget.open_file_on_double_click.connect(self.open_file)
-        self.code_editor_widget.open_new_file.connect(self.add_file_to_list)
-        self.code_editor_widget.change_active_file.connect(self.change_current_active_file)
-        self.code_editor_widget.close_file.connect(self.remove_file_from_list)
 
-        splitter = QSplitter(Qt.Horizontal)
-        splitter.addWidget(self.opened_files_widget)
-        splitter.addWidget(self.code_editor_widget)
-        splitter.setSizes([120, 880])
+        self.splitter = QSplitter(Qt.Horizontal)
+        self.splitter.addWidget(self.opened_files_widget)
+        self.splitter.addWidget(self.code_editor_widget)
+        self.splitter.setSizes([120, 880])
 
         horizontal_layout = QHBoxLayout()
         horizontal_layout.setSpacing(0)
-        horizontal_layout.addWidget(splitter)
+        horizontal_layout.addWidget(self.splitter)
 
         self.setLayout(horizontal_layout)
 
@@ -43,33 +45,6 @@ class CentralIDEWidget(QWidget):
         """
         self.code_editor_widget.open_file(file_path)
 
-    def add_file_to_list(self, file_path: str) -> None:
-        """
-        Just wrapper around OpenedFilesWidget class
-
-        Args:
-            file_path(str): file path
-        """
-        self.opened_files_widget.add_file(file_path)
-
-    def remove_file_from_list(self, file_path: str) -> None:
-        """
-        Just wrapper around OpenedFilesWidget class
-
-        Args:
-            file_path(str): file path
-        """
-        self.opened_files_widget.remove_file(file_path)
-
-    def change_current_active_file(self, file_path):
-        """
-        Just wrapper around OpenedFilesWidget class
-
-        Args:
-            file_path(str): file path
-        """
-        self.opened_files_widget.change_current_active_file(file_path)
-
     def open_dir(self, dir_path: str) -> None:
         """
         Just wrapper around OpenedFilesWidget class
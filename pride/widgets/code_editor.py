@@ -1,28 +1,131 @@
+import contextlib
 import os
 import typing
-
-from PyQt5.QtCore import Qt, QRect, pyqtSignal
-from PyQt5.QtGui import QKeyEvent, QPaintEvent, QPainter, QColor, QMouseEvent, QTextCursor, QWheelEvent
-from PyQt5.QtWidgets import QPlainTextEdit, QWidget, QHBoxLayout, QVBoxLayout, QTabWidget, QTabBar, QStatusBar
+from collections import deque
+
+from PyQt5.QtCore import Qt, QEvent, QPoint, QRect, QThreadPool, QTimer, pyqtSignal
+from PyQt5.QtGui import (
+    QContextMenuEvent, QDropEvent, QInputMethodEvent, QKeyEvent, QKeySequence, QPaintEvent, QPainter, QColor, QFont,
+    QMouseEvent, QStaticText, QTextCursor, QTextDocument, QTransform, QWheelEvent
+)
+from PyQt5.QtWidgets import (
+    QPlainTextEdit, QWidget, QHBoxLayout, QVBoxLayout, QTabWidget, QTabBar, QStatusBar, QProgressBar, QPushButton,
+    QStyle, QToolButton, QMessageBox
+)
+
+from pride.common.document_registry import DocumentRegistry
+from pride.common.edit_journal import FileState, JournalWriter, SavedJournal, file_state, find_journals, replay_journal
+from pride.common.file_format import DEFAULT_ENCODING, FALLBACK_ENCODING, FileFormat, sniff_format
+from pride.common.file_loader import FileLoader
+from pride.common.file_system_watcher import DebouncedFileWatcher
+from pride.common.line_diff import line_changes
+from pride.common.save_pipeline import SavePipeline
+from pride.common.session import SessionTab
+from pride.common.undo_history import UndoHistory
+from pride.common.workers import Worker
+from pride.dialogs.error_dialog import ErrorDialog
+from pride.highlighters import IncrementalHighlighter, highlighter_for_file
+from pride.widgets.hex_view import HexView
+from pride.widgets.large_file_view import LargeFileView, LARGE_FILE_THRESHOLD
+
+
+#  count of rendered line numbers kept in cache of LinesNumberBar, per font
+MAX_CACHED_LINE_NUMBERS = 4096
 
 
 class CodeEdit(QPlainTextEdit):
     """
     Simple inherited class from QPlainTextEdit
-    for overriding keyPressEvent.
+    for overriding keyPressEvent. Text which can be removed
+    by user is captured by undo history before every edit.
     """
+
+    undo_requested = pyqtSignal()
+    redo_requested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        QPlainTextEdit.__init__(self, parent)
+        self.undo_history = None  # history of document, set by editor widget
+        self._drag_pressed = False
+
     def keyPressEvent(self, event: QKeyEvent) -> None:
         """
         Overridden keyPressEvent which adjust default behaviour of
-        key tab.
+        key tab. Undo and redo are handled by undo history of editor,
+        undo stack of document is disabled.
 
         Args:
             event(QKeyEvent): qt event object with event data
         """
-        if event.key() == Qt.Key_Tab:
-            self.textCursor().insertText("    ")
+        if event.matches(QKeySequence.Undo):
+            self.undo_requested.emit()
+            return
+        if event.matches(QKeySequence.Redo):
+            self.redo_requested.emit()
             return
-        return QPlainTextEdit.keyPressEvent(self, event)
+        if not (event.text() or event.key() in (Qt.Key_Backspace, Qt.Key_Delete)
+                or event.matches(QKeySequence.Cut) or event.matches(QKeySequence.Paste)):
+            return QPlainTextEdit.keyPressEvent(self, event)  # navigation doesn't change text
+        with self._capturing():
+            if event.key() == Qt.Key_Tab:
+                self.textCursor().insertText("    ")
+                return
+            return QPlainTextEdit.keyPressEvent(self, event)
+
+    def inputMethodEvent(self, event: QInputMethodEvent) -> None:
+        """
+        Overridden inputMethodEvent which captures text replaced by input method.
+
+        Args:
+            event(QInputMethodEvent): qt event object with event data
+        """
+        with self._capturing():
+            QPlainTextEdit.inputMethodEvent(self, event)
+
+    def contextMenuEvent(self, event: QContextMenuEvent) -> None:
+        """
+        Overridden contextMenuEvent which captures selection changed by actions of menu.
+
+        Args:
+            event(QContextMenuEvent): qt event object with event data
+        """
+        with self._capturing():
+            QPlainTextEdit.contextMenuEvent(self, event)
+
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        """
+        Overridden mousePressEvent which remembers whether dragging of selection can start.
+
+        Args:
+            event(QMouseEvent): qt event object with event data
+        """
+        cursor = self.textCursor()
+        position = self.cursorForPosition(event.pos()).position()
+        self._drag_pressed = (event.button() == Qt.LeftButton and cursor.hasSelection()
+                              and cursor.selectionStart() <= position < cursor.selectionEnd())
+        QPlainTextEdit.mousePressEvent(self, event)
+
+    def mouseMoveEvent(self, event: QMouseEvent) -> None:
+        """
+        Overridden mouseMoveEvent which captures selection, which is removed when it is dragged away.
+
+        Args:
+            event(QMouseEvent): qt event object with event data
+        """
+        if not self._drag_pressed:
+            return QPlainTextEdit.mouseMoveEvent(self, event)
+        with self._capturing():
+            QPlainTextEdit.mouseMoveEvent(self, event)
+
+    def dropEvent(self, event: QDropEvent) -> None:
+        """
+        Overridden dropEvent which captures selection, which is removed when it is moved within editor.
+
+        Args:
+            event(QDropEvent): qt event object with event data
+        """
+        with self._capturing():
+            QPlainTextEdit.dropEvent(self, event)
 
     def wheelEvent(self, event: QWheelEvent) -> None:
         """
@@ -47,19 +150,78 @@ class CodeEdit(QPlainTextEdit):
         elif delta < 0:
             self.zoomOut(1)
 
+    def visible_lines(self, rect: QRect) -> typing.Iterator[typing.Tuple[int, int]]:
+        """
+        Generate lines which intersect given rectangle of viewport.
+
+        Args:
+            rect(QRect): rectangle in viewport coordinates
+
+        Returns:
+            typing.Iterator[typing.Tuple[int, int]]: one based line number and top of line in pixels
+        """
+        block = self.cursorForPosition(QPoint(0, max(0, rect.top()))).block()  # hit test is done by qt
+        block_top = self.blockBoundingGeometry(block).translated(self.contentOffset()).top()
+        while block.isValid() and block_top <= rect.bottom():
+            block_bottom = block_top + self.blockBoundingRect(block).height()
+            if block.isVisible() and block_bottom >= rect.top():
+                yield block.blockNumber() + 1, int(block_top)
+            block = block.next()
+            block_top = block_bottom
+
+    def current_line_number(self) -> int:
+        """
+        Returns:
+            int: one based number of line under cursor
+        """
+        return self.textCursor().blockNumber() + 1
+
+    def _capturing(self) -> typing.ContextManager:
+        """
+        Capture lines of selection and their neighbouring lines, deleted characters
+        and words can be in them. Nothing is captured without undo history.
+
+        Returns:
+            typing.ContextManager: context of edit
+        """
+        if self.undo_history is None:
+            return contextlib.nullcontext()
+        cursor = self.textCursor()
+        first = self.document().findBlock(cursor.selectionStart())
+        last = self.document().findBlock(cursor.selectionEnd())
+        if first.previous().isValid():
+            first = first.previous()
+        if last.next().isValid():
+            last = last.next()
+        return self.undo_history.capturing(first.position(), last.position() + last.length() - 1)
+
 
 class LinesNumberBar(QWidget):
     """
     This object is representing object wit lines number.
-    LinesNumber bar is connected with CodeEdit.
+    LinesNumber bar is connected with CodeEdit or LargeFileView.
     It cant work separately.
+    Rendered numbers are cached as QStaticText, only exposed rows are painted
+    and scrolled content is moved by blitting.
     """
-    def __init__(self, code_editor: CodeEdit, parent=None):
+    def __init__(self, code_editor: typing.Union[CodeEdit, LargeFileView], parent=None):
         QWidget.__init__(self, parent)
         self.editor = code_editor
-
-        self.editor.updateRequest.connect(self.update)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)  # whole bar is painted here, needed for scrolling by blit
+
+        self._background_color = QColor("#d3d7cf")  # TODO: configurable
+        self._border_color = QColor(Qt.black)
+        self._regular_font = None
+        self._bold_font = None
+        self._regular_numbers = dict()
+        self._bold_numbers = dict()
+        self._current_line = self.editor.current_line_number()
+        self._line_heat = dict()
+        self._update_fonts()
+
+        self.editor.updateRequest.connect(self.update_request)
         self.editor.blockCountChanged.connect(self.update_width)
+        self.editor.cursorPositionChanged.connect(self.cursor_position_changed)
 
         self.update_width(1)
 
@@ -72,6 +234,32 @@ class LinesNumberBar(QWidget):
         if self.isVisible():
             QWidget.update(self)
 
+    def set_line_heat(self, line_heat: typing.Dict[int, float]) -> None:
+        """
+        Color background of lines by their cost, e.g. sampled by profiler.
+
+        Args:
+            line_heat(typing.Dict[int, float]): heat between 0 and 1 by one based line number
+        """
+        self._line_heat = line_heat
+        self.update()
+
+    def update_request(self, rect: QRect, dy: int) -> None:
+        """
+        Scroll already painted numbers or repaint rows of updated part of editor.
+        This method is called when updateRequest signal of editor is emitted.
+
+        Args:
+            rect(QRect): updated rectangle of editor viewport
+            dy(int): scrolled distance in pixels
+        """
+        if not self.isVisible():
+            return
+        if dy:
+            self.scroll(0, dy)  # only uncovered rows get paint event
+        else:
+            QWidget.update(self, 0, rect.y(), self.width(), rect.height())
+
     def update_width(self, line_number: int) -> None:
         """
         Change lines bar width. Depends on line number width.
@@ -82,45 +270,84 @@ class LinesNumberBar(QWidget):
         new_width = self.fontMetrics().width(str(line_number)) + 30
         if self.width() != new_width:
             self.setFixedWidth(new_width)
+        self.update()  # numbers of following lines changed
 
-    def paintEvent(self, event: QPaintEvent) -> None:
+    def cursor_position_changed(self) -> None:
         """
-        Overridden paintEvent of QWidget which repainting numbers in bar.
-
-        Args:
-            event(QPaintEvent): qt event object with event data
+        Repaint numbers when current line changed, so new line is bold.
+        This method is called when cursorPositionChanged signal of editor is emitted.
         """
-        if self.isVisible():
-            block = self.editor.firstVisibleBlock()  # first visible block of editor
-            line_number = block.blockNumber()  + 1# line of first visible block
-            font_height = self.fontMetrics().height()  # height of used font for line numbers
-
-            painter = QPainter(self)  # painter which will draw bar and numbers
-            painter.fillRect(event.rect(), QColor("#d3d7cf"))  # fill the line number bar with some color TODO: configurable
-            painter.drawRect(0, 0, event.rect().width() - 1, event.rect().height() - 1)  # draw line number bar border
-            font = painter.font()  # actual font
+        current_line = self.editor.current_line_number()
+        if current_line != self._current_line:
+            self._current_line = current_line
+            self.update()
 
-            current_block = self.editor.textCursor().block().blockNumber() + 1  # line of actual block under cursor
-
-            condition = True
-            while block.isValid() and condition:
-                block_geometry = self.editor.blockBoundingGeometry(block)
-                offset = self.editor.contentOffset()
-                block_top = block_geometry.translated(offset).top()
-
-                number_rect = QRect(5, block_top, self.width() - 5, font_height)  # rectangle for the line number
-                font.setBold(line_number == current_block)  # set bold line number for actual line
+    def changeEvent(self, event: QEvent) -> None:
+        """
+        Overridden changeEvent which drops cached numbers after font change.
 
-                painter.setFont(font)
-                painter.drawText(number_rect, Qt.AlignLeft, str(line_number))
+        Args:
+            event(QEvent): qt event object with event data
+        """
+        if event.type() == QEvent.FontChange:
+            self._update_fonts()
+        QWidget.changeEvent(self, event)
 
-                line_number += 1
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """
+        Overridden paintEvent of QWidget which repainting numbers in exposed rows of bar.
 
-                condition = block_top <= event.rect().bottom()
+        Args:
+            event(QPaintEvent): qt event object with event data
+        """
+        rect = event.rect()
+        painter = QPainter(self)  # painter which will draw bar and numbers
+        painter.fillRect(rect, self._background_color)
+        painter.setPen(self._border_color)
+        painter.drawLine(0, rect.top(), 0, rect.bottom())  # border of bar, same in every row
+        painter.drawLine(self.width() - 1, rect.top(), self.width() - 1, rect.bottom())
+
+        current_line = self.editor.current_line_number()  # line under cursor
+        line_height = self.editor.fontMetrics().height()
+        for line_number, line_top in self.editor.visible_lines(rect):
+            heat = self._line_heat.get(line_number)
+            if heat:
+                painter.fillRect(1, line_top, self.width() - 2, line_height, QColor(239, 41, 41, int(40 + 200 * heat)))
+            painter.drawStaticText(5, line_top, self._number_text(line_number, line_number == current_line))
+
+        painter.end()
+
+    def _number_text(self, line_number: int, bold: bool) -> QStaticText:
+        """
+        Return cached prepared text of line number.
 
-                block = block.next()
+        Args:
+            line_number(int): one based line number
+            bold(bool): text for current line
 
-            painter.end()
+        Returns:
+            QStaticText: prepared text
+        """
+        cache = self._bold_numbers if bold else self._regular_numbers
+        static_text = cache.get(line_number)
+        if static_text is None:
+            if len(cache) >= MAX_CACHED_LINE_NUMBERS:
+                cache.clear()
+            static_text = QStaticText(str(line_number))
+            static_text.setTextFormat(Qt.PlainText)
+            static_text.prepare(QTransform(), self._bold_font if bold else self._regular_font)
+            cache[line_number] = static_text
+        return static_text
+
+    def _update_fonts(self) -> None:
+        """
+        Prepare regular and bold font and drop texts rendered by old fonts.
+        """
+        self._regular_font = QFont(self.font())
+        self._bold_font = QFont(self.font())
+        self._bold_font.setBold(True)
+        self._regular_numbers.clear()
+        self._bold_numbers.clear()
 
 
 class CodeEditorWidget(QWidget):
@@ -129,6 +356,11 @@ class CodeEditorWidget(QWidget):
     """
 
     change_cursor_position = pyqtSignal(int, int)
+    loading_progress = pyqtSignal(int)
+    loading_finished = pyqtSignal()
+    loading_failed = pyqtSignal(str)
+
+    read_only = False
 
     def __init__(self, parent=None):
         QWidget.__init__(self, parent)
@@ -137,6 +369,12 @@ class CodeEditorWidget(QWidget):
         self._code_editor.cursorPositionChanged.connect(self.cursor_position_changed)
         self._line_number_bar = LinesNumberBar(self._code_editor, self)
 
+        self.undo_history = UndoHistory(self._code_editor.document(), parent=self)
+        self._code_editor.undo_history = self.undo_history
+        self.undo_history.text_changed.connect(self._journal_change)
+        self._code_editor.undo_requested.connect(self.undo)
+        self._code_editor.redo_requested.connect(self.redo)
+
         horizontal_layout = QHBoxLayout()
         horizontal_layout.setSpacing(0)
         horizontal_layout.addWidget(self._line_number_bar)
@@ -146,6 +384,29 @@ class CodeEditorWidget(QWidget):
 
         self.file_saved = True
         self.opened_file = None
+        self.highlighter = None
+        # format of opened file, text is saved in the same encoding and with the same line endings
+        self.encoding = DEFAULT_ENCODING
+        self.newline = None
+        # state of file when it was loaded or saved, other state means external modification
+        self.disk_state = None
+        # state of externally modified file for which user was asked whether to reload it
+        self.asked_disk_state = None
+
+        # journal of unsaved changes, it is started by the first change after load or save
+        self.journal_writer = None
+        self.journal = None
+        self._journal_base = None  # state of saved file equal to text of saved state of history
+
+        self.loading = False
+        self.load_progress = 0
+        self._pending_view_state = None
+        self._pending_line = None
+        self._file_loader = None
+        self._pending_chunks = deque()
+        self._insert_chunk_timer = QTimer(self)
+        self._insert_chunk_timer.setInterval(0)
+        self._insert_chunk_timer.timeout.connect(self._insert_next_chunk)
 
     def cursor_position_changed(self):
         """
@@ -156,234 +417,1520 @@ class CodeEditorWidget(QWidget):
             self.get_cursor().positionInBlock() + 1
         )
 
-    def load_file(self, file: typing.TextIO) -> None:
+    def set_highlighter(self, highlighter_class: typing.Optional[typing.Type[IncrementalHighlighter]]) -> None:
         """
-        Load text from file to code editor.
+        Replace syntax highlighter of document.
 
         Args:
-            file(typing.TextIO): opened file in code editor
+            highlighter_class(typing.Optional[typing.Type[IncrementalHighlighter]]): highlighter class
+                or None to remove highlighting
         """
-        self._code_editor.clear()
-        for line in file:
-            self._code_editor.insertPlainText(line)
-
-    def get_plain_text(self) -> str:
+        if self.highlighter is not None and type(self.highlighter) is highlighter_class:
+            return
+        if self.highlighter is not None:
+            self.highlighter.detach()
+            self.highlighter.deleteLater()
+            self.highlighter = None
+        if highlighter_class is not None:
+            self.highlighter = highlighter_class(self._code_editor.document(), self)
+
+    def load_file(self, file_path: str, file_format: typing.Optional[FileFormat] = None) -> None:
         """
-        Return text from code editor.
+        Start loading text from file to code editor.
+        File is read and decoded in FileLoader thread and its text
+        is inserted to the document chunk by chunk, one chunk per event loop
+        iteration. Editor is read only until the loading is finished.
+        Encoding is detected from beginning of file, when the rest of file
+        can't be decoded by it, file is loaded again by fallback encoding.
 
-        Returns:
-            str: text from code_editor
+        Args:
+            file_path(str): file path
+            file_format(typing.Optional[FileFormat]): format of file, it is detected if None
         """
-        return self._code_editor.toPlainText()
-
-    def get_cursor(self) -> QTextCursor:
+        if file_format is None:
+            file_format = sniff_format(file_path)
+        encoding = file_format.encoding or FALLBACK_ENCODING
+        file = open(file_path, 'r', encoding=encoding)  # open here, so errors are raised in the caller
+        self.encoding = encoding
+        self.newline = file_format.newline
+
+        self.cancel_loading()
+        self.discard_journal()
+        self.disk_state = self._journal_base = file_state(file.fileno())
+        self.undo_history.suspend()
+        self._code_editor.clear()
+        self._code_editor.setReadOnly(True)
+
+        self.loading = True
+        self.load_progress = 0
+
+        file_loader = FileLoader(file, parent=self)
+        file_loader.chunk_loaded.connect(self._chunk_loaded)
+        file_loader.progress_changed.connect(self._progress_changed)
+        file_loader.loading_failed.connect(self._loading_failed)
+        file_loader.decoding_failed.connect(
+            lambda: self._file_loader is file_loader and
+            self.load_file(file_path, file_format._replace(encoding=FALLBACK_ENCODING)))
+        file_loader.finished.connect(self._insert_chunk_timer.start)
+        self._file_loader = file_loader
+        file_loader.start()
+
+    def cancel_loading(self) -> None:
         """
-        Returns active cursor of text widget
-
-        Returns:
-            QTextCursor: active cursor
+        Stop loading of file. Already inserted text stays in editor.
+        Signals of stopped loader which are still queued are ignored by the slots.
         """
-        return self._code_editor.textCursor()
+        if self._file_loader is None:
+            return
 
+        self._file_loader.requestInterruption()
+        self._file_loader.wait()
+        self._file_loader.deleteLater()
+        self._file_loader = None
+        self._pending_chunks.clear()
+        self._insert_chunk_timer.stop()
+        self.loading = False
 
-class TabBar(QTabBar):
-    """
-    Simple inherited class from QTabBar
-    for Overriding mouseReleaseEvent.
-    """
-    def mouseReleaseEvent(self, event: QMouseEvent) -> None:
+    def _chunk_loaded(self, chunk: str) -> None:
         """
-        Overridden method for closing tab with middle mouse button.
+        Queue new chunk of text for inserting.
+        This method is called when chunk_loaded signal of file loader is emitted.
 
         Args:
-            event(QMouseEvent): qt event object with event data:
+            chunk(str): chunk of text
         """
-        if event.button() == Qt.MidButton:
-            self.tabCloseRequested.emit(self.tabAt(event.pos()))
+        if self.sender() is not self._file_loader:
+            return  # chunk of cancelled loader
+        self._pending_chunks.append(chunk)
+        self._insert_chunk_timer.start()
 
+    def _insert_next_chunk(self) -> None:
+        """
+        Insert one queued chunk at the end of document.
+        When there is nothing to insert and loader is done, finish loading.
+        """
+        if self._pending_chunks:
+            cursor = QTextCursor(self._code_editor.document())
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText(self._pending_chunks.popleft())
+            return
 
-class CodeEditorTabWidget(QWidget):
-    """
-    Widget which representing code editor with tabs.
-    """
+        self._insert_chunk_timer.stop()
+        if self._file_loader is not None and self._file_loader.isFinished():
+            self._finish_loading()
 
-    open_new_file = pyqtSignal(str)
-    change_active_file = pyqtSignal(str)
-    close_file = pyqtSignal(str)
+    def _finish_loading(self) -> None:
+        """
+        Make editor editable again after loading.
+        """
+        self._file_loader.deleteLater()
+        self._file_loader = None
+        self.loading = False
+        self.load_progress = 100
 
-    def __init__(self, parent=None):
-        QWidget.__init__(self, parent)
+        self.undo_history.reset()
+        self._code_editor.document().setModified(False)
+        self._code_editor.setReadOnly(False)
 
-        vertical_layout = QVBoxLayout()
-        self.tab_widget = QTabWidget()
-        self.tab_widget.setTabBar(TabBar())
-        self.tab_widget.setTabsClosable(True)
-        self.tab_widget.setUsesScrollButtons(True)
-        self.tab_widget.setMovable(True)
-        self.tab_widget.tabCloseRequested.connect(self.close_tab)
-        self.tab_widget.currentChanged.connect(self.tab_changed)
+        if self._pending_view_state is not None:
+            self.set_view_state(self._pending_view_state)
+        if self._pending_line is not None:
+            self.go_to_line(self._pending_line)
 
-        self.editor_status_bar = QStatusBar(self)
-        self.editor_status_bar.setStyleSheet("QStatusBar{border-bottom: 1px outset grey; border-left: 1px outset grey; border-right: 1px outset grey;}")
-        self.editor_status_bar.hide()
+        self.loading_finished.emit()
 
-        vertical_layout.setSpacing(0)
-        vertical_layout.setContentsMargins(5, 22, 0, 0)
-        vertical_layout.addWidget(self.tab_widget)
-        vertical_layout.addWidget(self.editor_status_bar)
+    def _progress_changed(self, progress: int) -> None:
+        """
+        Store and forward loading progress.
+        This method is called when progress_changed signal of file loader is emitted.
 
-        self.setLayout(vertical_layout)
+        Args:
+            progress(int): progress in percent
+        """
+        if self.sender() is not self._file_loader:
+            return
+        self.load_progress = progress
+        self.loading_progress.emit(progress)
 
-        self.opened_tabs = 0
-        self.opened_files = set()
+    def _loading_failed(self, message: str) -> None:
+        """
+        Stop loading and forward error message.
+        This method is called when loading_failed signal of file loader is emitted.
 
-        self.set_new_cursor_position_function = None
+        Args:
+            message(str): error message
+        """
+        if self.sender() is not self._file_loader:
+            return
+        self.cancel_loading()
+        self.loading_failed.emit(message)
 
-    def open_file(self, file_path: str) -> None:
+    def view_state(self) -> typing.Tuple[int, int]:
+        """
+        Return position of cursor and scroll bar, so view can be restored later.
+
+        Returns:
+            typing.Tuple[int, int]: cursor position and vertical scroll bar value
+        """
+        return self.get_cursor().position(), self._code_editor.verticalScrollBar().value()
+
+    def set_view_state(self, view_state: typing.Tuple[int, int]) -> None:
         """
-        Open file in new tab.
+        Restore position of cursor and scroll bar. If file is being loaded,
+        the state is restored when loading is finished.
 
         Args:
-            file_path(str): file path
+            view_state(typing.Tuple[int, int]): cursor position and vertical scroll bar value
         """
-        if file_path in self.opened_files:
-            self.change_current_tab(file_path)
+        if self.loading:
+            self._pending_view_state = view_state
             return
 
-        with open(file_path, 'r') as f:
-            code_editor = CodeEditorWidget(self)
-            code_editor.load_file(f)
-            code_editor.file_saved = True
-            code_editor.opened_file = f.name
-            code_editor.change_cursor_position.connect(self.set_new_cursor_position_function)
-            self.add_tab(code_editor, os.path.basename(f.name))
+        self._pending_view_state = None
+        cursor_position, scroll_value = view_state
+        cursor = self.get_cursor()
+        cursor.setPosition(min(cursor_position, self._code_editor.document().characterCount() - 1))
+        self._code_editor.setTextCursor(cursor)
+        self._code_editor.verticalScrollBar().setValue(scroll_value)
 
-        self.opened_files.add(file_path)
-        self.open_new_file.emit(file_path)
-
-    def new_file(self) -> None:
+    def is_modified(self) -> bool:
         """
-        Create new tab / file
+        Returns:
+            bool: True if text was changed since loading or saving
         """
-        code_editor = CodeEditorWidget(self)
-        code_editor.change_cursor_position.connect(self.set_new_cursor_position_function)
-        code_editor.file_saved = False
-        self.add_tab(code_editor, "NoName")
+        return self._code_editor.document().isModified()
 
-    def save_file(self, file_path: str = None) -> None:
+    def set_modified(self, modified: bool) -> None:
         """
-        Save current file(as).
+        Set modification flag of document.
 
         Args:
-            file_path(str): if file path is not None. Save as method called
+            modified(bool): new value of flag
         """
-        file = file_path or self.get_current_file()
-        current_widget = self.get_current_widget()
-
-        with open(file, 'w') as f:
-            f.write(current_widget.get_plain_text())
+        self._code_editor.document().setModified(modified)
+        if not modified:
+            self.undo_history.mark_clean()
+            self.discard_journal()
+            self._journal_base = None  # it is known when file is written, see mark_saved
 
-        current_widget.opened_file = file
-        current_widget.file_saved = True
-
-        self.tab_changed()
-        self.set_tab_text(os.path.basename(file))
+    def set_recovered_text(self, text: str) -> None:
+        """
+        Replace text by text recovered from journal. Loading is stopped, document is modified
+        and new journal is started with snapshot of the text.
 
-    def add_tab(self, code_editor: CodeEditorWidget, file_name: str) -> None:
+        Args:
+            text(str): recovered text
         """
-        Add new tab to the widget.
+        self.cancel_loading()
+        self.discard_journal()
+        self.undo_history.suspend()
+        self._code_editor.setPlainText(text)
+        self.load_progress = 100
+        self.undo_history.reset(saved=False)
+        self._code_editor.document().setModified(True)
+        self._code_editor.setReadOnly(False)
+        if self._pending_view_state is not None:
+            self.set_view_state(self._pending_view_state)
+
+        self._journal_base = None
+        if self.journal_writer is not None:
+            self.journal = self.journal_writer.create(self.opened_file, self._code_editor.document(), None)
+        self.loading_finished.emit()
+
+    def reload_text(self, new_lines: typing.List[str], changes: typing.List[typing.Tuple[int, int, int, int]],
+                    file_format: FileFormat, state: typing.Optional[FileState]) -> None:
+        """
+        Replace text by text of externally modified file. Only changed lines are replaced and
+        all replacements are one step of undo history, so cursor, scroll position and history
+        are kept and the reload can be undone. Document isn't modified after reload.
 
         Args:
-            code_editor(CodeEditorWidget): code editor widget in new tab
-            file_name(str): name of new tab - file name
+            new_lines(typing.List[str]): lines of new text of file
+            changes(typing.List[typing.Tuple[int, int, int, int]]): changed ranges of lines
+                computed by line_changes from lines returned by get_lines
+            file_format(FileFormat): format of file
+            state(typing.Optional[FileState]): state of file when it was read
         """
-        new_index = self.tab_widget.count()
-        self.tab_widget.addTab(code_editor, file_name)
-        self.tab_widget.setCurrentIndex(new_index)
-        self.opened_tabs += 1
+        document = self._code_editor.document()
+        old_line_count = document.blockCount()
+        scroll_value = self._code_editor.verticalScrollBar().value()
+
+        cursor = QTextCursor(document)
+        with self.undo_history.grouped():
+            for i1, i2, j1, j2 in reversed(changes):
+                # replaced lines include their line endings, the last line of document doesn't have it
+                start = document.findBlockByNumber(i1).position() if i1 < old_line_count else None
+                replacement = "".join(line + "\n" for line in new_lines[j1:j2])
+                if i2 < old_line_count:
+                    end = document.findBlockByNumber(i2).position()
+                else:
+                    end = document.characterCount() - 1
+                    if j1 == j2:
+                        start -= 1  # line ending of the new last line is removed
+                    elif start is None:
+                        start, replacement = end, "\n" + replacement[:-1]  # lines are added after the last line
+                    else:
+                        replacement = replacement[:-1]
+                cursor.setPosition(start)
+                cursor.setPosition(end, QTextCursor.KeepAnchor)
+                with self.undo_history.capturing(start, end):
+                    cursor.insertText(replacement)
+
+        self._code_editor.verticalScrollBar().setValue(scroll_value)
+        self.encoding = file_format.encoding or FALLBACK_ENCODING
+        self.newline = file_format.newline
+        self.set_modified(False)
+        self.disk_state = self._journal_base = state
+
+    def mark_saving(self) -> None:
+        """
+        Remember text passed to SavePipeline, it becomes saved state when it is written.
+        Document stays modified and its journal is kept until then.
+        """
+        self.undo_history.mark_saving()
 
-    def tab_changed(self) -> None:
+    def mark_saved(self, state: typing.Optional[FileState]) -> None:
         """
-        Change hide/show information in editor status bar.
-        Update line and column in main status bar.
-        Set new active file in list widget.
-        This method is called when currentChanged signal is emitted.
+        Make written text saved state. Journal is removed when document wasn't changed since
+        the text was passed to save, otherwise it is started again from snapshot of text,
+        because its base file was replaced. Next journal starts from state of written file.
+
+        Args:
+            state(typing.Optional[FileState]): state of written file
         """
-        current_widget = self.get_current_widget()
-        if not current_widget:
-            self.editor_status_bar.hide()
-            return
+        self.undo_history.mark_saved()
+        self.disk_state = state
+        if self.is_modified():
+            if self.journal is not None:
+                self.journal.start(None)
         else:
-            self.editor_status_bar.showMessage(self.get_current_file() or "File not saved")
-            self.editor_status_bar.show()
+            self.discard_journal()
+            self._journal_base = state
 
-        current_widget.cursor_position_changed()
+    def cancel_saving(self) -> None:
+        """
+        Forget text passed to SavePipeline when its write failed, document stays modified.
+        """
+        self.undo_history.cancel_saving()
 
-        self.change_active_file.emit(current_widget.opened_file)
+    def discard_journal(self) -> None:
+        """
+        Remove journal of unsaved changes, e.g. when they were saved or tab was closed.
+        """
+        if self.journal is not None:
+            self.journal.discard()
+            self.journal = None
 
-    def set_tab_text(self, text: str, index: int = None) -> None:
+    def undo(self) -> None:
         """
-        Set new text of current tab
+        Revert the last step of undo history and move cursor to it.
+        """
+        if not self.loading:
+            self._move_cursor(self.undo_history.undo())
 
-        Args:
-            text(str): new text
-            index(int): index of tab. If None -> use current
+    def redo(self) -> None:
         """
-        current_index = index or self.tab_widget.currentIndex()
-        self.tab_widget.setTabText(current_index, text)
+        Apply again the last undone step of undo history and move cursor to it.
+        """
+        if not self.loading:
+            self._move_cursor(self.undo_history.redo())
 
-    def close_tab(self, index: int) -> None:
+    def memory_usage(self) -> int:
         """
-        Close tab at index.
+        Returns:
+            int: estimated memory used by text of document and its undo history (bytes)
+        """
+        return self._code_editor.document().characterCount() * 2 + self.undo_history.memory
 
-        Args:
-            index(int): index of tab
+    def get_plain_text(self) -> str:
         """
-        file_path = self.tab_widget.widget(index).opened_file
-        self.tab_widget.removeTab(index)
-        self.opened_tabs -= 1
-        self.close_file.emit(file_path)
-        try:
-            self.opened_files.remove(file_path)
-        except KeyError:
-            pass
+        Return text from code editor.
 
-    def is_file_saved(self) -> bool:
+        Returns:
+            str: text from code_editor
         """
-        Return if file in current widget is saved.
+        return self._code_editor.toPlainText()
 
+    def get_lines(self) -> typing.List[str]:
+        """
         Returns:
-            bool: True if file is save else False
+            typing.List[str]: lines of text, special spaces are kept unlike in get_plain_text
         """
-        current_tab = self.get_current_widget()
-        return current_tab.file_saved
+        return self._code_editor.document().toRawText().split("\u2029")
 
-    def get_current_widget(self) -> CodeEditorWidget:
+    def get_cursor(self) -> QTextCursor:
         """
-        Return widget in current active tab
+        Returns active cursor of text widget
 
         Returns:
-            CodeEditorWidget: Code editor in current tab
+            QTextCursor: active cursor
         """
-        return self.tab_widget.currentWidget()
+        return self._code_editor.textCursor()
 
-    def get_current_file(self) -> str:
+    def set_line_heat(self, line_heat: typing.Dict[int, float]) -> None:
         """
-        Return file path of file in current active tab
+        Color numbers of lines by their cost.
+
+        Args:
+            line_heat(typing.Dict[int, float]): heat between 0 and 1 by one based line number
+        """
+        self._line_number_bar.set_line_heat(line_heat)
+
+    def get_document(self) -> QTextDocument:
+        """
+        Returns document of text widget
 
         Returns:
-            str: file path of file in active tab
+            QTextDocument: edited document
         """
-        return self.get_current_widget().opened_file
+        return self._code_editor.document()
 
-    def change_current_tab(self, file_path: str) -> None:
+    def go_to_line(self, line_number: int) -> None:
         """
-        Change current active tab to tab with file_path file
+        Move cursor to the beginning of line and scroll to it. If file is being loaded,
+        the jump is done when loading is finished.
 
         Args:
-            file_path(str): file path
+            line_number(int): one based line number
         """
-        for idx in range(self.tab_widget.count()):
-            if self.tab_widget.widget(idx).opened_file == file_path:
-                self.tab_widget.setCurrentIndex(idx)
-                break
+        if self.loading:
+            self._pending_line = line_number
+            return
+
+        self._pending_line = None
+        document = self._code_editor.document()
+        block = document.findBlockByNumber(min(max(0, line_number - 1), document.blockCount() - 1))
+        cursor = QTextCursor(block)
+        self._code_editor.setTextCursor(cursor)
+        self._code_editor.centerCursor()
+        self._code_editor.setFocus()
+
+    def _journal_change(self, position: int, removed: int, added: str) -> None:
+        """
+        Record change in journal, journal is started by the first change.
+        This method is called when text_changed signal of undo history is emitted.
+
+        Args:
+            position(int): position of change
+            removed(int): count of removed characters
+            added(str): added text
+        """
+        if self.journal is None:
+            if self.journal_writer is None:
+                return
+            self.journal = self.journal_writer.create(self.opened_file, self._code_editor.document(),
+                                                      self._journal_base)
+            if self.journal is None or self._journal_base is None:
+                return  # snapshot of text contains the change already
+        self.journal.record(position, removed, added)
+
+    def _move_cursor(self, position: typing.Optional[int]) -> None:
+        """
+        Move cursor to position and make it visible.
+
+        Args:
+            position(typing.Optional[int]): new position of cursor, cursor isn't moved if None
+        """
+        if position is None:
+            return
+        cursor = self.get_cursor()
+        cursor.setPosition(min(position, self._code_editor.document().characterCount() - 1))
+        self._code_editor.setTextCursor(cursor)
+        self._code_editor.ensureCursorVisible()
+
+
+class LargeFileWidget(QWidget):
+    """
+    Widget which representing read only view of large file with lines number bar.
+    It has the same interface as CodeEditorWidget.
+    """
+
+    change_cursor_position = pyqtSignal(int, int)
+    loading_progress = pyqtSignal(int)
+    loading_finished = pyqtSignal()
+    loading_failed = pyqtSignal(str)
+
+    read_only = True
+
+    def __init__(self, parent=None):
+        QWidget.__init__(self, parent)
+
+        self._large_file_view = LargeFileView(self)
+        self._large_file_view.cursorPositionChanged.connect(self.cursor_position_changed)
+        self._large_file_view.indexing_progress.connect(self._progress_changed)
+        self._large_file_view.indexing_finished.connect(self._finish_loading)
+        self._line_number_bar = LinesNumberBar(self._large_file_view, self)
+        self._line_number_bar.setFont(self._large_file_view.font())
+
+        horizontal_layout = QHBoxLayout()
+        horizontal_layout.setSpacing(0)
+        horizontal_layout.addWidget(self._line_number_bar)
+        horizontal_layout.addWidget(self._large_file_view)
+
+        self.setLayout(horizontal_layout)
+
+        self.file_saved = True
+        self.opened_file = None
+        self.disk_state = None
+
+        self.loading = False
+        self.load_progress = 0
+
+    def cursor_position_changed(self):
+        """
+        This method is called when cursorPositionChanged signal is emitted.
+        """
+        self.change_cursor_position.emit(self._large_file_view.current_line_number(), 1)
+
+    def load_file(self, file_path: str) -> None:
+        """
+        Memory map file. Lines are indexed in background,
+        view can be used during indexing.
+
+        Args:
+            file_path(str): file path
+        """
+        self.loading = True
+        self.load_progress = 0
+        self._large_file_view.open(file_path)
+        self.disk_state = file_state(file_path)
+
+    def cancel_loading(self) -> None:
+        """
+        Stop indexing and release the file.
+        """
+        self._large_file_view.close_file()
+        self.loading = False
+
+    def view_state(self) -> typing.Tuple[int, int]:
+        """
+        Return current line, so view can be restored later.
+
+        Returns:
+            typing.Tuple[int, int]: current line number and first visible line
+        """
+        return self._large_file_view.current_line_number(), self._large_file_view.first_visible_line()
+
+    def set_view_state(self, view_state: typing.Tuple[int, int]) -> None:
+        """
+        Restore current line.
+
+        Args:
+            view_state(typing.Tuple[int, int]): current line number and first visible line
+        """
+        self._large_file_view.go_to_line(view_state[0])
+
+    def is_modified(self) -> bool:
+        """
+        Returns:
+            bool: always False, file is read only
+        """
+        return False
+
+    def memory_usage(self) -> int:
+        """
+        Returns:
+            int: memory used by line index (bytes), mapped file isn't counted
+        """
+        return self._large_file_view.memory_usage()
+
+    def go_to_line(self, line_number: int) -> None:
+        """
+        Scroll to line. Works also for lines which aren't indexed yet.
+
+        Args:
+            line_number(int): one based line number
+        """
+        self._large_file_view.go_to_line(line_number)
+        self._large_file_view.setFocus()
+
+    def _progress_changed(self, progress: int) -> None:
+        """
+        Store and forward indexing progress.
+
+        Args:
+            progress(int): progress in percent
+        """
+        self.load_progress = progress
+        self.loading_progress.emit(progress)
+
+    def _finish_loading(self) -> None:
+        """
+        Forward end of indexing.
+        """
+        self.loading = False
+        self.load_progress = 100
+        self.loading_finished.emit()
+
+
+class HexFileWidget(QWidget):
+    """
+    Widget which representing read only hex view of binary file.
+    It has the same interface as CodeEditorWidget, rows of view are its lines.
+    """
+
+    change_cursor_position = pyqtSignal(int, int)
+    loading_progress = pyqtSignal(int)
+    loading_finished = pyqtSignal()
+    loading_failed = pyqtSignal(str)
+
+    read_only = True
+
+    def __init__(self, parent=None):
+        QWidget.__init__(self, parent)
+
+        self._hex_view = HexView(self)
+        self._hex_view.cursorPositionChanged.connect(self.cursor_position_changed)
+
+        horizontal_layout = QHBoxLayout()
+        horizontal_layout.setSpacing(0)
+        horizontal_layout.addWidget(self._hex_view)
+
+        self.setLayout(horizontal_layout)
+
+        self.file_saved = True
+        self.opened_file = None
+        self.disk_state = None
+
+        self.loading = False
+        self.load_progress = 100
+
+    def cursor_position_changed(self):
+        """
+        This method is called when cursorPositionChanged signal is emitted.
+        """
+        self.change_cursor_position.emit(self._hex_view.current_row_number(), 1)
+
+    def load_file(self, file_path: str) -> None:
+        """
+        Memory map file. Nothing is read until rows are shown.
+
+        Args:
+            file_path(str): file path
+        """
+        self._hex_view.open(file_path)
+        self.disk_state = file_state(file_path)
+
+    def cancel_loading(self) -> None:
+        """
+        Release the file.
+        """
+        self._hex_view.close_file()
+
+    def view_state(self) -> typing.Tuple[int, int]:
+        """
+        Return current row, so view can be restored later.
+
+        Returns:
+            typing.Tuple[int, int]: current row number and first visible row
+        """
+        return self._hex_view.current_row_number(), self._hex_view.first_visible_row()
+
+    def set_view_state(self, view_state: typing.Tuple[int, int]) -> None:
+        """
+        Restore current row.
+
+        Args:
+            view_state(typing.Tuple[int, int]): current row number and first visible row
+        """
+        self._hex_view.go_to_row(view_state[0])
+
+    def is_modified(self) -> bool:
+        """
+        Returns:
+            bool: always False, file is read only
+        """
+        return False
+
+    def memory_usage(self) -> int:
+        """
+        Returns:
+            int: memory used by cached pages (bytes), mapped file isn't counted
+        """
+        return self._hex_view.memory_usage()
+
+    def go_to_line(self, line_number: int) -> None:
+        """
+        Scroll to row.
+
+        Args:
+            line_number(int): one based row number
+        """
+        self._hex_view.go_to_row(line_number)
+        self._hex_view.setFocus()
+
+
+class TabBar(QTabBar):
+    """
+    Simple inherited class from QTabBar
+    for Overriding mouseReleaseEvent.
+    Close button is shown only on current and hovered tab. Qt lays out
+    all tabs again for every close button, so buttons on every tab
+    would make opening of many tabs quadratic.
+    """
+    def __init__(self, parent=None):
+        QTabBar.__init__(self, parent)
+        self.setMouseTracking(True)
+        self.currentChanged.connect(self.update_close_buttons)
+        self._hovered_index = -1
+
+    def update_close_buttons(self) -> None:
+        """
+        Move close buttons to current and hovered tab.
+        This method is called when currentChanged signal is emitted or hovered tab changed.
+        """
+        button_side = self._button_side()
+        wanted = {self.currentIndex(), self._hovered_index} - {-1}
+        for index in range(self.count()):
+            button = self.tabButton(index, button_side)
+            if button is not None and index not in wanted:
+                self.setTabButton(index, button_side, None)
+                button.deleteLater()
+            elif button is None and index in wanted:
+                self.setTabButton(index, button_side, self._create_close_button())
+
+    def mouseMoveEvent(self, event: QMouseEvent) -> None:
+        """
+        Overridden method for showing close button of hovered tab.
+
+        Args:
+            event(QMouseEvent): qt event object with event data:
+        """
+        QTabBar.mouseMoveEvent(self, event)
+        self._set_hovered_index(self.tabAt(event.pos()))
+
+    def leaveEvent(self, event: QEvent) -> None:
+        """
+        Overridden method for hiding close button of previously hovered tab.
+
+        Args:
+            event(QEvent): qt event object with event data:
+        """
+        QTabBar.leaveEvent(self, event)
+        self._set_hovered_index(-1)
+
+    def mouseReleaseEvent(self, event: QMouseEvent) -> None:
+        """
+        Overridden method for closing tab with middle mouse button.
+
+        Args:
+            event(QMouseEvent): qt event object with event data:
+        """
+        if event.button() == Qt.MidButton:
+            self.tabCloseRequested.emit(self.tabAt(event.pos()))
+        else:
+            QTabBar.mouseReleaseEvent(self, event)
+
+    def tabInserted(self, index: int) -> None:
+        """
+        Overridden method which keeps close buttons on current and hovered tab.
+
+        Args:
+            index(int): index of inserted tab
+        """
+        QTabBar.tabInserted(self, index)
+        self._hovered_index = -1
+        self.update_close_buttons()
+
+    def tabRemoved(self, index: int) -> None:
+        """
+        Overridden method which keeps close buttons on current and hovered tab.
+
+        Args:
+            index(int): index of removed tab
+        """
+        QTabBar.tabRemoved(self, index)
+        self._hovered_index = -1
+        self.update_close_buttons()
+
+    def close_button_clicked(self) -> None:
+        """
+        Request closing of tab with clicked button.
+        This method is called when clicked signal of close button is emitted.
+        """
+        button_side = self._button_side()
+        for index in range(self.count()):
+            if self.tabButton(index, button_side) is self.sender():
+                self.tabCloseRequested.emit(index)
+                return
+
+    def _set_hovered_index(self, index: int) -> None:
+        """
+        Args:
+            index(int): index of hovered tab, -1 if no tab is hovered
+        """
+        if index != self._hovered_index:
+            self._hovered_index = index
+            self.update_close_buttons()
+
+    def _button_side(self) -> QTabBar.ButtonPosition:
+        """
+        Returns:
+            QTabBar.ButtonPosition: side of tab with close button given by style
+        """
+        return QTabBar.ButtonPosition(self.style().styleHint(QStyle.SH_TabBar_CloseButtonPosition, None, self))
+
+    def _create_close_button(self) -> QToolButton:
+        """
+        Returns:
+            QToolButton: close button of tab
+        """
+        button = QToolButton(self)
+        button.setIcon(self.style().standardIcon(QStyle.SP_TitleBarCloseButton))
+        button.setAutoRaise(True)
+        button.setFocusPolicy(Qt.NoFocus)
+        button.setToolTip("Close Tab")
+        button.setFixedSize(self.style().pixelMetric(QStyle.PM_TabCloseIndicatorWidth, None, self),
+                            self.style().pixelMetric(QStyle.PM_TabCloseIndicatorHeight, None, self))
+        button.clicked.connect(self.close_button_clicked)
+        return button
+
+
+class EditorTab(QWidget):
+    """
+    Content of one tab. Editor widget is created when tab is activated
+    for the first time and it can be released again, when document isn't modified.
+    Then it is created again on next activation.
+    """
+
+    def __init__(self, file_path: typing.Optional[str] = None, parent=None):
+        QWidget.__init__(self, parent)
+        self.file_path = file_path
+        self.editor = None
+        self.view_state = None
+
+        self.vertical_layout = QVBoxLayout(self)
+        self.vertical_layout.setContentsMargins(0, 0, 0, 0)
+
+    def set_editor(self, editor: typing.Union[CodeEditorWidget, LargeFileWidget, HexFileWidget]) -> None:
+        """
+        Show editor in tab and restore its previous view state.
+
+        Args:
+            editor(typing.Union[CodeEditorWidget, LargeFileWidget, HexFileWidget]): editor widget
+        """
+        self.editor = editor
+        self.vertical_layout.addWidget(editor)
+        if self.view_state is not None:
+            editor.set_view_state(self.view_state)
+
+    def is_loaded(self) -> bool:
+        """
+        Returns:
+            bool: True if editor widget exists
+        """
+        return self.editor is not None
+
+    def is_modified(self) -> bool:
+        """
+        Returns:
+            bool: True if document in editor is modified
+        """
+        return self.editor is not None and (self.editor.loading or self.editor.is_modified())
+
+    def memory_usage(self) -> int:
+        """
+        Returns:
+            int: estimated memory used by editor (bytes)
+        """
+        return self.editor.memory_usage() if self.editor is not None else 0
+
+    def release(self) -> None:
+        """
+        Remember view state and destroy editor widget.
+        """
+        if self.editor is None:
+            return
+
+        self.view_state = self.editor.view_state()
+        self.editor.cancel_loading()
+        if isinstance(self.editor, CodeEditorWidget):
+            self.editor.discard_journal()
+        self.vertical_layout.removeWidget(self.editor)
+        self.editor.deleteLater()
+        self.editor = None
+
+
+class CodeEditorTabWidget(QWidget):
+    """
+    Widget which representing code editor with tabs.
+    Opened files are tracked in DocumentRegistry.
+    """
+
+    def __init__(self, document_registry: DocumentRegistry = None, parent=None):
+        QWidget.__init__(self, parent)
+
+        self.document_registry = document_registry if document_registry is not None else DocumentRegistry(parent=self)
+
+        self.save_pipeline = SavePipeline(parent=self)
+        self.save_pipeline.file_saved.connect(self.file_saved)
+        self.save_pipeline.save_failed.connect(self.save_failed)
+
+        # journals of unsaved changes are written only after start_journal
+        self.journal_writer = JournalWriter(parent=self)
+
+        self.file_watcher = DebouncedFileWatcher(parent=self)
+        self.file_watcher.files_changed.connect(self.files_changed)
+        self._changed_while_loading = set()  # files reloaded when their loading is finished
+        self.document_registry.document_opened.connect(self.file_watcher.watch)
+        self.document_registry.document_closed.connect(self.file_watcher.unwatch)
+
+        vertical_layout = QVBoxLayout()
+        self.tab_widget = QTabWidget()
+        self.tab_widget.setTabBar(TabBar())
+        self.tab_widget.setUsesScrollButtons(True)
+        self.tab_widget.setMovable(True)
+        self.tab_widget.tabBar().tabCloseRequested.connect(self.close_tab)  # tab widget forwards it only when closable
+        self.tab_widget.currentChanged.connect(self.tab_changed)
+
+        self.editor_status_bar = QStatusBar(self)
+        self.editor_status_bar.setStyleSheet("QStatusBar{border-bottom: 1px outset grey; border-left: 1px outset grey; border-right: 1px outset grey;}")
+        self.editor_status_bar.hide()
+
+        self.loading_progress_bar = QProgressBar(self.editor_status_bar)
+        self.loading_progress_bar.setMaximumWidth(150)
+        self.cancel_loading_button = QPushButton("Cancel", self.editor_status_bar)
+        self.cancel_loading_button.setFlat(True)
+        self.cancel_loading_button.clicked.connect(self.cancel_loading)
+        self.editor_status_bar.addPermanentWidget(self.loading_progress_bar)
+        self.editor_status_bar.addPermanentWidget(self.cancel_loading_button)
+
+        vertical_layout.setSpacing(0)
+        vertical_layout.setContentsMargins(5, 22, 0, 0)
+        vertical_layout.addWidget(self.tab_widget)
+        vertical_layout.addWidget(self.editor_status_bar)
+
+        self.setLayout(vertical_layout)
+
+        self.opened_tabs = 0
+
+        self.set_new_cursor_position_function = None
+
+    def open_file(self, file_path: str) -> None:
+        """
+        Open file in new tab. Content of file is loaded
+        when the tab is activated.
+
+        Args:
+            file_path(str): file path
+        """
+        if file_path in self.document_registry:
+            self.change_current_tab(file_path)
+            return
+
+        open(file_path, 'r').close()  # raise errors here, not when the tab is activated
+
+        tab = EditorTab(self.document_registry.normalize(file_path), self)
+        self.document_registry.open(tab.file_path, tab)
+        self.add_tab(tab, os.path.basename(file_path))
+
+    def restore_tabs(self, tabs: typing.List[SessionTab], current_tab: int) -> None:
+        """
+        Open tabs of saved session. Only the current tab is loaded,
+        other files aren't read until their tabs are activated.
+        Files which don't exist anymore are skipped.
+
+        Args:
+            tabs(typing.List[SessionTab]): tabs of session in order
+            current_tab(int): index of current tab in tabs
+        """
+        current_index = None
+        self.tab_widget.blockSignals(True)  # adding tabs would load each of them as current tab
+        try:
+            for idx, session_tab in enumerate(tabs):
+                if session_tab.path in self.document_registry or not os.path.isfile(session_tab.path):
+                    continue
+                tab = EditorTab(session_tab.path, self)  # paths of session are normalized already
+                tab.view_state = session_tab.view_state
+                self.document_registry.open(tab.file_path, tab)
+                self.tab_widget.addTab(tab, os.path.basename(tab.file_path))
+                self.opened_tabs += 1
+                if idx <= current_tab or current_index is None:
+                    current_index = self.tab_widget.count() - 1
+        finally:
+            self.tab_widget.blockSignals(False)
+
+        if current_index is not None:
+            self.tab_widget.setCurrentIndex(current_index)
+            self.tab_widget.currentChanged.emit(current_index)
+
+    def session_tabs(self) -> typing.Tuple[typing.List[SessionTab], int]:
+        """
+        Return tabs with saved files for session. Tabs which weren't loaded keep their restored view state.
+
+        Returns:
+            typing.Tuple[typing.List[SessionTab], int]: tabs in order and index of current tab
+        """
+        tabs = []
+        current_tab = 0
+        for idx in range(self.tab_widget.count()):
+            tab = self.tab_widget.widget(idx)
+            if not tab.file_path:
+                continue
+            view_state = tab.view_state
+            if tab.editor is not None and not tab.editor.loading:
+                view_state = tab.editor.view_state()
+            if idx <= self.tab_widget.currentIndex():
+                current_tab = len(tabs)
+            tabs.append(SessionTab(tab.file_path, view_state))
+        return tabs, current_tab
+
+    def start_journal(self, directory: str) -> None:
+        """
+        Start writing journals of unsaved changes to directory. Journals left
+        there by previous run are offered for recovery, when event loop is running.
+
+        Args:
+            directory(str): journal directory
+        """
+        journals = find_journals(directory)
+        self.journal_writer.directory = directory
+        if journals:
+            QTimer.singleShot(0, lambda: self.offer_recovery(journals))
+
+    def offer_recovery(self, journals: typing.List[SavedJournal]) -> None:
+        """
+        Ask whether unsaved changes of journals should be replayed on top of saved files
+        and open recovered documents in tabs. Journals are removed in both cases.
+
+        Args:
+            journals(typing.List[SavedJournal]): journals left by previous run
+        """
+        names = "\n".join(journal.file_path or "New file" for journal in journals)
+        answer = QMessageBox.question(
+            self, "Recover unsaved changes",
+            "Unsaved changes of these files were found:\n\n{}\n\nRecover them?".format(names),
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes
+        )
+
+        failed = []
+        for journal in journals:
+            if answer == QMessageBox.Yes and not self._recover_document(journal):
+                failed.append(journal.file_path or "New file")
+            self.journal_writer.remove(journal.journal_path)
+
+        if failed:
+            message = "Can't recover changes of these files, they were changed since or can't be opened:\n\n{}"
+            ErrorDialog("Recovery error", message.format("\n".join(failed)), self).show()
+
+    def new_file(self) -> None:
+        """
+        Create new tab / file
+        """
+        tab = EditorTab(parent=self)
+        code_editor = CodeEditorWidget(tab)
+        code_editor.file_saved = False
+        self._connect_editor(code_editor)
+        tab.set_editor(code_editor)
+        self.add_tab(tab, "NoName")
+
+    def save_file(self, file_path: str = None) -> bool:
+        """
+        Save current file(as). Text is taken here and written
+        in background by SavePipeline. File which is being loaded isn't saved,
+        its document contains only part of the text.
+
+        Args:
+            file_path(str): if file path is not None. Save as method called
+
+        Returns:
+            bool: True if write of the file was queued, False if it was refused or declined
+        """
+        file = file_path or self.get_current_file()
+        current_widget = self.get_current_widget()
+        if current_widget.loading:
+            self.editor_status_bar.showMessage("{} is being loaded, it can't be saved yet".format(
+                current_widget.opened_file), 3000)
+            return False
+        if current_widget.read_only or (file_path is None and not self._confirm_overwrite(current_widget)):
+            return False
+
+        if not self._register_saved_tab(self.tab_widget.currentWidget(), file):
+            return False
+        self._save_editor(current_widget)
+
+        self.tab_changed()
+        self.set_tab_text(os.path.basename(file))
+        return True
+
+    def save_all(self) -> None:
+        """
+        Save all modified files which have a path.
+        Files are written in parallel, count of parallel writes is limited by SavePipeline.
+        """
+        for idx in range(self.tab_widget.count()):
+            code_editor = self.tab_widget.widget(idx).editor
+            if code_editor and code_editor.file_saved and not code_editor.read_only and code_editor.is_modified():
+                if self._confirm_overwrite(code_editor):
+                    self._save_editor(code_editor)
+
+    def file_saved(self, file_path: str) -> None:
+        """
+        Show that file was written.
+        This method is called when file_saved signal of SavePipeline is emitted.
+
+        Args:
+            file_path(str): file path
+        """
+        current_widget = self.get_current_widget()
+        if current_widget is not None and current_widget.opened_file == file_path:
+            self.editor_status_bar.showMessage("{} saved".format(file_path), 3000)
+
+        document = self.document_registry.get(file_path)
+        if document is not None and isinstance(document.tab.editor, CodeEditorWidget):
+            document.tab.editor.mark_saved(file_state(file_path))
+
+    def save_failed(self, file_path: str, error: Exception) -> None:
+        """
+        Keep document modified with its journal and show error.
+        This method is called when save_failed signal of SavePipeline is emitted.
+
+        Args:
+            file_path(str): file path
+            error(Exception): raised exception
+        """
+        document = self.document_registry.get(file_path)
+        if document is not None and isinstance(document.tab.editor, CodeEditorWidget):
+            document.tab.editor.cancel_saving()
+
+        if isinstance(error, PermissionError):
+            ErrorDialog("Permission error", "Can't save this file: permission denied", self).show()
+        elif isinstance(error, UnicodeEncodeError):
+            ErrorDialog("Encoding error", "Can't save this file: text can't be encoded in {}".format(error.encoding),
+                        self).show()
+        else:
+            ErrorDialog("Unknown error", "Can't save this file: unknown error", self).show()
+
+    def files_changed(self, file_paths: typing.List[str]) -> None:
+        """
+        Reload externally modified files of loaded tabs. Unmodified documents and read only views
+        are reloaded at once, for modified documents user chooses whether to reload them.
+        Files which are being loaded are reloaded when their loading is finished.
+        Own saves are ignored, state of file is taken when it is written.
+        This method is called when files_changed signal of file watcher is emitted.
+
+        Args:
+            file_paths(typing.List[str]): possibly changed files
+        """
+        for file_path in file_paths:
+            document = self.document_registry.get(file_path)
+            if document is None or document.tab.editor is None or self.save_pipeline.is_saving(file_path):
+                continue
+            code_editor = document.tab.editor
+            state = file_state(file_path)
+            if state is None or state == code_editor.disk_state:
+                continue  # deleted file stays opened and it is written again by next save
+
+            if code_editor.loading:
+                self._changed_while_loading.add(file_path)
+            elif code_editor.read_only:
+                view_state = code_editor.view_state()
+                code_editor.load_file(file_path)
+                code_editor.set_view_state(view_state)
+            elif not code_editor.is_modified():
+                self.reload_file(file_path)
+            elif state != code_editor.asked_disk_state:
+                code_editor.asked_disk_state = state  # user is asked once for every modification
+                answer = QMessageBox.question(
+                    self, "File changed on disk",
+                    "{} was changed on disk.\n\nReload it and discard unsaved changes? "
+                    "Reload can be undone.".format(file_path),
+                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+                )
+                if answer == QMessageBox.Yes:
+                    self.reload_file(file_path)
+
+    def reload_file(self, file_path: str) -> None:
+        """
+        Read file and compare it with its document in background, then replace changed lines of document.
+
+        Args:
+            file_path(str): file path
+        """
+        old_lines = self.document_registry.get(file_path).tab.editor.get_lines()
+        worker = Worker(_read_changes, file_path, old_lines)
+        worker.signals.finished.connect(lambda result: self._file_read(file_path, old_lines, *result))
+        worker.signals.failed.connect(lambda error: self._reading_failed(file_path, error))
+        QThreadPool.globalInstance().start(worker)
+
+    def add_tab(self, tab: EditorTab, file_name: str) -> None:
+        """
+        Add new tab to the widget.
+
+        Args:
+            tab(EditorTab): content of new tab
+            file_name(str): name of new tab - file name
+        """
+        new_index = self.tab_widget.count()
+        self.tab_widget.addTab(tab, file_name)
+        self.tab_widget.setCurrentIndex(new_index)
+        self.opened_tabs += 1
+
+    def tab_changed(self) -> None:
+        """
+        Create editor of activated tab if it doesn't exist.
+        Change hide/show information in editor status bar.
+        Update line and column in main status bar.
+        Set new active file in registry and release inactive documents.
+        This method is called when currentChanged signal is emitted.
+        """
+        tab = self.tab_widget.currentWidget()
+        if tab is None:
+            self.editor_status_bar.hide()
+            return
+
+        if not tab.is_loaded() and not self._load_tab(tab):
+            return
+
+        self.editor_status_bar.showMessage(self.get_current_file() or "File not saved")
+        self.editor_status_bar.show()
+
+        self.update_loading_status()
+        tab.editor.cursor_position_changed()
+
+        if tab.file_path:
+            self.document_registry.activate(tab.file_path)
+            self.document_registry.release_inactive()
+
+    def update_loading_status(self) -> None:
+        """
+        Show loading progress of current widget in editor status bar.
+        """
+        current_widget = self.get_current_widget()
+        loading = bool(current_widget and current_widget.loading)
+
+        self.loading_progress_bar.setVisible(loading)
+        self.cancel_loading_button.setVisible(loading)
+        if loading:
+            self.loading_progress_bar.setValue(current_widget.load_progress)
+
+    def cancel_loading(self) -> None:
+        """
+        Cancel loading of file in current tab and close the tab,
+        so partially loaded file can't be saved.
+        """
+        self.close_tab(self.tab_widget.currentIndex())
+
+    def loading_finished(self) -> None:
+        """
+        Reload file which changed on disk while it was being loaded.
+        This method is called when loading_finished signal of editor is emitted.
+        """
+        file_path = self.sender().opened_file
+        if file_path in self._changed_while_loading:
+            self._changed_while_loading.discard(file_path)
+            self.files_changed([file_path])
+
+    def loading_failed(self, message: str) -> None:
+        """
+        Close tab with file which can't be loaded and show error.
+
+        Args:
+            message(str): error message
+        """
+        code_editor = self.sender()
+        self.close_tab(self.tab_widget.indexOf(code_editor.parent()))
+        ErrorDialog("Unknown error", "Can't open this file: {}".format(message), self).show()
+
+    def set_tab_text(self, text: str, index: int = None) -> None:
+        """
+        Set new text of current tab
+
+        Args:
+            text(str): new text
+            index(int): index of tab. If None -> use current
+        """
+        current_index = index or self.tab_widget.currentIndex()
+        self.tab_widget.setTabText(current_index, text)
+
+    def close_tab(self, index: int) -> None:
+        """
+        Close tab at index.
+
+        Args:
+            index(int): index of tab
+        """
+        tab = self.tab_widget.widget(index)
+        tab.release()
+        self.tab_widget.removeTab(index)
+        tab.deleteLater()
+        self.opened_tabs -= 1
+        if tab.file_path:
+            self.document_registry.close(tab.file_path)
+            self._changed_while_loading.discard(tab.file_path)
+
+    def is_file_saved(self) -> bool:
+        """
+        Return if file in current widget is saved.
+
+        Returns:
+            bool: True if file is save else False
+        """
+        current_tab = self.get_current_widget()
+        return current_tab.file_saved
+
+    def go_to_line(self, line_number: int) -> None:
+        """
+        Scroll current widget to line.
+
+        Args:
+            line_number(int): one based line number
+        """
+        current_widget = self.get_current_widget()
+        if current_widget:
+            current_widget.go_to_line(line_number)
+
+    def get_current_widget(self) -> typing.Optional[typing.Union[CodeEditorWidget, LargeFileWidget, HexFileWidget]]:
+        """
+        Return editor widget in current active tab
+
+        Returns:
+            typing.Optional[typing.Union[CodeEditorWidget, LargeFileWidget, HexFileWidget]]: Code editor in current tab
+        """
+        tab = self.tab_widget.currentWidget()
+        return tab.editor if tab is not None else None
+
+    def get_current_file(self) -> str:
+        """
+        Return file path of file in current active tab
+
+        Returns:
+            str: file path of file in active tab
+        """
+        return self.get_current_widget().opened_file
+
+    def change_current_tab(self, file_path: str) -> None:
+        """
+        Change current active tab to tab with file_path file
+
+        Args:
+            file_path(str): file path
+        """
+        document = self.document_registry.get(file_path)
+        if document is not None:
+            self.tab_widget.setCurrentWidget(document.tab)
+
+    def _load_tab(self, tab: EditorTab) -> bool:
+        """
+        Create editor widget of tab and start loading of its file.
+        Tab is closed when the file can't be opened anymore.
+
+        Args:
+            tab(EditorTab): tab without editor
+
+        Returns:
+            bool: True if editor was created
+        """
+        try:
+            file_format = sniff_format(tab.file_path)
+            if file_format.binary:
+                code_editor = HexFileWidget(tab)
+                code_editor.load_file(tab.file_path)
+            elif os.path.getsize(tab.file_path) > LARGE_FILE_THRESHOLD:
+                code_editor = LargeFileWidget(tab)
+                code_editor.load_file(tab.file_path)
+            else:
+                code_editor = CodeEditorWidget(tab)
+                code_editor.set_highlighter(highlighter_for_file(tab.file_path))
+                code_editor.load_file(tab.file_path, file_format)
+        except OSError as e:
+            self.close_tab(self.tab_widget.indexOf(tab))
+            ErrorDialog("Unknown error", "Can't open this file: {}".format(e.strerror), self).show()
+            return False
+
+        code_editor.file_saved = True
+        code_editor.opened_file = tab.file_path
+        self._connect_editor(code_editor)
+        tab.set_editor(code_editor)
+        return True
+
+    def _connect_editor(self, code_editor: typing.Union[CodeEditorWidget, LargeFileWidget, HexFileWidget]) -> None:
+        """
+        Connect signals of new editor widget.
+
+        Args:
+            code_editor(typing.Union[CodeEditorWidget, LargeFileWidget, HexFileWidget]): editor widget
+        """
+        code_editor.change_cursor_position.connect(self.set_new_cursor_position_function)
+        code_editor.loading_progress.connect(self.update_loading_status)
+        code_editor.loading_finished.connect(self.update_loading_status)
+        code_editor.loading_finished.connect(self.loading_finished)
+        code_editor.loading_failed.connect(self.loading_failed)
+        if isinstance(code_editor, CodeEditorWidget):
+            code_editor.journal_writer = self.journal_writer
+
+    def _recover_document(self, journal: SavedJournal) -> bool:
+        """
+        Replay journal and show recovered text in tab of its file.
+        Text of file which doesn't exist anymore is recovered to new file.
+
+        Args:
+            journal(SavedJournal): journal left by previous run
+
+        Returns:
+            bool: True if text was recovered
+        """
+        try:
+            text = replay_journal(journal)
+        except (OSError, ValueError):
+            return False
+        if text is None:
+            return False
+
+        if journal.file_path and os.path.isfile(journal.file_path):
+            try:
+                self.open_file(journal.file_path)
+            except OSError:
+                return False
+            document = self.document_registry.get(journal.file_path)
+            code_editor = document.tab.editor if document is not None else None
+        else:
+            self.new_file()
+            code_editor = self.get_current_widget()
+
+        if not isinstance(code_editor, CodeEditorWidget):
+            return False
+        code_editor.set_recovered_text(text)
+        return True
+
+    def _file_read(self, file_path: str, old_lines: typing.List[str], new_lines: typing.Optional[typing.List[str]],
+                   changes: typing.List[typing.Tuple[int, int, int, int]], file_format: FileFormat,
+                   state: typing.Optional[FileState]) -> None:
+        """
+        Apply changes of reloaded file to its document. Document edited during reading
+        is checked again, so the user is asked whether to reload it.
+
+        Args:
+            file_path(str): file path
+            old_lines(typing.List[str]): lines of document which were compared with file
+            new_lines(typing.Optional[typing.List[str]]): lines of file, None for binary file
+            changes(typing.List[typing.Tuple[int, int, int, int]]): changed ranges of lines
+            file_format(FileFormat): format of file
+            state(typing.Optional[FileState]): state of file when it was read
+        """
+        document = self.document_registry.get(file_path)
+        if document is None or not isinstance(document.tab.editor, CodeEditorWidget) or document.tab.editor.loading:
+            return
+        if new_lines is None:
+            self.editor_status_bar.showMessage("{} was changed to binary file, it isn't reloaded".format(file_path))
+        elif document.tab.editor.get_lines() != old_lines:
+            document.tab.editor.asked_disk_state = None
+            self.files_changed([file_path])
+        else:
+            document.tab.editor.reload_text(new_lines, changes, file_format, state)
+
+    def _reading_failed(self, file_path: str, error: Exception) -> None:
+        """
+        Show error of reloaded file which can't be read. Document is kept
+        and its file is still changed on disk, so saving it asks for overwrite.
+
+        Args:
+            file_path(str): file path
+            error(Exception): raised exception
+        """
+        message = error.strerror if isinstance(error, OSError) and error.strerror else str(error)
+        ErrorDialog("Unknown error", "Can't reload {}: {}".format(file_path, message), self).show()
+
+    def _confirm_overwrite(self, code_editor: CodeEditorWidget) -> bool:
+        """
+        Ask user whether file changed on disk since it was loaded or saved should be overwritten.
+
+        Args:
+            code_editor(CodeEditorWidget): saved editor
+
+        Returns:
+            bool: True if file can be written
+        """
+        if code_editor.opened_file is None or code_editor.disk_state is None:
+            return True
+        state = file_state(code_editor.opened_file)
+        if state is None or state == code_editor.disk_state:
+            return True
+
+        answer = QMessageBox.question(
+            self, "File changed on disk",
+            "{} was changed on disk since it was opened.\n\nOverwrite it?".format(code_editor.opened_file),
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        return answer == QMessageBox.Yes
+
+    def _save_editor(self, code_editor: CodeEditorWidget) -> None:
+        """
+        Take snapshot of editor text and pass it to SavePipeline.
+        Document is marked as unmodified when the snapshot is written, see file_saved.
+
+        Args:
+            code_editor(CodeEditorWidget): saved editor
+        """
+        code_editor.file_saved = True
+        code_editor.mark_saving()
+        self.save_pipeline.save(code_editor.opened_file, code_editor.get_plain_text(), code_editor.encoding,
+                                code_editor.newline)
+
+    def _register_saved_tab(self, tab: EditorTab, file_path: str) -> bool:
+        """
+        Register tab under new path after save as. When the path is opened in other tab,
+        user is asked whether the other tab should be closed.
+
+        Args:
+            tab(EditorTab): saved tab
+            file_path(str): new file path
+
+        Returns:
+            bool: True if tab is registered under the path
+        """
+        file_path = self.document_registry.normalize(file_path)
+        if tab.file_path == file_path:
+            return True
+
+        document = self.document_registry.get(file_path)
+        if document is not None:
+            answer = QMessageBox.question(
+                self, "File is opened",
+                "{} is opened in other tab.\n\nClose that tab{} and overwrite the file?".format(
+                    file_path, " with unsaved changes" if document.tab.is_modified() else ""),
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+            )
+            if answer != QMessageBox.Yes:
+                return False
+            self.close_tab(self.tab_widget.indexOf(document.tab))
+
+        if tab.file_path:
+            self.document_registry.close(tab.file_path)
+        tab.file_path = file_path
+        tab.editor.opened_file = file_path
+        tab.editor.set_highlighter(highlighter_for_file(file_path))
+        self.document_registry.open(file_path, tab)
+        self.document_registry.activate(file_path)
+        return True
+
+
+def _read_changes(file_path: str, old_lines: typing.List[str]) -> typing.Tuple[
+        typing.Optional[typing.List[str]], typing.List[typing.Tuple[int, int, int, int]], FileFormat,
+        typing.Optional[FileState]]:
+    """
+    Read text of file by its detected format and compare it with old lines.
+
+    Args:
+        file_path(str): file path
+        old_lines(typing.List[str]): lines of document
+
+    Returns:
+        typing.Tuple[typing.Optional[typing.List[str]], typing.List[typing.Tuple[int, int, int, int]], FileFormat,
+            typing.Optional[FileState]]: lines of file or None for binary file, changed ranges of lines,
+            format of file and state of file before reading
+    """
+    file_format = sniff_format(file_path)
+    if file_format.binary:
+        return None, [], file_format, None
+    file_format = file_format._replace(encoding=file_format.encoding or FALLBACK_ENCODING)
+    try:
+        with open(file_path, 'r', encoding=file_format.encoding) as f:
+            state = file_state(f.fileno())
+            new_lines = f.read().split("\n")
+    except UnicodeDecodeError:  # encoding was detected from beginning of file, like in load_file
+        file_format = file_format._replace(encoding=FALLBACK_ENCODING)
+        with open(file_path, 'r', encoding=FALLBACK_ENCODING) as f:
+            state = file_state(f.fileno())
+            new_lines = f.read().split("\n")
+    return new_lines, line_changes(old_lines, new_lines), file_format, state
@@ -0,0 +1,102 @@
+import itertools
+import os
+import typing
+from bisect import bisect_left
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+
+from pride.widgets.file_tree_model import PATH_ROLE
+
+
+class FileListModel(QAbstractListModel):
+    """
+    Model of opened files. Besides list of paths it keeps number of every path,
+    which is given when the path is added and never changes. Numbers of rows
+    are increasing, so row of path is found by bisection without scanning the list
+    and removal of path doesn't renumber following rows.
+    """
+
+    def __init__(self, parent=None):
+        QAbstractListModel.__init__(self, parent)
+        self._paths = []
+        self._row_numbers = []  # number of path in every row
+        self._numbers = dict()
+        self._counter = itertools.count()
+
+    def add_path(self, path: str) -> int:
+        """
+        Append path to the end of list.
+
+        Args:
+            path(str): file path
+
+        Returns:
+            int: row of path
+        """
+        row = self.row_of(path)
+        if row is not None:
+            return row
+
+        row = len(self._paths)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._paths.append(path)
+        self._numbers[path] = next(self._counter)
+        self._row_numbers.append(self._numbers[path])
+        self.endInsertRows()
+        return row
+
+    def remove_path(self, path: str) -> None:
+        """
+        Remove path from list.
+
+        Args:
+            path(str): file path
+        """
+        row = self.row_of(path)
+        if row is None:
+            return
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._paths[row]
+        del self._row_numbers[row]
+        del self._numbers[path]
+        self.endRemoveRows()
+
+    def set_paths(self, paths: typing.List[str]) -> None:
+        """
+        Replace all paths of list.
+
+        Args:
+            paths(typing.List[str]): file paths
+        """
+        self.beginResetModel()
+        self._paths = list(paths)
+        self._numbers = {path: number for number, path in zip(self._counter, self._paths)}
+        self._row_numbers = [self._numbers[path] for path in self._paths]
+        self.endResetModel()
+
+    def row_of(self, path: str) -> typing.Optional[int]:
+        """
+        Return row of path.
+
+        Args:
+            path(str): file path
+
+        Returns:
+            typing.Optional[int]: row or None if path isn't in list
+        """
+        number = self._numbers.get(path)
+        return None if number is None else bisect_left(self._row_numbers, number)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> typing.Any:
+        if not index.isValid():
+            return None
+        path = self._paths[index.row()]
+        if role == Qt.DisplayRole:
+            return os.path.basename(path)
+        if role in (PATH_ROLE, Qt.ToolTipRole):
+            return path
+        return None
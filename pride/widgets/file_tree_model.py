@@ -0,0 +1,336 @@
+import os
+import sys
+import typing
+
+from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex, QThreadPool
+from PyQt5.QtWidgets import QFileIconProvider
+
+from pride.common.file_system import scan_directory
+from pride.common.file_system_watcher import DebouncedDirectoryWatcher
+from pride.common.workers import Worker
+
+
+#  data role returning file path of node
+PATH_ROLE = Qt.UserRole + 1
+
+
+class FileNode:
+    """
+    Compact node of file tree. Only name of file is stored,
+    path is derived from parents on demand.
+    Children of directory are None until the directory is scanned.
+    """
+
+    __slots__ = ("name", "parent", "children", "row", "is_dir")
+
+    def __init__(self, name: str, parent: typing.Optional["FileNode"], row: int, is_dir: bool):
+        self.name = sys.intern(name)
+        self.parent = parent
+        self.children = None
+        self.row = row
+        self.is_dir = is_dir
+
+    @property
+    def path(self) -> str:
+        """
+        Returns:
+            str: path of node, name of root node is its full path
+        """
+        names = []
+        node = self
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return os.path.join(*reversed(names))
+
+    @property
+    def populated(self) -> bool:
+        """
+        Returns:
+            bool: True if content of directory is known
+        """
+        return self.children is not None
+
+
+class FileTreeModel(QAbstractItemModel):
+    """
+    Model of opened directories. Directories are scanned in thread pool
+    when view asks for their content (fetchMore) and scanned directories are watched
+    for changes, which are patched into the tree.
+    """
+
+    def __init__(self, parent=None):
+        QAbstractItemModel.__init__(self, parent)
+        self._roots = []
+        self._scanning = dict()
+        self._rescan = set()
+        self._populated_nodes = dict()
+
+        icon_provider = QFileIconProvider()
+        self._dir_icon = icon_provider.icon(QFileIconProvider.Folder)
+        self._file_icon = icon_provider.icon(QFileIconProvider.File)
+
+        self.watcher = DebouncedDirectoryWatcher(parent=self)
+        self.watcher.directories_changed.connect(self.directories_changed)
+
+    def add_root(self, dir_path: str) -> QModelIndex:
+        """
+        Add new top level directory.
+
+        Args:
+            dir_path(str): directory path
+
+        Returns:
+            QModelIndex: index of new directory
+        """
+        row = len(self._roots)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._roots.append(FileNode(dir_path, None, row, True))
+        self.endInsertRows()
+        return self.index(row, 0)
+
+    def node(self, index: QModelIndex) -> typing.Optional[FileNode]:
+        """
+        Return node of index.
+
+        Args:
+            index(QModelIndex): model index
+
+        Returns:
+            typing.Optional[FileNode]: node or None for invalid index
+        """
+        return index.internalPointer() if index.isValid() else None
+
+    def node_index(self, node: FileNode) -> QModelIndex:
+        """
+        Return index of node.
+
+        Args:
+            node(FileNode): node in tree
+
+        Returns:
+            QModelIndex: model index
+        """
+        return self.createIndex(node.row, 0, node)
+
+    def is_scanning(self) -> bool:
+        """
+        Returns:
+            bool: True if some directory is being scanned
+        """
+        return bool(self._scanning)
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        children = self._children(parent)
+        if column != 0 or not 0 <= row < len(children):
+            return QModelIndex()
+        return self.createIndex(row, column, children[row])
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        node = self.node(index)
+        if node is None or node.parent is None:
+            return QModelIndex()
+        return self.node_index(node.parent)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return len(self._children(parent))
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 1
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        node = self.node(parent)
+        if node is None:
+            return bool(self._roots)
+        return node.is_dir and (not node.populated or bool(node.children))
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        node = self.node(parent)
+        return node is not None and node.is_dir and not node.populated
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        node = self.node(parent)
+        if node is not None and node.path not in self._scanning:
+            self._scan(node, self._add_dirs)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> typing.Any:
+        node = self.node(index)
+        if node is None:
+            return None
+        if role == Qt.DisplayRole:
+            return os.path.basename(node.name) if node.parent is None else node.name
+        if role == Qt.DecorationRole:
+            return self._dir_icon if node.is_dir else self._file_icon
+        if role in (PATH_ROLE, Qt.ToolTipRole):
+            return node.path
+        return None
+
+    def directories_changed(self, paths: typing.List[str]) -> None:
+        """
+        Rescan changed directories which are already in tree.
+        This method is called when directories_changed signal of watcher is emitted.
+
+        Args:
+            paths(typing.List[str]): changed directories
+        """
+        for path in paths:
+            node = self._populated_nodes.get(path)
+            if node is not None:
+                self._scan(node, self._update_dirs)
+
+    def _children(self, parent: QModelIndex) -> typing.List[FileNode]:
+        """
+        Return children of index. Unscanned directory has no children.
+
+        Args:
+            parent(QModelIndex): parent index
+
+        Returns:
+            typing.List[FileNode]: child nodes
+        """
+        node = self.node(parent)
+        if node is None:
+            return self._roots
+        return node.children or []
+
+    def _scan(self, node: FileNode, callback: typing.Callable[[FileNode, list], None]) -> None:
+        """
+        Scan directory of node in thread pool and pass result to callback.
+        If the directory is being scanned, it is scanned again after that.
+
+        Args:
+            node(FileNode): directory node
+            callback(typing.Callable[[FileNode, list], None]): function called with node and scanned entries
+        """
+        path = node.path
+        if path in self._scanning:
+            self._rescan.add(path)
+            return
+
+        worker = Worker(scan_directory, path)
+        worker.signals.finished.connect(lambda entries: self._scanned(path, entries, callback))
+        worker.signals.failed.connect(lambda error: self._scanned(path, [], callback))
+        self._scanning[path] = (node, worker)
+        QThreadPool.globalInstance().start(worker)
+
+    def _scanned(self, path: str, entries: list, callback: typing.Callable[[FileNode, list], None]) -> None:
+        """
+        Pass scanned entries to callback and start postponed scan.
+        Result is dropped if node was removed from tree meanwhile.
+
+        Args:
+            path(str): scanned directory
+            entries(list): scanned entries
+            callback(typing.Callable[[FileNode, list], None]): function called with node and scanned entries
+        """
+        node, _ = self._scanning.pop(path)
+        if not self._is_in_tree(node):
+            self._rescan.discard(path)
+            return
+
+        callback(node, entries)
+        if path in self._rescan:
+            self._rescan.discard(path)
+            self._scan(node, self._update_dirs)
+
+    def _add_dirs(self, node: FileNode, entries: typing.List[typing.Tuple[str, str, bool]]) -> None:
+        """
+        Add scanned dirs/files to tree at once and start watching the directory.
+        Subdirectories are added without content.
+
+        Args:
+            node(FileNode): scanned directory node
+            entries(typing.List[typing.Tuple[str, str, bool]]): name, path and is dir flag of every entry
+        """
+        node.children = []
+        if entries:
+            self.beginInsertRows(self.node_index(node), 0, len(entries) - 1)
+            node.children = [FileNode(name, node, row, is_dir) for row, (name, _, is_dir) in enumerate(entries)]
+            self.endInsertRows()
+        else:
+            index = self.node_index(node)
+            self.dataChanged.emit(index, index)  # directory has no children, remove expand arrow
+
+        path = node.path
+        self._populated_nodes[path] = node
+        self.watcher.watch(path)
+
+    def _update_dirs(self, node: FileNode, entries: typing.List[typing.Tuple[str, str, bool]]) -> None:
+        """
+        Patch children of directory node by new scan.
+        Only removed and new entries are touched, so content and
+        expansion of unchanged subdirectories is kept.
+        Consecutive rows are removed/inserted at once.
+
+        Args:
+            node(FileNode): scanned directory node
+            entries(typing.List[typing.Tuple[str, str, bool]]): name, path and is dir flag of every entry
+        """
+        parent_index = self.node_index(node)
+        children = node.children
+
+        new_entries = {(name, is_dir) for name, _, is_dir in entries}
+        row = len(children) - 1
+        while row >= 0:
+            if (children[row].name, children[row].is_dir) in new_entries:
+                row -= 1
+                continue
+            last = row
+            while row > 0 and (children[row - 1].name, children[row - 1].is_dir) not in new_entries:
+                row -= 1
+            self.beginRemoveRows(parent_index, row, last)
+            for child in children[row:last + 1]:
+                self._forget_populated(child)
+            del children[row:last + 1]
+            for idx in range(row, len(children)):
+                children[idx].row = idx
+            self.endRemoveRows()
+            row -= 1
+
+        # existing children keep sorted order, so new nodes can be inserted at their final row
+        existing_entries = {(child.name, child.is_dir) for child in children}
+        row = 0
+        while row < len(entries):
+            name, _, is_dir = entries[row]
+            if (name, is_dir) in existing_entries:
+                row += 1
+                continue
+            first = row
+            while row < len(entries) and (entries[row][0], entries[row][2]) not in existing_entries:
+                row += 1
+            self.beginInsertRows(parent_index, first, row - 1)
+            children[first:first] = [FileNode(name, node, 0, is_dir) for name, _, is_dir in entries[first:row]]
+            for idx in range(first, len(children)):
+                children[idx].row = idx
+            self.endInsertRows()
+
+        self.dataChanged.emit(parent_index, parent_index)
+
+    def _forget_populated(self, node: FileNode) -> None:
+        """
+        Stop watching removed directory node and all its populated subdirectories.
+
+        Args:
+            node(FileNode): removed node
+        """
+        removed_paths = []
+        nodes = [node]
+        while nodes:
+            current = nodes.pop()
+            if current.populated:
+                path = current.path
+                if self._populated_nodes.get(path) is current:
+                    del self._populated_nodes[path]
+                    removed_paths.append(path)
+                nodes.extend(current.children)
+        node.parent = None  # detach, so pending scans of its subdirectories are dropped
+        self.watcher.unwatch(removed_paths)
+
+    def _is_in_tree(self, node: FileNode) -> bool:
+        """
+        Returns:
+            bool: True if node is still connected to root of tree
+        """
+        while node.parent is not None:
+            node = node.parent
+        return node in self._roots
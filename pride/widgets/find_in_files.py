@@ -0,0 +1,221 @@
+import multiprocessing
+import os
+import re
+import typing
+from concurrent.futures import ProcessPoolExecutor
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QCheckBox, QLabel, QListView
+
+from pride.common.file_search import FileSearch, Match, compile_query
+from pride.common.trigram_index import TrigramIndexes
+from pride.widgets.file_tree_model import PATH_ROLE
+
+
+#  data role returning line number of match
+LINE_ROLE = Qt.UserRole + 2
+#  delay between last change of query and start of search (ms)
+SEARCH_DELAY = 300
+
+
+class SearchResultsModel(QAbstractListModel):
+    """
+    Model of find in files matches. Matches are appended in batches.
+    """
+
+    def __init__(self, parent=None):
+        QAbstractListModel.__init__(self, parent)
+        self._matches = []
+
+    def add_matches(self, matches: typing.List[Match]) -> None:
+        """
+        Append batch of matches at once.
+
+        Args:
+            matches(typing.List[Match]): new matches
+        """
+        row = len(self._matches)
+        self.beginInsertRows(QModelIndex(), row, row + len(matches) - 1)
+        self._matches.extend(matches)
+        self.endInsertRows()
+
+    def clear(self) -> None:
+        """
+        Remove all matches.
+        """
+        self.beginResetModel()
+        self._matches = []
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._matches)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> typing.Any:
+        if not index.isValid():
+            return None
+        match = self._matches[index.row()]
+        if role == Qt.DisplayRole:
+            return "{}:{}: {}".format(os.path.basename(match.path), match.line_number, match.line.strip())
+        if role in (PATH_ROLE, Qt.ToolTipRole):
+            return match.path
+        if role == LINE_ROLE:
+            return match.line_number
+        return None
+
+
+class FindInFilesWidget(QWidget):
+    """
+    Panel which searches all opened directories. Files are searched
+    in process pool and matches are shown as batches are finished.
+    New query cancels the running search. Trigram indexes of directories,
+    if available, narrow searched files and outdated ones are updated after search.
+    """
+
+    open_match = pyqtSignal(str, int)
+
+    def __init__(self, directories: typing.Set[str], trigram_indexes: typing.Optional[TrigramIndexes] = None,
+                 parent=None):
+        QWidget.__init__(self, parent)
+        self.directories = directories
+        self.trigram_indexes = trigram_indexes
+
+        self.query_edit = QLineEdit(self)
+        self.query_edit.setPlaceholderText("Find in files")
+        self.regex_check_box = QCheckBox("Regex", self)
+        self.case_check_box = QCheckBox("Match case", self)
+        self.status_label = QLabel(self)
+
+        self.results_model = SearchResultsModel(self)
+        self.results_view = QListView(self)
+        self.results_view.setModel(self.results_model)
+        self.results_view.setUniformItemSizes(True)
+        self.results_view.doubleClicked.connect(self.index_double_clicked)
+
+        query_layout = QHBoxLayout()
+        query_layout.addWidget(self.query_edit)
+        query_layout.addWidget(self.regex_check_box)
+        query_layout.addWidget(self.case_check_box)
+        query_layout.addWidget(self.status_label)
+
+        vertical_layout = QVBoxLayout(self)
+        vertical_layout.setContentsMargins(0, 0, 0, 0)
+        vertical_layout.addLayout(query_layout)
+        vertical_layout.addWidget(self.results_view)
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DELAY)
+        self._search_timer.timeout.connect(self.search)
+
+        self.query_edit.textChanged.connect(self._search_timer.start)
+        self.query_edit.returnPressed.connect(self.search)
+        self.regex_check_box.toggled.connect(self.search)
+        self.case_check_box.toggled.connect(self.search)
+
+        self._executor = None
+        self._search = None
+        self._cancelled_searches = set()
+
+    def search(self) -> None:
+        """
+        Cancel running search and start new one with current query.
+        """
+        self._search_timer.stop()
+        self.cancel()
+        self.results_model.clear()
+
+        query = self.query_edit.text()
+        if not query or not self.directories:
+            self.status_label.clear()
+            return
+
+        regex = self.regex_check_box.isChecked()
+        case_sensitive = self.case_check_box.isChecked()
+        try:
+            compile_query(query, regex, case_sensitive)
+        except re.error as e:
+            self.status_label.setText("Invalid regex: {}".format(e))
+            return
+
+        if self._executor is None:
+            # spawned workers don't inherit state of Qt threads
+            self._executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+
+        indexes = dict()
+        if self.trigram_indexes is not None:
+            # snapshot taken in GUI thread, indexes can be replaced while searching
+            for directory in self.directories:
+                indexes[directory] = (self.trigram_indexes.get(directory), self.trigram_indexes.dirty_paths(directory))
+
+        self._search = FileSearch(self._executor, sorted(self.directories), query, regex, case_sensitive,
+                                  indexes, self)
+        self._search.matches_found.connect(self.matches_found)
+        self._search.progress_changed.connect(self.progress_changed)
+        self._search.finished.connect(self.search_finished)
+        self.status_label.setText("Searching...")
+        self._search.start()
+
+    def cancel(self) -> None:
+        """
+        Stop running search without waiting for it. Its late results are ignored.
+        """
+        if self._search is not None:
+            self._search.requestInterruption()
+            self._cancelled_searches.add(self._search)  # keep reference until thread ends
+            self._search = None
+
+    def shutdown(self) -> None:
+        """
+        Stop search and worker processes. Used before exit.
+        """
+        self.cancel()
+        for search in list(self._cancelled_searches):
+            search.wait()  # cancels its waiting batches
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def matches_found(self, matches: typing.List[Match]) -> None:
+        """
+        Show batch of matches of current search.
+        This method is called when matches_found signal of search is emitted.
+
+        Args:
+            matches(typing.List[Match]): new matches
+        """
+        if self.sender() is self._search:
+            self.results_model.add_matches(matches)
+
+    def progress_changed(self, progress: int) -> None:
+        """
+        Show progress of current search.
+        This method is called when progress_changed signal of search is emitted.
+
+        Args:
+            progress(int): progress in percent
+        """
+        if self.sender() is self._search:
+            self.status_label.setText("Searching... {} %".format(progress))
+
+    def search_finished(self) -> None:
+        """
+        Drop finished search, show count of matches and update outdated indexes.
+        This method is called when finished signal of search is emitted.
+        """
+        search = self.sender()
+        self._cancelled_searches.discard(search)
+        for directory in search.outdated_indexes:
+            self.trigram_indexes.update(directory)
+        if search is self._search:
+            self._search = None
+            self.status_label.setText("{} matches".format(self.results_model.rowCount()))
+        search.deleteLater()
+
+    def index_double_clicked(self, index: QModelIndex) -> None:
+        """
+        Open file of double clicked match.
+
+        Args:
+            index(QModelIndex): double clicked index
+        """
+        self.open_match.emit(index.data(PATH_ROLE), index.data(LINE_ROLE))
@@ -0,0 +1,175 @@
+import typing
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QEvent, QObject, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QShowEvent
+from PyQt5.QtWidgets import QDialog, QLineEdit, QListView, QVBoxLayout
+
+from pride.common.symbol_index import Symbol, SymbolIndex
+from pride.widgets.file_tree_model import PATH_ROLE
+from pride.widgets.opened_files import PathItemDelegate
+
+
+#  data role returning line of symbol
+LINE_ROLE = Qt.UserRole + 2
+
+#  keys of query line which move selection in list of results
+_LIST_KEYS = (Qt.Key_Up, Qt.Key_Down, Qt.Key_PageUp, Qt.Key_PageDown)
+
+
+class SymbolListModel(QAbstractListModel):
+    """
+    Model of found symbols.
+    """
+
+    def __init__(self, parent=None):
+        QAbstractListModel.__init__(self, parent)
+        self._symbols = []
+
+    def set_symbols(self, symbols: typing.List[Symbol]) -> None:
+        """
+        Replace all symbols of list.
+
+        Args:
+            symbols(typing.List[Symbol]): symbols
+        """
+        self.beginResetModel()
+        self._symbols = list(symbols)
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._symbols)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> typing.Any:
+        if not index.isValid():
+            return None
+        symbol = self._symbols[index.row()]
+        if role == Qt.DisplayRole:
+            if symbol.container:
+                return "{} ({} of {})".format(symbol.name, symbol.kind, symbol.container)
+            return "{} ({})".format(symbol.name, symbol.kind)
+        if role == PATH_ROLE:
+            return "{}:{}".format(symbol.path, symbol.line)
+        if role == Qt.ToolTipRole:
+            return symbol.path
+        if role == LINE_ROLE:
+            return symbol.line
+        return None
+
+    def symbol(self, index: QModelIndex) -> Symbol:
+        """
+        Args:
+            index(QModelIndex): index of row
+
+        Returns:
+            Symbol: symbol of row
+        """
+        return self._symbols[index.row()]
+
+
+class FindSymbolDialog(QDialog):
+    """
+    Dialog which finds classes, functions and variables of opened directories by name.
+    """
+
+    symbol_selected = pyqtSignal(str, int)
+
+    def __init__(self, symbol_index: SymbolIndex, parent=None):
+        QDialog.__init__(self, parent)
+        self.setWindowTitle("Find symbol")
+        self.resize(700, 400)
+
+        self.symbol_index = symbol_index
+        self.symbol_index.index_changed.connect(self.index_changed)
+
+        self.query_edit = QLineEdit(self)
+        self.query_edit.setPlaceholderText("Symbol name")
+        self.query_edit.installEventFilter(self)
+        self.query_edit.textChanged.connect(self.query_changed)
+        self.query_edit.returnPressed.connect(self.open_current)
+
+        self.list_model = SymbolListModel(self)
+        self.list_view = QListView(self)
+        self.list_view.setModel(self.list_model)
+        self.list_view.setItemDelegate(PathItemDelegate(self.list_view))
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setFocusPolicy(Qt.NoFocus)
+        self.list_view.activated.connect(self.open_index)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.query_edit)
+        layout.addWidget(self.list_view)
+
+    def showEvent(self, event: QShowEvent) -> None:
+        """
+        Overridden showEvent which finds previous query again and selects it.
+
+        Args:
+            event(QShowEvent): qt event object with event data
+        """
+        self.query_changed(self.query_edit.text())
+        self.query_edit.selectAll()
+        self.query_edit.setFocus()
+        QDialog.showEvent(self, event)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        """
+        Forward keys moving selection from query line to list of results.
+
+        Args:
+            watched(QObject): object which got the event
+            event(QEvent): qt event object with event data
+
+        Returns:
+            bool: True if event was handled
+        """
+        if watched is self.query_edit and event.type() == QEvent.KeyPress and event.key() in _LIST_KEYS:
+            self.list_view.keyPressEvent(event)
+            return True
+        return QDialog.eventFilter(self, watched, event)
+
+    def set_query(self, query: str) -> None:
+        """
+        Replace query and show its results.
+
+        Args:
+            query(str): symbol name
+        """
+        self.query_edit.setText(query)
+
+    def query_changed(self, text: str) -> None:
+        """
+        Show symbols matching new query.
+        This method is called when text of query line is changed.
+
+        Args:
+            text(str): new query
+        """
+        self.list_model.set_symbols(self.symbol_index.find(text.strip()))
+        self.list_view.setCurrentIndex(self.list_model.index(0))
+
+    def index_changed(self) -> None:
+        """
+        Find query again in new index.
+        This method is called when index_changed signal of symbol index is emitted.
+        """
+        if self.isVisible():
+            self.query_changed(self.query_edit.text())
+
+    def open_current(self) -> None:
+        """
+        Open selected result.
+        """
+        self.open_index(self.list_view.currentIndex())
+
+    def open_index(self, index: QModelIndex) -> None:
+        """
+        Emit location of symbol and close dialog.
+
+        Args:
+            index(QModelIndex): index of result
+        """
+        if not index.isValid():
+            return
+        symbol = self.list_model.symbol(index)
+        self.symbol_selected.emit(symbol.path, symbol.line)
+        self.accept()
@@ -0,0 +1,254 @@
+import mmap
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt, QRect, pyqtSignal
+from PyQt5.QtGui import QPaintEvent, QPainter, QMouseEvent, QResizeEvent, QWheelEvent, QFontDatabase
+from PyQt5.QtWidgets import QAbstractScrollArea
+
+
+#  count of bytes shown in one row
+BYTES_PER_ROW = 16
+#  size of page read from mapped file at once, multiple of BYTES_PER_ROW (bytes)
+PAGE_SIZE = 64 * 1024
+#  count of pages kept in memory
+MAX_CACHED_PAGES = 16
+
+
+class HexView(QAbstractScrollArea):
+    """
+    Read only hex view of memory mapped file. Every row shows offset, bytes
+    in hex and printable bytes as text. Only rows in the viewport are rendered,
+    their bytes are read by pages from the mapped file on demand.
+    """
+
+    cursorPositionChanged = pyqtSignal()
+
+    def __init__(self, parent=None):
+        QAbstractScrollArea.__init__(self, parent)
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.verticalScrollBar().valueChanged.connect(self.viewport().update)
+        self.horizontalScrollBar().valueChanged.connect(self.viewport().update)
+
+        self._file = None
+        self._mapped_file = None
+        self._size = 0
+        self._pages = OrderedDict()
+        self._current_row = 0
+
+    def open(self, file_path: str) -> None:
+        """
+        Memory map file.
+
+        Args:
+            file_path(str): file path
+        """
+        self.close_file()
+        self._file = open(file_path, 'rb')
+        try:
+            self._size = self._file.seek(0, 2)
+            if self._size:  # empty file can't be mapped
+                self._mapped_file = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self.close_file()
+            raise
+        self._current_row = 0
+        self._update_scroll_ranges()
+        self.viewport().update()
+
+    def close_file(self) -> None:
+        """
+        Drop cached pages and unmap file.
+        """
+        self._pages.clear()
+        if self._mapped_file is not None:
+            self._mapped_file.close()
+            self._mapped_file = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._size = 0
+
+    def row_count(self) -> int:
+        """
+        Returns:
+            int: count of rows of file
+        """
+        return max(1, (self._size + BYTES_PER_ROW - 1) // BYTES_PER_ROW)
+
+    def memory_usage(self) -> int:
+        """
+        Returns:
+            int: memory used by cached pages (bytes)
+        """
+        return sum(len(page) for page in self._pages.values())
+
+    def row_height(self) -> int:
+        """
+        Returns:
+            int: height of one row in pixels
+        """
+        return self.fontMetrics().height()
+
+    def first_visible_row(self) -> int:
+        """
+        Returns:
+            int: zero based number of first row in viewport
+        """
+        return self.verticalScrollBar().value()
+
+    def visible_row_count(self) -> int:
+        """
+        Returns:
+            int: count of rows which fit into viewport
+        """
+        return max(1, self.viewport().height() // self.row_height())
+
+    def current_row_number(self) -> int:
+        """
+        Returns:
+            int: one based number of current row
+        """
+        return self._current_row + 1
+
+    def row_bytes(self, row: int) -> bytes:
+        """
+        Read bytes of row from cached page.
+
+        Args:
+            row(int): zero based row number
+
+        Returns:
+            bytes: bytes of row, the last row can be shorter
+        """
+        offset = row * BYTES_PER_ROW
+        page_offset = offset % PAGE_SIZE
+        return self._page(offset // PAGE_SIZE)[page_offset:page_offset + BYTES_PER_ROW]
+
+    def row_text(self, row: int) -> str:
+        """
+        Format row as offset, hex bytes and printable characters.
+
+        Args:
+            row(int): zero based row number
+
+        Returns:
+            str: text of row
+        """
+        data = self.row_bytes(row)
+        hex_bytes = " ".join("{:02x}".format(byte) for byte in data)
+        characters = "".join(chr(byte) if 32 <= byte < 127 else "." for byte in data)
+        return "{:08x}  {:<{width}}  {}".format(row * BYTES_PER_ROW, hex_bytes, characters,
+                                                width=BYTES_PER_ROW * 3 - 1)
+
+    def go_to_row(self, row_number: int) -> None:
+        """
+        Scroll to row and make it current.
+
+        Args:
+            row_number(int): one based row number
+        """
+        self._current_row = min(max(0, row_number - 1), self.row_count() - 1)
+        self.verticalScrollBar().setValue(self._current_row - self.visible_row_count() // 2)
+        self.cursorPositionChanged.emit()
+        self.viewport().update()
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """
+        Overridden paintEvent which draws only rows in viewport.
+
+        Args:
+            event(QPaintEvent): qt event object with event data
+        """
+        if self._mapped_file is None:
+            return
+
+        painter = QPainter(self.viewport())
+        painter.fillRect(event.rect(), self.palette().base())
+        row_height = self.row_height()
+        width = self.viewport().width()
+        x_offset = -self.horizontalScrollBar().value() + 4
+
+        first_row = self.first_visible_row()
+        last_row = min(first_row + event.rect().bottom() // row_height, self.row_count() - 1)
+        for row in range(first_row + max(0, event.rect().top() // row_height), last_row + 1):
+            top = (row - first_row) * row_height
+            if row == self._current_row:
+                painter.fillRect(0, top, width, row_height, self.palette().alternateBase())
+            painter.drawText(QRect(x_offset, top, width - x_offset, row_height), Qt.AlignLeft, self.row_text(row))
+        painter.end()
+
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        """
+        Overridden mousePressEvent which changes current row.
+
+        Args:
+            event(QMouseEvent): qt event object with event data
+        """
+        row = self.first_visible_row() + event.pos().y() // self.row_height()
+        if row < self.row_count():
+            self._current_row = row
+            self.cursorPositionChanged.emit()
+            self.viewport().update()
+
+    def wheelEvent(self, event: QWheelEvent) -> None:
+        """
+        Overridden wheelEvent for zooming.
+
+        Args:
+            event(QWheelEvent): qt event object with event data
+        """
+        if event.modifiers() & Qt.ControlModifier:
+            font = self.font()
+            font.setPointSize(max(1, font.pointSize() + (1 if event.angleDelta().y() > 0 else -1)))
+            self.setFont(font)
+            self._update_scroll_ranges()
+            self.viewport().update()
+        else:
+            QAbstractScrollArea.wheelEvent(self, event)
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        """
+        Overridden resizeEvent which updates scroll bars.
+
+        Args:
+            event(QResizeEvent): qt event object with event data
+        """
+        QAbstractScrollArea.resizeEvent(self, event)
+        self._update_scroll_ranges()
+
+    def _page(self, index: int) -> bytes:
+        """
+        Return page of mapped file, the least recently used page is dropped when cache is full.
+
+        Args:
+            index(int): zero based page number
+
+        Returns:
+            bytes: bytes of page
+        """
+        page = self._pages.get(index)
+        if page is not None:
+            self._pages.move_to_end(index)
+            return page
+
+        if self._mapped_file is None:
+            return b""
+        page = self._mapped_file[index * PAGE_SIZE:(index + 1) * PAGE_SIZE]
+        self._pages[index] = page
+        if len(self._pages) > MAX_CACHED_PAGES:
+            self._pages.popitem(last=False)
+        return page
+
+    def _update_scroll_ranges(self) -> None:
+        """
+        Set range of scroll bars by count of rows and width of row.
+        """
+        visible_rows = self.visible_row_count()
+        vertical_scroll_bar = self.verticalScrollBar()
+        vertical_scroll_bar.setRange(0, max(0, self.row_count() - visible_rows))
+        vertical_scroll_bar.setPageStep(visible_rows)
+
+        row_width = self.fontMetrics().width(self.row_text(0) if self._mapped_file is not None else "") + 8
+        horizontal_scroll_bar = self.horizontalScrollBar()
+        horizontal_scroll_bar.setRange(0, max(0, row_width - self.viewport().width()))
+        horizontal_scroll_bar.setPageStep(self.viewport().width())
@@ -0,0 +1,362 @@
+import mmap
+import typing
+from array import array
+from itertools import accumulate
+
+from PyQt5.QtCore import Qt, QRect, QThread, pyqtSignal
+from PyQt5.QtGui import QPaintEvent, QPainter, QMouseEvent, QResizeEvent, QWheelEvent, QFontDatabase
+from PyQt5.QtWidgets import QAbstractScrollArea
+
+
+#  files bigger than this are opened in read only large file mode
+LARGE_FILE_THRESHOLD = 32 * 1024 * 1024
+#  size of part of file which is indexed at once
+INDEX_BATCH_SIZE = 4 * 1024 * 1024
+#  lines longer than this are cut while rendering
+MAX_RENDERED_LINE_LENGTH = 4096
+
+
+class LineIndexer(QThread):
+    """
+    Thread which builds index of line start offsets of memory mapped file.
+    New offsets are handed over in batches, so the index can be used
+    while it is still being built.
+    """
+
+    lines_indexed = pyqtSignal(object)
+    progress_changed = pyqtSignal(int)
+
+    def __init__(self, mapped_file: mmap.mmap, batch_size: int = INDEX_BATCH_SIZE, parent=None):
+        QThread.__init__(self, parent)
+        self.mapped_file = mapped_file
+        self.batch_size = batch_size
+
+    def run(self) -> None:
+        """
+        Find all new lines in file. Offset of line following
+        each new line character is added to the index.
+        """
+        size = len(self.mapped_file)
+        position = 0
+        while position < size and not self.isInterruptionRequested():
+            end = min(position + self.batch_size, size)
+            lines = self.mapped_file[position:end].split(b"\n")
+            # last item is part of line which continues in next batch
+            offsets = array('q', accumulate((len(line) + 1 for line in lines[:-1]), initial=position))
+            self.lines_indexed.emit(offsets[1:])
+            self.progress_changed.emit(end * 100 // size)
+            position = end
+
+
+class LargeFileView(QAbstractScrollArea):
+    """
+    Read only view of memory mapped file which renders
+    only lines in the viewport. It provides same interface for
+    LinesNumberBar as CodeEdit.
+    """
+
+    updateRequest = pyqtSignal(QRect, int)
+    blockCountChanged = pyqtSignal(int)
+    cursorPositionChanged = pyqtSignal()
+    indexing_progress = pyqtSignal(int)
+    indexing_finished = pyqtSignal()
+
+    def __init__(self, parent=None):
+        QAbstractScrollArea.__init__(self, parent)
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.verticalScrollBar().valueChanged.connect(self._scrolled)
+        self.horizontalScrollBar().valueChanged.connect(self.viewport().update)
+
+        self.encoding = "utf-8"
+        self._file = None
+        self._mapped_file = None
+        self._line_offsets = array('q', [0])
+        self._line_indexer = None
+        self._pending_line = None
+        self._current_line = 0
+        self._longest_line_width = 0
+        self._scroll_value = 0
+
+    def open(self, file_path: str) -> None:
+        """
+        Memory map file and start building of line index.
+
+        Args:
+            file_path(str): file path
+        """
+        self.close_file()
+        self._file = open(file_path, 'rb')
+        self._mapped_file = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._line_indexer = LineIndexer(self._mapped_file, parent=self)
+        self._line_indexer.lines_indexed.connect(self._lines_indexed)
+        self._line_indexer.progress_changed.connect(self._indexing_progress)
+        self._line_indexer.finished.connect(self._indexing_finished)
+        self._line_indexer.start()
+
+    def close_file(self) -> None:
+        """
+        Stop indexing and unmap file. Signals of stopped indexer
+        which are still queued are ignored by the slots.
+        """
+        if self._line_indexer is not None:
+            self._line_indexer.requestInterruption()
+            self._line_indexer.wait()
+            self._line_indexer.deleteLater()
+            self._line_indexer = None
+        if self._mapped_file is not None:
+            self._mapped_file.close()
+            self._file.close()
+            self._mapped_file = self._file = None
+        self._line_offsets = array('q', [0])
+
+    def is_indexing(self) -> bool:
+        """
+        Returns:
+            bool: True if line index is still being built
+        """
+        return self._line_indexer is not None
+
+    def line_count(self) -> int:
+        """
+        Returns:
+            int: count of already indexed lines
+        """
+        return len(self._line_offsets)
+
+    def memory_usage(self) -> int:
+        """
+        Returns:
+            int: memory used by line index (bytes)
+        """
+        return self._line_offsets.itemsize * len(self._line_offsets)
+
+    def line_height(self) -> int:
+        """
+        Returns:
+            int: height of one line in pixels
+        """
+        return self.fontMetrics().height()
+
+    def first_visible_line(self) -> int:
+        """
+        Returns:
+            int: zero based number of first line in viewport
+        """
+        return self.verticalScrollBar().value()
+
+    def visible_line_count(self) -> int:
+        """
+        Returns:
+            int: count of lines which fit into viewport
+        """
+        return max(1, self.viewport().height() // self.line_height())
+
+    def line_text(self, line: int) -> str:
+        """
+        Read and decode line from mapped file.
+
+        Args:
+            line(int): zero based line number
+
+        Returns:
+            str: text of line without new line characters
+        """
+        start = self._line_offsets[line]
+        if line + 1 < len(self._line_offsets):
+            end = self._line_offsets[line + 1] - 1
+        else:
+            end = self._mapped_file.find(b"\n", start)  # end of last indexed line is not known yet
+            end = len(self._mapped_file) if end == -1 else end
+        end = min(end, start + MAX_RENDERED_LINE_LENGTH)
+        return self._mapped_file[start:end].decode(self.encoding, errors="replace").rstrip("\r")
+
+    def visible_lines(self, rect: QRect) -> typing.Iterator[typing.Tuple[int, int]]:
+        """
+        Generate lines which intersect given rectangle of viewport.
+
+        Args:
+            rect(QRect): rectangle in viewport coordinates
+
+        Returns:
+            typing.Iterator[typing.Tuple[int, int]]: one based line number and top of line in pixels
+        """
+        line_height = self.line_height()
+        first_line = self.first_visible_line()
+        line = first_line + max(0, rect.top() // line_height)
+        last_line = min(first_line + rect.bottom() // line_height, self.line_count() - 1)
+        while line <= last_line:
+            yield line + 1, (line - first_line) * line_height
+            line += 1
+
+    def current_line_number(self) -> int:
+        """
+        Returns:
+            int: one based number of line under cursor
+        """
+        return self._current_line + 1
+
+    def go_to_line(self, line_number: int) -> None:
+        """
+        Scroll to line and make it current. If the line is not indexed yet,
+        jump is postponed until indexer gets to it.
+
+        Args:
+            line_number(int): one based line number
+        """
+        line = max(0, line_number - 1)
+        if line >= self.line_count():
+            if self.is_indexing():
+                self._pending_line = line
+                return
+            line = self.line_count() - 1
+
+        self._pending_line = None
+        self._current_line = line
+        self.verticalScrollBar().setValue(line - self.visible_line_count() // 2)
+        self.cursorPositionChanged.emit()
+        self._request_update()
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """
+        Overridden paintEvent which draws only lines in viewport.
+
+        Args:
+            event(QPaintEvent): qt event object with event data
+        """
+        if self._mapped_file is None:
+            return
+
+        painter = QPainter(self.viewport())
+        painter.fillRect(event.rect(), self.palette().base())
+        line_height = self.line_height()
+        width = self.viewport().width()
+        x_offset = -self.horizontalScrollBar().value() + 4
+
+        for line_number, top in self.visible_lines(event.rect()):
+            if line_number == self.current_line_number():
+                painter.fillRect(0, top, width, line_height, self.palette().alternateBase())
+            text = self.line_text(line_number - 1)
+            painter.drawText(QRect(x_offset, top, width - x_offset, line_height), Qt.AlignLeft, text)
+            self._longest_line_width = max(self._longest_line_width, self.fontMetrics().width(text))
+
+        painter.end()
+        self._update_horizontal_range()
+
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        """
+        Overridden mousePressEvent which changes current line.
+
+        Args:
+            event(QMouseEvent): qt event object with event data
+        """
+        line = self.first_visible_line() + event.pos().y() // self.line_height()
+        if line < self.line_count():
+            self._current_line = line
+            self.cursorPositionChanged.emit()
+            self._request_update()
+
+    def wheelEvent(self, event: QWheelEvent) -> None:
+        """
+        Overridden wheelEvent for zooming.
+
+        Args:
+            event(QWheelEvent): qt event object with event data
+        """
+        if event.modifiers() & Qt.ControlModifier:
+            font = self.font()
+            font.setPointSize(max(1, font.pointSize() + (1 if event.angleDelta().y() > 0 else -1)))
+            self.setFont(font)
+            self._update_vertical_range()
+            self._request_update()
+        else:
+            QAbstractScrollArea.wheelEvent(self, event)
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        """
+        Overridden resizeEvent which updates scroll bars.
+
+        Args:
+            event(QResizeEvent): qt event object with event data
+        """
+        QAbstractScrollArea.resizeEvent(self, event)
+        self._update_vertical_range()
+
+    def _lines_indexed(self, offsets: array) -> None:
+        """
+        Extend line index with new batch from indexer.
+        This method is called when lines_indexed signal of line indexer is emitted.
+
+        Args:
+            offsets(array): start offsets of new lines
+        """
+        if not offsets or self.sender() is not self._line_indexer:
+            return
+
+        self._line_offsets.extend(offsets)
+        self._update_vertical_range()
+        self.blockCountChanged.emit(self.line_count())
+        if self._pending_line is not None and self._pending_line < self.line_count():
+            self.go_to_line(self._pending_line + 1)
+        else:
+            self._request_update()
+
+    def _indexing_finished(self) -> None:
+        """
+        Drop finished indexer and jump to pending line if there is some.
+        This method is called when finished signal of line indexer is emitted.
+        """
+        if self.sender() is not self._line_indexer:
+            return  # indexer of closed file
+        self._line_indexer.deleteLater()
+        self._line_indexer = None
+        if self._pending_line is not None:
+            self.go_to_line(self._pending_line + 1)
+        self.indexing_finished.emit()
+
+    def _indexing_progress(self, progress: int) -> None:
+        """
+        Forward progress of current indexer.
+        This method is called when progress_changed signal of line indexer is emitted.
+
+        Args:
+            progress(int): progress in percent
+        """
+        if self.sender() is self._line_indexer:
+            self.indexing_progress.emit(progress)
+
+    def _scrolled(self, value: int) -> None:
+        """
+        Repaint viewport and notify line numbers about scrolled distance.
+
+        Args:
+            value(int): new value of vertical scroll bar
+        """
+        dy = (self._scroll_value - value) * self.line_height()
+        self._scroll_value = value
+        self.viewport().update()
+        self.updateRequest.emit(self.viewport().rect(), dy)
+
+    def _request_update(self) -> None:
+        """
+        Repaint viewport and notify listeners (LinesNumberBar).
+        """
+        self.viewport().update()
+        self.updateRequest.emit(self.viewport().rect(), 0)
+
+    def _update_vertical_range(self) -> None:
+        """
+        Set range of vertical scroll bar by count of indexed lines.
+        """
+        visible_lines = self.visible_line_count()
+        scroll_bar = self.verticalScrollBar()
+        scroll_bar.setRange(0, max(0, self.line_count() - visible_lines))
+        scroll_bar.setPageStep(visible_lines)
+
+    def _update_horizontal_range(self) -> None:
+        """
+        Set range of horizontal scroll bar by longest rendered line.
+        """
+        scroll_bar = self.horizontalScrollBar()
+        scroll_bar.setRange(0, max(0, self._longest_line_width - self.viewport().width() + 8))
+        scroll_bar.setPageStep(self.viewport().width())
@@ -1,11 +1,25 @@
+import os
+import typing
 
-from PyQt5.QtWidgets import QMainWindow, QFileDialog, QToolBar, QWidget, QHBoxLayout, QSpacerItem, QSizePolicy, QLabel
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QMainWindow, QFileDialog, QToolBar, QWidget, QHBoxLayout, QSpacerItem, QSizePolicy, QLabel, QAction, QInputDialog,
+    QDockWidget
+)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QCloseEvent, QPaintEvent, QTextCursor
 
 from pride.common.decorators import file_exception_handling, dir_exception_handling
+from pride.common.session import Session, load_session, save_session
+from pride.common.stall_detector import LATENCY_WINDOW, StallDetector
+from pride.common.startup_timeline import timeline
 from pride.dialogs.error_dialog import ErrorDialog
+from pride.widgets.find_symbol import FindSymbolDialog
+from pride.widgets.outline import OutlineWidget
+from pride.widgets.quick_open import QuickOpenDialog
+from pride.widgets.undo_inspector import UndoInspectorDialog
 from pride.UI.main_window_ui import Ui_MainWindow
 from pride.widgets import CentralIDEWidget
+from pride.widgets.code_editor import CodeEditorWidget
 
 
 #  TODO: presunout nekam do konfigurace
@@ -30,6 +44,12 @@ class StatusBarWidget(QWidget):
         self.line_and_column_label = QLabel(self)
         self.line_and_column_pattern = "line:{} column:{}"
 
+        self.latency_label = QLabel(self)
+        self.latency_label.setToolTip("Worst latency of event loop in last {:g} seconds".format(LATENCY_WINDOW))
+        self.latency_label.hide()  # shown when stall detector is running
+        self.latency_pattern = "latency:{:g} ms"
+
+        horizontal_layout.addWidget(self.latency_label)
         horizontal_layout.addWidget(self.line_and_column_label)
 
     def set_line_and_column(self, line: int, column: int) -> None:
@@ -42,42 +62,257 @@ class StatusBarWidget(QWidget):
         """
         self.line_and_column_label.setText(self.line_and_column_pattern.format(line, column))
 
+    def set_latency(self, latency: float) -> None:
+        """
+        Show worst recent latency of event loop.
+
+        Args:
+            latency(float): latency in milliseconds
+        """
+        self.latency_label.setText(self.latency_pattern.format(latency))
+        self.latency_label.show()
+
 
 class MainWindow(QMainWindow, Ui_MainWindow):
     """
     Main window class representing the main window of app.
+    Panels hidden at start are created after the first paint.
     """
+
+    initialized = pyqtSignal()
+
     def __init__(self, *args, **kwargs):
         QMainWindow.__init__(self, *args, **kwargs)
         globals()['global_objects_'] = dict()
-        self.setupUi(self)
+        with timeline.measure("setupUi"):
+            self.setupUi(self)
 
-        self.central_ide_widget = CentralIDEWidget(self)
-        self.code_editor = self.central_ide_widget.code_editor_widget
-        self.horizontal_layout.addWidget(self.central_ide_widget)
-        self.vertical_layout.addLayout(self.horizontal_layout)
+        with timeline.measure("CentralIDEWidget"):
+            self.central_ide_widget = CentralIDEWidget(self)
+            self.code_editor = self.central_ide_widget.code_editor_widget
+            self.horizontal_layout.addWidget(self.central_ide_widget)
+            self.vertical_layout.addLayout(self.horizontal_layout)
 
         self.bottom_tool_bar = QToolBar(self)
         self.bottom_tool_bar.setMovable(False)
         self.bottom_tool_bar.setAllowedAreas(Qt.BottomToolBarArea)
         self.addToolBar(Qt.BottomToolBarArea, self.bottom_tool_bar)
-        self.bottom_tool_bar.addAction("bottom tool bar")
 
-        self.statusbar_widget = StatusBarWidget(self.statusbar)
-        self.statusbar.addPermanentWidget(self.statusbar_widget, 1)
-        self.code_editor.set_new_cursor_position_function = self.statusbar_widget.set_line_and_column
+        self.actionSave_all = QAction("Save all", self)
+        self.actionSave_all.setShortcut("Ctrl+Alt+S")
+        self.menuFile.insertAction(self.actionExit, self.actionSave_all)
+
+        self.actionQuick_open = QAction("Quick open...", self)
+        self.actionQuick_open.setShortcut("Ctrl+P")
+        self.menuFile.insertAction(self.actionSave, self.actionQuick_open)
+
+        self.actionUndo_memory = QAction("Undo history memory...", self)
+        self.menuEdit.addAction(self.actionUndo_memory)
+        self.menuEdit.addSeparator()
+        self.undo_inspector_dialog = None
+
+        self.actionGo_to_line = QAction("Go to line...", self)
+        self.actionGo_to_line.setShortcut("Ctrl+G")
+        self.menuEdit.addAction(self.actionGo_to_line)
+
+        self.quick_open_dialog = None
+
+        self.actionGo_to_definition = QAction("Go to definition", self)
+        self.actionGo_to_definition.setShortcut("F12")
+        self.menuEdit.addAction(self.actionGo_to_definition)
+
+        self.actionFind_symbol = QAction("Find symbol...", self)
+        self.actionFind_symbol.setShortcut("Ctrl+T")
+        self.menuEdit.addAction(self.actionFind_symbol)
+
+        self.find_symbol_dialog = None
+
+        self.actionFind_in_files = QAction("Find in files...", self)
+        self.actionFind_in_files.setShortcut("Ctrl+Shift+F")
+        self.menuEdit.addAction(self.actionFind_in_files)
+
+        opened_files_widget = self.central_ide_widget.opened_files_widget
+        self.code_editor.save_pipeline.file_saved.connect(opened_files_widget.trigram_indexes.mark_dirty)
+        self.code_editor.file_watcher.files_changed.connect(opened_files_widget.trigram_indexes.mark_dirty_paths)
+        self.code_editor.save_pipeline.file_saved.connect(opened_files_widget.symbol_index.update_file)
+
+        with timeline.measure("OutlineWidget"):
+            self.outline_widget = OutlineWidget(self)
+            self.outline_dock = QDockWidget("Outline", self)
+            self.outline_dock.setWidget(self.outline_widget)
+            self.addDockWidget(Qt.RightDockWidgetArea, self.outline_dock)
+            self.menuEdit.addAction(self.outline_dock.toggleViewAction())
+            self.code_editor.tab_widget.currentChanged.connect(self.current_tab_changed)
+
+        self.actionRun.setShortcut("Shift+F10")
+        self.actionStop = QAction("Stop", self)
+        self.actionStop.setShortcut("Ctrl+F2")
+        self.actionStop.setEnabled(False)
+        self.menuRun.insertAction(self.actionDebug, self.actionStop)
+        self.top_tool_bar.insertAction(self.actionDebug, self.actionStop)
+
+        self.actionProfile = QAction("Profile", self)
+        self.menuRun.insertAction(self.actionStop, self.actionProfile)
+
+        self.code_editor.save_pipeline.file_saved.connect(self.run_saved_file)
+        self.code_editor.save_pipeline.save_failed.connect(self.cancel_run_after_save)
+        self._run_after_save = None
+
+        # hidden panels are created after the first paint by initialize_panels
+        self.find_in_files_widget = None
+        self.run_console_widget = None
+        self.profiler_widget = None
+        self._first_paint = True
+
+        # session is saved on exit only when it was restored by restore_session
+        self.session_path = None
+        self._session_directories = []
+
+        # opt-in watchdog of GUI thread started by start_stall_detector
+        self.stall_detector = None
+
+        with timeline.measure("StatusBarWidget"):
+            self.statusbar_widget = StatusBarWidget(self.statusbar)
+            self.statusbar.addPermanentWidget(self.statusbar_widget, 1)
+            self.code_editor.set_new_cursor_position_function = self.statusbar_widget.set_line_and_column
         self.trigger_menu_actions()
 
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """
+        Overridden paintEvent which schedules creation of hidden panels after the first paint.
+
+        Args:
+            event(QPaintEvent): qt event object with event data
+        """
+        QMainWindow.paintEvent(self, event)
+        if self._first_paint:
+            self._first_paint = False
+            timeline.mark("first paint")
+            QTimer.singleShot(0, self.initialize_panels)
+
+    def initialize_panels(self) -> None:
+        """
+        Create panels which aren't visible in the first frame. Actions using the panels
+        call this method too, so they work even before it is called by timer.
+        """
+        if self.run_console_widget is not None:
+            return
+
+        with timeline.measure("deferred panels"):
+            with timeline.measure("import panels"):
+                from pride.widgets.find_in_files import FindInFilesWidget
+                from pride.widgets.profiler import ProfilerWidget
+                from pride.widgets.run_console import RunConsoleWidget
+
+            opened_files_widget = self.central_ide_widget.opened_files_widget
+            with timeline.measure("FindInFilesWidget"):
+                self.find_in_files_widget = FindInFilesWidget(opened_files_widget.opened_directories,
+                                                              opened_files_widget.trigram_indexes)
+                self.find_in_files_widget.open_match.connect(self.open_match)
+                self.find_in_files_dock = QDockWidget("Find in files", self)
+                self.find_in_files_dock.setWidget(self.find_in_files_widget)
+                self.addDockWidget(Qt.BottomDockWidgetArea, self.find_in_files_dock)
+                self.find_in_files_dock.hide()
+
+            with timeline.measure("RunConsoleWidget"):
+                self.run_console_widget = RunConsoleWidget(self)
+                self.run_console_widget.running_changed.connect(self.actionStop.setEnabled)
+                self.run_console_dock = QDockWidget("Run", self)
+                self.run_console_dock.setWidget(self.run_console_widget)
+                self.addDockWidget(Qt.BottomDockWidgetArea, self.run_console_dock)
+                self.run_console_dock.hide()
+
+            with timeline.measure("ProfilerWidget"):
+                self.profiler_widget = ProfilerWidget(self.run_console_widget, self)
+                self.profiler_widget.open_location.connect(self.open_match)
+                self.profiler_widget.line_samples_changed.connect(self.show_line_heat)
+                self.profiler_dock = QDockWidget("Profile", self)
+                self.profiler_dock.setWidget(self.profiler_widget)
+                self.addDockWidget(Qt.BottomDockWidgetArea, self.profiler_dock)
+                self.profiler_dock.hide()
+
+            self.bottom_tool_bar.addAction(self.run_console_dock.toggleViewAction())
+            self.bottom_tool_bar.addAction(self.profiler_dock.toggleViewAction())
+            self.bottom_tool_bar.addAction(self.find_in_files_dock.toggleViewAction())
+
+        with timeline.measure("session directories"):
+            self._open_session_directories()
+
+        timeline.mark("initialized")
+        timeline.write()
+        self.initialized.emit()
+
+    def restore_session(self, session_path: str) -> None:
+        """
+        Restore tabs, directories and splitter sizes of saved session, the session is saved
+        to the same file on exit. Only file of current tab is read, directories are opened
+        after the first paint and their trees are scanned in background.
+
+        Args:
+            session_path(str): path of session file
+        """
+        self.session_path = session_path
+        session = load_session(session_path)
+        if session is None:
+            return
+
+        if session.splitter_sizes:
+            self.central_ide_widget.splitter.setSizes(session.splitter_sizes)
+        self.code_editor.restore_tabs(session.tabs, session.current_tab)
+        self._session_directories = [dir_path for dir_path in session.directories if os.path.isdir(dir_path)]
+        if self.run_console_widget is not None:
+            self._open_session_directories()
+
+    def start_stall_detector(self, threshold: float, log_path: typing.Optional[str]) -> None:
+        """
+        Start watchdog which logs stalls of GUI thread and shows latency of event loop in status bar.
+
+        Args:
+            threshold(float): latency which is logged as stall (ms)
+            log_path(typing.Optional[str]): path of stall log, stalls aren't logged if None
+        """
+        if self.stall_detector is None:
+            self.stall_detector = StallDetector(threshold, log_path, self)
+            self.stall_detector.latency_changed.connect(self.statusbar_widget.set_latency)
+            self.stall_detector.stall_detected.connect(self.stall_detected)
+            self.stall_detector.start()
+
+    def stall_detected(self, record: dict) -> None:
+        """
+        Show function which blocked GUI thread.
+        This method is called when stall_detected signal of stall detector is emitted.
+
+        Args:
+            record(dict): logged stall
+        """
+        location = ""
+        if record["stack"]:
+            frame = record["stack"][-1]
+            location = " in {} ({}:{})".format(frame["function"], os.path.basename(frame["path"]), frame["line"])
+        self.statusbar.showMessage("GUI was blocked for {:.0f} ms{}".format(record["duration"], location), 5000)
+
     def trigger_menu_actions(self) -> None:
         """
         Trigger all actions in menu
         """
         self.actionNew.triggered.connect(self.new_file)
+        self.actionUndo.triggered.connect(self.undo)
+        self.actionRedo.triggered.connect(self.redo)
+        self.actionUndo_memory.triggered.connect(self.show_undo_memory)
         self.actionOpen.triggered.connect(self.open_file)
         self.actionOpen_folder.triggered.connect(self.open_dir)
+        self.actionQuick_open.triggered.connect(self.quick_open)
         self.actionSave.triggered.connect(self.save_file)
         self.actionSave_as.triggered.connect(self.save_file_as)
+        self.actionSave_all.triggered.connect(self.save_all)
         self.actionExit.triggered.connect(self.exit_application)
+        self.actionGo_to_line.triggered.connect(self.go_to_line)
+        self.actionFind_in_files.triggered.connect(self.find_in_files)
+        self.actionGo_to_definition.triggered.connect(self.go_to_definition)
+        self.actionFind_symbol.triggered.connect(self.find_symbol)
+        self.actionRun.triggered.connect(self.run_file)
+        self.actionProfile.triggered.connect(self.profile_file)
+        self.actionStop.triggered.connect(self.stop_file)
 
     def new_file(self) -> None:
         """
@@ -85,6 +320,32 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         self.code_editor.new_file()
 
+    def undo(self) -> None:
+        """
+        Undo the last change in active tab.
+        """
+        current_widget = self.code_editor.get_current_widget()
+        if current_widget is not None and not current_widget.read_only:
+            current_widget.undo()
+
+    def redo(self) -> None:
+        """
+        Redo the last undone change in active tab.
+        """
+        current_widget = self.code_editor.get_current_widget()
+        if current_widget is not None and not current_widget.read_only:
+            current_widget.redo()
+
+    def show_undo_memory(self) -> None:
+        """
+        Show dialog with memory used by undo history of tabs.
+        """
+        if self.undo_inspector_dialog is None:
+            self.undo_inspector_dialog = UndoInspectorDialog(self.code_editor, parent=self)
+
+        self.undo_inspector_dialog.show()
+        self.undo_inspector_dialog.raise_()
+
     @file_exception_handling
     def open_file(self, *_) -> None:
         """
@@ -109,6 +370,18 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
         self.central_ide_widget.open_dir(dir_path)
 
+    def quick_open(self) -> None:
+        """
+        Show dialog which finds files of opened directories by name.
+        """
+        if self.quick_open_dialog is None:
+            self.quick_open_dialog = QuickOpenDialog(self.central_ide_widget.opened_files_widget.path_index, self)
+            self.quick_open_dialog.file_selected.connect(self.central_ide_widget.open_file)
+
+        self.quick_open_dialog.show()
+        self.quick_open_dialog.raise_()
+        self.quick_open_dialog.activateWindow()
+
     def save_file(self) -> None:
         """
         Save file in active tab.
@@ -145,8 +418,218 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         except Exception:
             ErrorDialog("Unknown error", "Can't save this file: unknown error", self).show()
 
+    def save_all(self) -> None:
+        """
+        Save all modified files.
+        """
+        self.code_editor.save_all()
+
+    def go_to_line(self) -> None:
+        """
+        Ask for line number and scroll active tab to it.
+        """
+        if not self.code_editor.opened_tabs:
+            return
+
+        line_number, ok = QInputDialog.getInt(self, "Go to line", "Line:", 1, 1)
+
+        if not ok:
+            return
+
+        self.code_editor.go_to_line(line_number)
+
+    def find_in_files(self) -> None:
+        """
+        Show find in files panel and focus its query.
+        """
+        self.initialize_panels()
+        self.find_in_files_dock.show()
+        self.find_in_files_widget.query_edit.setFocus()
+        self.find_in_files_widget.query_edit.selectAll()
+
+    def find_symbol(self) -> None:
+        """
+        Show dialog which finds symbols of opened directories by name.
+        """
+        if self.find_symbol_dialog is None:
+            self.find_symbol_dialog = FindSymbolDialog(self.central_ide_widget.opened_files_widget.symbol_index, self)
+            self.find_symbol_dialog.symbol_selected.connect(self.open_match)
+
+        self.find_symbol_dialog.show()
+        self.find_symbol_dialog.raise_()
+        self.find_symbol_dialog.activateWindow()
+
+    def go_to_definition(self) -> None:
+        """
+        Open definition of name under cursor. When there are more definitions,
+        they are offered in find symbol dialog.
+        """
+        current_widget = self.code_editor.get_current_widget()
+        if not isinstance(current_widget, CodeEditorWidget):
+            return
+
+        cursor = current_widget.get_cursor()
+        cursor.select(QTextCursor.WordUnderCursor)
+        name = cursor.selectedText()
+        if not name.isidentifier():
+            return
+
+        definitions = self.central_ide_widget.opened_files_widget.symbol_index.definitions(name)
+        if len(definitions) == 1:
+            self.open_match(definitions[0].path, definitions[0].line)
+        elif definitions:
+            self.find_symbol()
+            self.find_symbol_dialog.set_query(name)
+        else:
+            self.statusbar.showMessage("No definition of {} found".format(name), 3000)
+
+    def run_file(self) -> None:
+        """
+        Run file in active tab.
+        """
+        self.initialize_panels()
+        self.run_console_dock.show()
+        self._start_current_file(self.run_console_widget.run)
+
+    def stop_file(self) -> None:
+        """
+        Stop running or profiled file.
+        """
+        if self.run_console_widget is not None:
+            self.run_console_widget.stop()
+
+    def profile_file(self) -> None:
+        """
+        Profile file in active tab.
+        """
+        self.initialize_panels()
+        self.run_console_dock.show()
+        self.profiler_dock.show()
+        self.profiler_dock.raise_()
+        self._start_current_file(self.profiler_widget.profile)
+
+    def run_saved_file(self, file_path: str) -> None:
+        """
+        Run file which was saved before running.
+        This method is called when file_saved signal of SavePipeline is emitted.
+
+        Args:
+            file_path(str): file path
+        """
+        if self._run_after_save is not None and file_path == self._run_after_save[0]:
+            _, start = self._run_after_save
+            self._run_after_save = None
+            start(file_path)
+
+    def cancel_run_after_save(self, file_path: str, error: Exception) -> None:
+        """
+        Don't run file which couldn't be saved.
+        This method is called when save_failed signal of SavePipeline is emitted.
+
+        Args:
+            file_path(str): file path
+            error(Exception): raised exception
+        """
+        if self._run_after_save is not None and file_path == self._run_after_save[0]:
+            self._run_after_save = None
+
+    def show_line_heat(self) -> None:
+        """
+        Show sampled cost of lines of profiled file in gutter of active editor.
+        """
+        current_widget = self.code_editor.get_current_widget()
+        if self.profiler_widget is not None and isinstance(current_widget, CodeEditorWidget):
+            current_widget.set_line_heat(self.profiler_widget.line_heat(current_widget.opened_file))
+
+    def current_tab_changed(self) -> None:
+        """
+        Show outline of editor in new active tab.
+        This method is called when currentChanged signal of tab widget is emitted.
+        """
+        self.outline_widget.set_editor(self.code_editor.get_current_widget())
+        self.show_line_heat()
+
+    def open_match(self, file_path: str, line_number: int) -> None:
+        """
+        Open file of find in files match or symbol and go to its line.
+
+        Args:
+            file_path(str): file path
+            line_number(int): one based line number
+        """
+        self.central_ide_widget.open_file(file_path)
+        if self.code_editor.get_current_file() == self.code_editor.document_registry.normalize(file_path):
+            self.code_editor.go_to_line(line_number)
+
     def exit_application(self) -> None:
         """
         Close app
         """
         self.close()
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        """
+        Overridden closeEvent which waits for files being saved and journals being written.
+        Journals of unsaved changes are kept, so the changes are offered for recovery on next start.
+
+        Args:
+            event(QCloseEvent): qt event object with event data
+        """
+        if self.stall_detector is not None:
+            self.stall_detector.stop()
+        self.code_editor.save_pipeline.wait_for_done()
+        self.code_editor.journal_writer.shutdown()
+        if self.session_path is not None:
+            self._save_session()
+        if self.run_console_widget is not None:
+            self.run_console_widget.shutdown()
+            self.profiler_widget.shutdown()
+            self.find_in_files_widget.shutdown()
+        self.central_ide_widget.opened_files_widget.trigram_indexes.shutdown()
+        self.central_ide_widget.opened_files_widget.symbol_index.shutdown()
+        QMainWindow.closeEvent(self, event)
+
+    def _start_current_file(self, start: typing.Callable[[str], None]) -> None:
+        """
+        Start file in active tab. Modified file is saved first and started when it is written,
+        it isn't started when the save is refused or declined.
+
+        Args:
+            start(typing.Callable[[str], None]): function which starts file path
+        """
+        current_widget = self.code_editor.get_current_widget()
+        if current_widget is None:
+            return
+        if not current_widget.file_saved:
+            ErrorDialog("Run error", "Save this file before running it", self).show()
+            return
+
+        if current_widget.is_modified() and not current_widget.read_only:
+            self._run_after_save = (current_widget.opened_file, start)
+            if not self.code_editor.save_file():
+                self._run_after_save = None
+        else:
+            self._run_after_save = None
+            start(current_widget.opened_file)
+
+    def _open_session_directories(self) -> None:
+        """
+        Open directories of restored session.
+        """
+        for dir_path in self._session_directories:
+            self.central_ide_widget.open_dir(dir_path)
+        self._session_directories = []
+
+    def _save_session(self) -> None:
+        """
+        Save tabs, opened directories and splitter sizes to session file.
+        Exit isn't stopped when the session can't be written.
+        """
+        tabs, current_tab = self.code_editor.session_tabs()
+        directories = sorted(self.central_ide_widget.opened_files_widget.opened_directories)
+        session = Session(tabs, current_tab, directories + self._session_directories,
+                          self.central_ide_widget.splitter.sizes())
+        try:
+            save_session(self.session_path, session)
+        except OSError:
+            pass
@@ -1,71 +1,117 @@
 import os
 
-from PyQt5.QtWidgets import QWidget, QListWidgetItem, QTreeWidgetItem
-from PyQt5.QtCore import QSize, pyqtSignal
-
-from pride.UI.item_widget_ui import Ui_ItemWidget
+from PyQt5.QtWidgets import QWidget, QStyledItemDelegate, QStyleOptionViewItem, QStyle, QApplication
+from PyQt5.QtCore import Qt, QSize, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor, QFont
+
+from pride.common.document_registry import DocumentRegistry
+from pride.common.path_index import PathIndex
+from pride.common.symbol_index import SymbolIndex
+from pride.common.trigram_index import TrigramIndexes
 from pride.UI.opened_files_widget_ui import Ui_OpenedFilesWidget
+from pride.widgets.file_list_model import FileListModel
+from pride.widgets.file_tree_model import FileTreeModel, PATH_ROLE
 
 
-class FileItem(QListWidgetItem):
-    def __init__(self, path, parent=None):
-        QListWidgetItem.__init__(self, parent)
-        self.path = path
+class PathItemDelegate(QStyledItemDelegate):
+    """
+    Delegate which paints file name followed by smaller grey file path.
+    """
 
+    def __init__(self, parent=None):
+        QStyledItemDelegate.__init__(self, parent)
+        self.path_color = QColor(136, 138, 133)
 
-class TreeItem(QTreeWidgetItem):
-    def __init__(self, tree, strings=None, path=None):
-        QTreeWidgetItem.__init__(self, tree, strings)
-        self.path = path
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        """
+        Overridden paint method of QStyledItemDelegate.
 
+        Args:
+            painter(QPainter): painter of view
+            option(QStyleOptionViewItem): style options of item
+            index(QModelIndex): painted index
+        """
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, option.widget)
+
+        name = index.data(Qt.DisplayRole)
+        rect = option.rect.adjusted(4, 0, -2, 0)
+        selected = option.state & QStyle.State_Selected
+
+        painter.save()
+        painter.setFont(option.font)
+        painter.setPen(option.palette.highlightedText().color() if selected else option.palette.text().color())
+        painter.drawText(rect, Qt.AlignLeft | Qt.AlignVCenter, name)
+
+        path_font = QFont(option.font)
+        path_font.setPointSize(8)
+        rect.setLeft(rect.left() + option.fontMetrics.width(name) + 6)
+        painter.setFont(path_font)
+        painter.setPen(self.path_color)
+        painter.drawText(rect, Qt.AlignLeft | Qt.AlignVCenter, index.data(PATH_ROLE))
+        painter.restore()
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        """
+        Overridden sizeHint method of QStyledItemDelegate.
 
-class ItemWidget(QWidget, Ui_ItemWidget):
-    def __init__(self, file_name, file_path, parent=None):
-        QWidget.__init__(self, parent)
-        self.setupUi(self)
+        Args:
+            option(QStyleOptionViewItem): style options of item
+            index(QModelIndex): index of item
 
-        self.file_name.setText(file_name)
-        self.file_path.setText(file_path)
+        Returns:
+            QSize: size of item
+        """
+        return QSize(0, 25)
 
 
 class OpenedFilesWidget(QWidget, Ui_OpenedFilesWidget):
 
     open_file_on_double_click = pyqtSignal(str)
 
-    def __init__(self, parent=None):
+    def __init__(self, document_registry: DocumentRegistry = None, parent=None):
         QWidget.__init__(self, parent)
         self.setupUi(self)
 
-        self.tree_widget.itemDoubleClicked.connect(self.item_double_clicked)
-        self.list_widget.itemDoubleClicked.connect(self.item_double_clicked)
+        self.document_registry = document_registry if document_registry is not None else DocumentRegistry(parent=self)
+        self.document_registry.document_opened.connect(self.add_file)
+        self.document_registry.document_closed.connect(self.remove_file)
+        self.document_registry.document_activated.connect(self.change_current_active_file)
+
+        self.tree_model = FileTreeModel(self)
+        self.tree_view.setModel(self.tree_model)
+
+        self.list_model = FileListModel(self)
+        self.list_view.setModel(self.list_model)
+        self.list_view.setItemDelegate(PathItemDelegate(self.list_view))
+        self.list_view.setUniformItemSizes(True)
+
+        self.tree_view.doubleClicked.connect(self.index_double_clicked)
+        self.list_view.doubleClicked.connect(self.index_double_clicked)
 
         self.opened_directories = set()
+        self.path_index = PathIndex(self)
+        self.trigram_indexes = TrigramIndexes(parent=self)
+        self.tree_model.watcher.directories_changed.connect(self.trigram_indexes.mark_dirty_paths)
+        self.symbol_index = SymbolIndex(self)
 
     def add_file(self, path: str) -> None:
         """
-        Add new file to the list widget
+        Add new file to the list
 
         Args:
             path(str): file path
         """
-        item = FileItem(path)
-        item.setSizeHint(QSize(0, 25))
-        self.list_widget.addItem(item)
-        self.list_widget.setItemWidget(item, ItemWidget(os.path.basename(path), path))
-        self.change_current_row(self.list_widget.count() - 1)
+        self.change_current_row(self.list_model.add_path(path))
 
     def remove_file(self, path: str) -> None:
         """
-        Remove file from list widget
+        Remove file from list
 
         Args:
             path(str): file path
         """
-        for idx in range(self.list_widget.count()):
-            item = self.list_widget.item(idx)
-            if item and item.path == path:
-                self.list_widget.takeItem(idx)
-                break
+        self.list_model.remove_path(path)
 
     def change_current_active_file(self, file_path):
         """
@@ -74,11 +120,9 @@ class OpenedFilesWidget(QWidget, Ui_OpenedFilesWidget):
         Args:
             file_path(str): file path
         """
-        for idx in range(self.list_widget.count()):
-            item = self.list_widget.item(idx)
-            if item and item.path == file_path:
-                self.change_current_row(idx)
-                break
+        row = self.list_model.row_of(file_path)
+        if row is not None:
+            self.change_current_row(row)
 
     def change_current_row(self, idx: int) -> None:
         """
@@ -87,42 +131,33 @@ class OpenedFilesWidget(QWidget, Ui_OpenedFilesWidget):
         Args:
             idx(int): index of row
         """
-        self.list_widget.setCurrentRow(idx)
+        self.list_view.setCurrentIndex(self.list_model.index(idx))
 
     def open_dir(self, dir_path: str) -> None:
         """
-        Add parent dir to tree and add subdirs.
+        Add parent dir to tree. Its content is scanned in background.
+        Trigram index of the directory is updated also when it is opened again.
 
         Args:
             dir_path(str): base dir path
         """
+        self.trigram_indexes.update(dir_path)
         if dir_path in self.opened_directories:
             # TODO: set new current dir
             return
 
         self.opened_directories.add(dir_path)
-        parent_folder = TreeItem(self.tree_widget)
-        self.tree_widget.setItemWidget(parent_folder, 0, ItemWidget(os.path.basename(dir_path), dir_path))
-        self._add_dirs(dir_path, parent_folder)
-        print("sorting")
+        self.tree_view.expand(self.tree_model.add_root(dir_path))
+        self.path_index.add_root(dir_path)
+        self.symbol_index.add_root(dir_path)
 
-    def _add_dirs(self, path: str, tree: QTreeWidgetItem) -> None:
+    def index_double_clicked(self, index: QModelIndex) -> None:
         """
-        Add dirs/files to tree.
-        If path is dir call this function recursive.
+        Open double clicked file from tree or list.
 
         Args:
-            path(str): base path
-            tree(QTreeWidgetItem): tree or subtree
+            index(QModelIndex): double clicked index
         """
-        for element in os.scandir(path):
-            parent_item = TreeItem(tree, [os.path.basename(element)], element.path)
-
-            if element.is_dir():
-                self._add_dirs(element.path, parent_item)
-
-    def item_double_clicked(self, item):
-        if item.path and not os.path.isdir(item.path):
-            self.open_file_on_double_click.emit(item.path)
-
-
+        path = index.data(PATH_ROLE)
+        if path and not os.path.isdir(path):
+            self.open_file_on_double_click.emit(path)
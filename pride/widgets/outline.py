@@ -0,0 +1,202 @@
+import collections
+import typing
+
+from PyQt5.QtCore import Qt, QThreadPool, QTimer
+from PyQt5.QtWidgets import QTreeWidget, QTreeWidgetItem, QVBoxLayout, QWidget
+
+from pride.common.outline import OutlineNode, parse_outline
+from pride.common.symbol_index import PYTHON_EXTENSIONS
+from pride.common.workers import Worker
+from pride.widgets.code_editor import CodeEditorWidget
+
+
+#  pause in typing after which outline is parsed again (ms)
+PARSE_DELAY = 500
+
+#  data role returning first and last line of item
+RANGE_ROLE = Qt.UserRole + 1
+
+
+class OutlineWidget(QWidget):
+    """
+    Panel with classes and functions of python file in active editor.
+    Text is parsed in thread pool after pause in typing, result is dropped
+    if the document changed meanwhile. Only changed items of the tree are
+    replaced, so expansion and scroll position are kept.
+    """
+
+    def __init__(self, parent=None):
+        QWidget.__init__(self, parent)
+        self.tree_widget = QTreeWidget(self)
+        self.tree_widget.setHeaderHidden(True)
+        self.tree_widget.itemClicked.connect(self.item_clicked)
+        self.tree_widget.itemActivated.connect(self.item_clicked)
+
+        vertical_layout = QVBoxLayout(self)
+        vertical_layout.setContentsMargins(0, 0, 0, 0)
+        vertical_layout.addWidget(self.tree_widget)
+
+        self.editor = None
+        self._revision = 0
+        self._parsing = None
+
+        self._parse_timer = QTimer(self)
+        self._parse_timer.setSingleShot(True)
+        self._parse_timer.setInterval(PARSE_DELAY)
+        self._parse_timer.timeout.connect(self.parse)
+
+    def set_editor(self, editor: typing.Optional[QWidget]) -> None:
+        """
+        Show outline of another editor. Only CodeEditorWidget with python file has outline.
+
+        Args:
+            editor(typing.Optional[QWidget]): editor widget of active tab
+        """
+        if editor is self.editor:
+            return
+        if self.editor is not None:
+            self.editor.get_document().contentsChanged.disconnect(self.contents_changed)
+            self.editor.change_cursor_position.disconnect(self.cursor_position_changed)
+            self.editor.destroyed.disconnect(self.editor_destroyed)
+
+        self.editor = editor if isinstance(editor, CodeEditorWidget) else None
+        self.tree_widget.clear()
+        self._parse_timer.stop()
+        self._revision += 1  # drop running parse of previous editor
+        if self.editor is None:
+            return
+
+        self.editor.get_document().contentsChanged.connect(self.contents_changed)
+        self.editor.change_cursor_position.connect(self.cursor_position_changed)
+        self.editor.destroyed.connect(self.editor_destroyed)
+        self.parse()
+
+    def contents_changed(self) -> None:
+        """
+        Postpone parsing until typing pauses.
+        This method is called when contentsChanged signal of document is emitted.
+        """
+        self._revision += 1
+        self._parse_timer.start()
+
+    def editor_destroyed(self) -> None:
+        """
+        Forget closed editor.
+        This method is called when destroyed signal of editor is emitted.
+        """
+        self.editor = None
+        self.tree_widget.clear()
+        self._parse_timer.stop()
+        self._revision += 1
+
+    def parse(self) -> None:
+        """
+        Parse snapshot of editor text in thread pool.
+        """
+        if self.editor is None or not (self.editor.opened_file or "").endswith(PYTHON_EXTENSIONS):
+            return
+        if self._parsing is not None:
+            self._parse_timer.start()  # one parse at once, try again later
+            return
+
+        revision = self._revision
+        worker = Worker(parse_outline, self.editor.get_plain_text())
+        worker.signals.finished.connect(lambda nodes: self._parsed(revision, nodes))
+        worker.signals.failed.connect(lambda error: self._parsed(revision, None))
+        self._parsing = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def item_clicked(self, item: QTreeWidgetItem) -> None:
+        """
+        Move cursor of editor to definition.
+        This method is called when item of tree is clicked or activated.
+
+        Args:
+            item(QTreeWidgetItem): clicked item
+        """
+        if self.editor is not None:
+            self.editor.go_to_line(item.data(0, RANGE_ROLE)[0])
+
+    def cursor_position_changed(self, line: int, column: int) -> None:
+        """
+        Select innermost definition containing the line.
+        This method is called when change_cursor_position signal of editor is emitted.
+
+        Args:
+            line(int): one based line number
+            column(int): one based column number
+        """
+        parent = self.tree_widget.invisibleRootItem()
+        enclosing = None
+        while True:
+            for row in range(parent.childCount()):
+                child = parent.child(row)
+                first, last = child.data(0, RANGE_ROLE)
+                if first <= line <= last:
+                    enclosing = parent = child
+                    break
+            else:
+                break
+
+        if enclosing is None:
+            self.tree_widget.clearSelection()
+        elif enclosing is not self.tree_widget.currentItem() or not enclosing.isSelected():
+            self.tree_widget.setCurrentItem(enclosing)
+
+    def _parsed(self, revision: int, nodes: typing.Optional[typing.Tuple[OutlineNode, ...]]) -> None:
+        """
+        Update tree by parsed outline. Result of old text or text with syntax error is dropped.
+
+        Args:
+            revision(int): revision of parsed text
+            nodes(typing.Optional[typing.Tuple[OutlineNode, ...]]): top level nodes or None
+        """
+        self._parsing = None
+        if revision != self._revision or nodes is None:
+            return
+        self._update_children(self.tree_widget.invisibleRootItem(), nodes)
+        if self.editor is not None:
+            self.cursor_position_changed(self.editor.get_cursor().blockNumber() + 1, 0)
+
+    def _update_children(self, parent: QTreeWidgetItem, nodes: typing.Tuple[OutlineNode, ...]) -> None:
+        """
+        Patch children of item to match nodes. Items are matched by kind and name in order,
+        removed definitions are taken out and new ones inserted, other items are kept.
+
+        Args:
+            parent(QTreeWidgetItem): parent item
+            nodes(typing.Tuple[OutlineNode, ...]): new child nodes
+        """
+        new_keys = collections.Counter((node.kind, node.name) for node in nodes)
+        old_keys = collections.Counter(parent.child(row).data(0, Qt.UserRole) for row in range(parent.childCount()))
+
+        row = 0
+        for node in nodes:
+            key = (node.kind, node.name)
+            while row < parent.childCount():
+                old_key = parent.child(row).data(0, Qt.UserRole)
+                if old_key == key or (new_keys[old_key] > 0 and old_keys[key] == 0):
+                    break
+                old_keys[old_key] -= 1
+                parent.takeChild(row)  # removed or moved definition
+
+            new_keys[key] -= 1
+            if row < parent.childCount() and parent.child(row).data(0, Qt.UserRole) == key:
+                item = parent.child(row)
+                old_keys[key] -= 1
+            else:
+                item = QTreeWidgetItem()
+                item.setText(0, node.name)
+                item.setToolTip(0, node.kind)
+                item.setData(0, Qt.UserRole, key)
+                parent.insertChild(row, item)
+            item.setData(0, RANGE_ROLE, (node.line, node.end_line))
+
+            new_item = item.childCount() == 0
+            self._update_children(item, node.children)
+            if new_item and item.childCount() and node.kind == "class":
+                item.setExpanded(True)
+            row += 1
+
+        while parent.childCount() > row:
+            parent.takeChild(row)
@@ -0,0 +1,247 @@
+import os
+import shutil
+import tempfile
+import typing
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QThreadPool, pyqtSignal
+from PyQt5.QtWidgets import QCheckBox, QHBoxLayout, QHeaderView, QLabel, QTableView, QVBoxLayout, QWidget
+
+from pride.common.profile_stats import (
+    PROFILE_RUNNER, FunctionStats, line_heat, load_line_samples, load_stats
+)
+from pride.common.workers import Worker
+from pride.widgets.run_console import RunConsoleWidget
+
+
+#  columns of stats table
+_COLUMNS = ("Function", "Location", "Calls", "Self time (ms)", "Cumulative time (ms)")
+#  attributes of FunctionStats shown in columns
+_COLUMN_KEYS = ("name", "path", "calls", "self_time", "cumulative_time")
+
+
+class ProfileStatsModel(QAbstractTableModel):
+    """
+    Sortable table of profiled functions.
+    """
+
+    def __init__(self, parent=None):
+        QAbstractTableModel.__init__(self, parent)
+        self._functions = []
+
+    def set_functions(self, functions: typing.List[FunctionStats]) -> None:
+        """
+        Replace all functions of table.
+
+        Args:
+            functions(typing.List[FunctionStats]): profiled functions
+        """
+        self.beginResetModel()
+        self._functions = list(functions)
+        self.endResetModel()
+
+    def function(self, index: QModelIndex) -> FunctionStats:
+        """
+        Args:
+            index(QModelIndex): index of row
+
+        Returns:
+            FunctionStats: function of row
+        """
+        return self._functions[index.row()]
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._functions)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(_COLUMNS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> typing.Any:
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return _COLUMNS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> typing.Any:
+        if not index.isValid():
+            return None
+        function = self._functions[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return function.name
+            if column == 1:
+                return "{}:{}".format(function.path, function.line)
+            if column == 2:
+                return function.calls
+            return "{:.3f}".format(getattr(function, _COLUMN_KEYS[column]) * 1000)
+        if role == Qt.TextAlignmentRole and column >= 2:
+            return Qt.AlignRight | Qt.AlignVCenter
+        if role == Qt.ToolTipRole and column == 1:
+            return function.path
+        return None
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder) -> None:
+        """
+        Overridden sort method of QAbstractTableModel.
+
+        Args:
+            column(int): sorted column
+            order(Qt.SortOrder): sort order
+        """
+        self.layoutAboutToBeChanged.emit()
+        key = _COLUMN_KEYS[column]
+        if key == "path":
+            self._functions.sort(key=lambda function: (function.path, function.line), reverse=order == Qt.DescendingOrder)
+        else:
+            self._functions.sort(key=lambda function: getattr(function, key), reverse=order == Qt.DescendingOrder)
+        self.layoutChanged.emit()
+
+
+class ProfilerWidget(QWidget):
+    """
+    Panel which profiles python file by cProfile in subprocess run by run console
+    and shows its functions by cumulative and self time. Lines can be sampled also,
+    their own cost is shown in gutter of editor. Sampling is off by default,
+    the sampling thread takes GIL every millisecond and distorts times of cProfile.
+    """
+
+    open_location = pyqtSignal(str, int)
+    line_samples_changed = pyqtSignal()
+
+    def __init__(self, run_console: RunConsoleWidget, parent=None):
+        QWidget.__init__(self, parent)
+        self.run_console = run_console
+        self.run_console.running_changed.connect(self.running_changed)
+
+        self.sample_lines_check_box = QCheckBox("Sample lines", self)
+        self.sample_lines_check_box.setToolTip("Sampling of lines makes times of functions less precise")
+        self.status_label = QLabel(self)
+
+        self.stats_model = ProfileStatsModel(self)
+        self.stats_view = QTableView(self)
+        self.stats_view.setModel(self.stats_model)
+        self.stats_view.setSortingEnabled(True)
+        self.stats_view.setSelectionBehavior(QTableView.SelectRows)
+        self.stats_view.verticalHeader().hide()
+        self.stats_view.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.stats_view.sortByColumn(4, Qt.DescendingOrder)
+        self.stats_view.clicked.connect(self.index_clicked)
+        self.stats_view.activated.connect(self.index_clicked)
+
+        options_layout = QHBoxLayout()
+        options_layout.addWidget(self.sample_lines_check_box)
+        options_layout.addWidget(self.status_label, 1)
+
+        vertical_layout = QVBoxLayout(self)
+        vertical_layout.setContentsMargins(0, 0, 0, 0)
+        vertical_layout.addLayout(options_layout)
+        vertical_layout.addWidget(self.stats_view)
+
+        self.line_samples = dict()
+        self._output_directory = None
+
+    def profile(self, file_path: str) -> None:
+        """
+        Run file under profiler in run console.
+
+        Args:
+            file_path(str): file path
+        """
+        self._remove_output()
+        output_directory = tempfile.mkdtemp(prefix="pride_profile_")
+        stats_path = os.path.join(output_directory, "stats")
+        samples_path = os.path.join(output_directory, "samples.json")
+        if not self.sample_lines_check_box.isChecked():
+            samples_path = "-"
+
+        self.status_label.setText("Profiling {}...".format(os.path.basename(file_path)))
+        self.run_console.run(file_path, [PROFILE_RUNNER, stats_path, samples_path, file_path])
+        self._output_directory = output_directory  # set after run, which stops previous process
+
+    def line_heat(self, file_path: typing.Optional[str]) -> typing.Dict[int, float]:
+        """
+        Return sampled cost of lines of file.
+
+        Args:
+            file_path(typing.Optional[str]): file path
+
+        Returns:
+            typing.Dict[int, float]: heat between 0 and 1 by one based line number
+        """
+        if not file_path:
+            return dict()
+        return line_heat(self.line_samples.get(os.path.realpath(file_path), dict()))
+
+    def running_changed(self, running: bool) -> None:
+        """
+        Load stats of finished profiling.
+        This method is called when running_changed signal of run console is emitted.
+
+        Args:
+            running(bool): process is running
+        """
+        if running or self._output_directory is None:
+            return
+
+        output_directory = self._output_directory
+        self._output_directory = None
+        worker = Worker(self._load, output_directory)
+        worker.signals.finished.connect(self._loaded)
+        worker.signals.failed.connect(lambda error: self.status_label.setText("Profile couldn't be loaded"))
+        QThreadPool.globalInstance().start(worker)
+
+    def index_clicked(self, index: QModelIndex) -> None:
+        """
+        Open location of function. Built-in functions have no location.
+        This method is called when row of stats table is clicked or activated.
+
+        Args:
+            index(QModelIndex): index of row
+        """
+        function = self.stats_model.function(index)
+        if os.path.isfile(function.path):
+            self.open_location.emit(function.path, function.line)
+
+    def shutdown(self) -> None:
+        """
+        Remove files of unfinished profiling. Used before exit.
+        """
+        self._remove_output()
+
+    @staticmethod
+    def _load(output_directory: str) -> tuple:
+        """
+        Load stats and line samples and remove their files. This method is called in thread pool.
+
+        Args:
+            output_directory(str): directory with output of profile runner
+
+        Returns:
+            tuple: functions and line samples
+        """
+        try:
+            return (load_stats(os.path.join(output_directory, "stats")),
+                    load_line_samples(os.path.join(output_directory, "samples.json")))
+        finally:
+            shutil.rmtree(output_directory, ignore_errors=True)
+
+    def _loaded(self, result: tuple) -> None:
+        """
+        Show loaded profile.
+
+        Args:
+            result(tuple): result of _load
+        """
+        functions, self.line_samples = result
+        self.stats_model.set_functions(functions)
+        header = self.stats_view.horizontalHeader()
+        self.stats_model.sort(header.sortIndicatorSection(), header.sortIndicatorOrder())
+        self.status_label.setText("{} functions".format(len(functions)))
+        self.line_samples_changed.emit()
+
+    def _remove_output(self) -> None:
+        """
+        Remove output directory of running profiling, its result isn't loaded.
+        """
+        if self._output_directory is not None:
+            shutil.rmtree(self._output_directory, ignore_errors=True)
+            self._output_directory = None
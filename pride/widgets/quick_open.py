@@ -0,0 +1,134 @@
+import time
+
+from PyQt5.QtCore import Qt, QEvent, QObject, QModelIndex, QTimer, pyqtSignal
+from PyQt5.QtGui import QShowEvent
+from PyQt5.QtWidgets import QDialog, QLineEdit, QListView, QVBoxLayout
+
+from pride.common.path_index import PathIndex
+from pride.widgets.file_list_model import FileListModel
+from pride.widgets.file_tree_model import PATH_ROLE
+from pride.widgets.opened_files import PathItemDelegate
+
+
+#  time which can be spent by matching in one event loop iteration (s)
+MATCH_TIME_BUDGET = 0.008
+
+#  keys of query line which move selection in list of results
+_LIST_KEYS = (Qt.Key_Up, Qt.Key_Down, Qt.Key_PageUp, Qt.Key_PageDown)
+
+
+class QuickOpenDialog(QDialog):
+    """
+    Dialog which finds files of opened directories by fuzzy match of typed query.
+    Query is matched in time slices, so results are shown while typing.
+    """
+
+    file_selected = pyqtSignal(str)
+
+    def __init__(self, path_index: PathIndex, parent=None):
+        QDialog.__init__(self, parent)
+        self.setWindowTitle("Quick open")
+        self.resize(700, 400)
+
+        self.path_index = path_index
+        self.path_index.index_changed.connect(self.index_changed)
+
+        self.query_edit = QLineEdit(self)
+        self.query_edit.setPlaceholderText("File name")
+        self.query_edit.installEventFilter(self)
+        self.query_edit.textChanged.connect(self.query_changed)
+        self.query_edit.returnPressed.connect(self.open_current)
+
+        self.list_model = FileListModel(self)
+        self.list_view = QListView(self)
+        self.list_view.setModel(self.list_model)
+        self.list_view.setItemDelegate(PathItemDelegate(self.list_view))
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setFocusPolicy(Qt.NoFocus)
+        self.list_view.activated.connect(self.open_index)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.query_edit)
+        layout.addWidget(self.list_view)
+
+        self._matcher = None
+        self._match_timer = QTimer(self)
+        self._match_timer.setInterval(0)
+        self._match_timer.timeout.connect(self._match_next)
+
+    def showEvent(self, event: QShowEvent) -> None:
+        """
+        Overridden showEvent which refreshes old indexes and selects previous query.
+
+        Args:
+            event(QShowEvent): qt event object with event data
+        """
+        self.path_index.refresh()
+        self.query_edit.selectAll()
+        self.query_edit.setFocus()
+        QDialog.showEvent(self, event)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        """
+        Forward keys moving selection from query line to list of results.
+
+        Args:
+            watched(QObject): object which got the event
+            event(QEvent): qt event object with event data
+
+        Returns:
+            bool: True if event was handled
+        """
+        if watched is self.query_edit and event.type() == QEvent.KeyPress and event.key() in _LIST_KEYS:
+            self.list_view.keyPressEvent(event)
+            return True
+        return QDialog.eventFilter(self, watched, event)
+
+    def query_changed(self, text: str) -> None:
+        """
+        Start matching of new query. Results of previous query are reused if it is prefix of the new one.
+        This method is called when text of query line is changed.
+
+        Args:
+            text(str): new query
+        """
+        self._matcher = self.path_index.match(text.strip(), self._matcher)
+        self._match_next()
+
+    def index_changed(self) -> None:
+        """
+        Match query again in new index.
+        This method is called when index_changed signal of path index is emitted.
+        """
+        self._matcher = None
+        self.query_changed(self.query_edit.text())
+
+    def open_current(self) -> None:
+        """
+        Open selected result.
+        """
+        self.open_index(self.list_view.currentIndex())
+
+    def open_index(self, index: QModelIndex) -> None:
+        """
+        Emit path of result and close dialog.
+
+        Args:
+            index(QModelIndex): index of result
+        """
+        if not index.isValid():
+            return
+        self.file_selected.emit(index.data(PATH_ROLE))
+        self.accept()
+
+    def _match_next(self) -> None:
+        """
+        Match next slice of candidates and show current best results.
+        """
+        finished = self._matcher.advance(time.perf_counter() + MATCH_TIME_BUDGET)
+        self.list_model.set_paths(self._matcher.results())
+        self.list_view.setCurrentIndex(self.list_model.index(0))
+        if finished:
+            self._match_timer.stop()
+        else:
+            self._match_timer.start()
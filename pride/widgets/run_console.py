@@ -0,0 +1,256 @@
+import codecs
+import os
+import sys
+import typing
+
+from PyQt5.QtCore import QProcess, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QTextCharFormat, QTextCursor
+from PyQt5.QtWidgets import QPlainTextEdit, QVBoxLayout, QWidget
+
+
+#  count of lines kept in console, older lines are dropped
+MAX_OUTPUT_LINES = 10000
+#  how often received output is appended to console (ms)
+FLUSH_INTERVAL = 50
+#  received output waiting for flush is cut to this count of characters, older part is dropped
+MAX_PENDING_OUTPUT = 1024 * 1024
+#  time given to process to exit after stop before it is killed (ms)
+KILL_TIMEOUT = 2000
+
+
+class RunConsoleWidget(QWidget):
+    """
+    Panel which runs python file in subprocess and shows its output.
+    Output is read asynchronously and appended in batches by timer.
+    Console keeps only last MAX_OUTPUT_LINES lines, so long output
+    neither blocks the GUI nor grows memory without bound.
+    """
+
+    running_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        QWidget.__init__(self, parent)
+        self.output_edit = QPlainTextEdit(self)
+        self.output_edit.setReadOnly(True)
+        self.output_edit.setUndoRedoEnabled(False)
+        self.output_edit.setMaximumBlockCount(MAX_OUTPUT_LINES)
+        self.output_edit.setFont(QFont("monospace"))
+
+        vertical_layout = QVBoxLayout(self)
+        vertical_layout.setContentsMargins(0, 0, 0, 0)
+        vertical_layout.addWidget(self.output_edit)
+
+        self._output_format = QTextCharFormat()
+        self._error_format = QTextCharFormat()
+        self._error_format.setForeground(QColor("#cc0000"))
+        self._info_format = QTextCharFormat()
+        self._info_format.setForeground(QColor(136, 138, 133))
+
+        self._pending = []  # received texts with flag of error output
+        self._decoders = dict()  # characters can be split between reads
+        self._pending_length = 0
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(FLUSH_INTERVAL)
+        self._flush_timer.timeout.connect(self.flush)
+
+        self._kill_timer = QTimer(self)
+        self._kill_timer.setSingleShot(True)
+        self._kill_timer.setInterval(KILL_TIMEOUT)
+        self._kill_timer.timeout.connect(self._kill)
+
+        self.process = None
+
+    def is_running(self) -> bool:
+        """
+        Returns:
+            bool: True if some process is running
+        """
+        return self.process is not None
+
+    def run(self, file_path: str, arguments: typing.Optional[typing.List[str]] = None) -> None:
+        """
+        Run python file in its directory. Running process is killed first.
+
+        Args:
+            file_path(str): file path
+            arguments(typing.Optional[typing.List[str]]): arguments of interpreter running the file,
+                only the file if None
+        """
+        arguments = ["-u"] + (arguments or [file_path])  # unbuffered, so output comes as it is printed
+        if self.process is not None:
+            self._kill()
+
+        self.output_edit.clear()
+        self._decoders = {error: codecs.getincrementaldecoder("utf-8")(errors="replace") for error in (False, True)}
+        self._append([(" ".join([sys.executable] + arguments[1:]) + "\n", None)])
+
+        process = QProcess(self)
+        process.setWorkingDirectory(os.path.dirname(file_path))
+        process.readyReadStandardOutput.connect(self.standard_output_ready)
+        process.readyReadStandardError.connect(self.standard_error_ready)
+        process.finished.connect(self.process_finished)
+        process.errorOccurred.connect(self.process_error)
+        self.process = process
+        process.start(sys.executable, arguments)
+        self._flush_timer.start()
+        self.running_changed.emit(True)
+
+    def stop(self) -> None:
+        """
+        Ask process to terminate, it is killed if it doesn't exit in time.
+        """
+        if self.process is not None:
+            self.process.terminate()
+            self._kill_timer.start()
+
+    def shutdown(self) -> None:
+        """
+        Kill running process and wait until it exits. Used before exit.
+        """
+        process = self.process
+        if process is not None:
+            self._kill()
+            process.waitForFinished(KILL_TIMEOUT)
+
+    def standard_output_ready(self) -> None:
+        """
+        Buffer output of process.
+        This method is called when readyReadStandardOutput signal of process is emitted.
+        """
+        if self.sender() is self.process:
+            self._receive(bytes(self.process.readAllStandardOutput()), False)
+
+    def standard_error_ready(self) -> None:
+        """
+        Buffer error output of process.
+        This method is called when readyReadStandardError signal of process is emitted.
+        """
+        if self.sender() is self.process:
+            self._receive(bytes(self.process.readAllStandardError()), True)
+
+    def process_finished(self, exit_code: int, exit_status: QProcess.ExitStatus) -> None:
+        """
+        Show rest of output and exit code.
+        This method is called when finished signal of process is emitted.
+
+        Args:
+            exit_code(int): exit code of process
+            exit_status(QProcess.ExitStatus): normal exit or crash
+        """
+        if self.sender() is not self.process:
+            return
+        self.standard_output_ready()
+        self.standard_error_ready()
+        if exit_status == QProcess.CrashExit:
+            self._finish("\nProcess was stopped\n")
+        else:
+            self._finish("\nProcess finished with exit code {}\n".format(exit_code))
+
+    def process_error(self, error: QProcess.ProcessError) -> None:
+        """
+        Report process which couldn't be started.
+        This method is called when errorOccurred signal of process is emitted.
+
+        Args:
+            error(QProcess.ProcessError): type of error
+        """
+        if self.sender() is self.process and error == QProcess.FailedToStart:
+            self._finish("Process couldn't be started: {}\n".format(self.process.errorString()))
+
+    def flush(self) -> None:
+        """
+        Append buffered output to console at once.
+        This method is called when timeout signal of flush timer is emitted.
+        """
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = []
+        self._pending_length = 0
+
+        # lines which would be dropped by console right away aren't inserted at all
+        lines = 0
+        for idx in range(len(pending) - 1, -1, -1):
+            text, error = pending[idx]
+            lines += text.count("\n")
+            if lines > MAX_OUTPUT_LINES:
+                start = -1
+                for _ in range(lines - MAX_OUTPUT_LINES):
+                    start = text.index("\n", start + 1)
+                pending = [(text[start + 1:], error)] + pending[idx + 1:]
+                break
+        self._append(pending)
+
+    def _receive(self, data: bytes, error: bool) -> None:
+        """
+        Add output to buffer. When buffer is too long, its oldest part is dropped.
+
+        Args:
+            data(bytes): received output
+            error(bool): output is from standard error
+        """
+        text = self._decoders[error].decode(data)
+        if not text:
+            return
+        self._pending.append((text, error))
+        self._pending_length += len(text)
+        while self._pending_length > MAX_PENDING_OUTPUT and len(self._pending) > 1:
+            self._pending_length -= len(self._pending.pop(0)[0])
+        if self._pending_length > MAX_PENDING_OUTPUT:
+            text, error = self._pending[0]
+            self._pending[0] = (text[-MAX_PENDING_OUTPUT:], error)
+            self._pending_length = MAX_PENDING_OUTPUT
+
+    def _append(self, texts: typing.List[typing.Tuple[str, typing.Optional[bool]]]) -> None:
+        """
+        Insert texts at the end of console and scroll to them if the end was visible.
+
+        Args:
+            texts(typing.List[typing.Tuple[str, typing.Optional[bool]]]): texts with flag
+                of error output, None for messages of console
+        """
+        scroll_bar = self.output_edit.verticalScrollBar()
+        at_end = scroll_bar.value() == scroll_bar.maximum()
+
+        cursor = QTextCursor(self.output_edit.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        for text, error in texts:
+            if error is None:
+                text_format = self._info_format
+            else:
+                text_format = self._error_format if error else self._output_format
+            cursor.insertText(text.replace("\r\n", "\n"), text_format)
+        cursor.endEditBlock()
+
+        if at_end:
+            scroll_bar.setValue(scroll_bar.maximum())
+
+    def _finish(self, message: str) -> None:
+        """
+        Show rest of output and message and forget the process.
+        Process which is still running is deleted when it finishes,
+        QProcess deleted earlier would wait for it.
+
+        Args:
+            message(str): final message
+        """
+        self._flush_timer.stop()
+        self._kill_timer.stop()
+        self.flush()
+        self._append([(message, None)])
+        if self.process.state() == QProcess.NotRunning:
+            self.process.deleteLater()
+        else:
+            self.process.finished.connect(self.process.deleteLater)
+        self.process = None
+        self.running_changed.emit(False)
+
+    def _kill(self) -> None:
+        """
+        Kill process without waiting until it exits, so GUI isn't blocked.
+        """
+        if self.process is not None:
+            self.process.kill()
+            self._finish("\nProcess was killed\n")
@@ -0,0 +1,84 @@
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QHideEvent, QShowEvent
+from PyQt5.QtWidgets import QDialog, QHeaderView, QLabel, QTableWidget, QTableWidgetItem, QVBoxLayout
+
+from pride.common.undo_history import UndoBudget, undo_budget
+from pride.widgets.code_editor import CodeEditorTabWidget, CodeEditorWidget
+
+
+#  how often shown table is refreshed (ms)
+REFRESH_INTERVAL = 1000
+#  columns of table
+_COLUMNS = ("Tab", "Undo steps", "Redo steps", "History (KB)")
+
+
+class UndoInspectorDialog(QDialog):
+    """
+    Dialog which shows memory used by undo history of every tab and budgets of history.
+    """
+
+    def __init__(self, tab_widget: CodeEditorTabWidget, budget: UndoBudget = undo_budget, parent=None):
+        QDialog.__init__(self, parent)
+        self.setWindowTitle("Undo history memory")
+        self.resize(700, 300)
+        self.tab_widget = tab_widget
+        self.budget = budget
+
+        self.table = QTableWidget(0, len(_COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(_COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.total_label = QLabel(self)
+
+        vertical_layout = QVBoxLayout(self)
+        vertical_layout.addWidget(self.table)
+        vertical_layout.addWidget(self.total_label)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(REFRESH_INTERVAL)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+    def refresh(self) -> None:
+        """
+        Fill table by current histories of tabs.
+        This method is called when timeout signal of refresh timer is emitted.
+        """
+        tabs = self.tab_widget.tab_widget
+        self.table.setRowCount(tabs.count())
+        for idx in range(tabs.count()):
+            editor = tabs.widget(idx).editor
+            values = [tabs.tabText(idx), "", "", ""]
+            if isinstance(editor, CodeEditorWidget):
+                history = editor.undo_history
+                values[1:] = [history.undo_count(), history.redo_count(), "{:.1f}".format(history.memory / 1024)]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(idx, column, item)
+
+        self.total_label.setText("History of all tabs: {:.1f} KB of {:.0f} MB, limit of one tab: {:.0f} MB".format(
+            self.budget.memory / 1024, self.budget.global_budget / 1024 / 1024,
+            self.budget.document_budget / 1024 / 1024))
+
+    def showEvent(self, event: QShowEvent) -> None:
+        """
+        Overridden showEvent which starts refreshing of table.
+
+        Args:
+            event(QShowEvent): qt event object with event data
+        """
+        QDialog.showEvent(self, event)
+        self.refresh()
+        self._refresh_timer.start()
+
+    def hideEvent(self, event: QHideEvent) -> None:
+        """
+        Overridden hideEvent which stops refreshing of table.
+
+        Args:
+            event(QHideEvent): qt event object with event data
+        """
+        QDialog.hideEvent(self, event)
+        self._refresh_timer.stop()
@@ -0,0 +1,59 @@
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from pride.widgets.code_editor import CodeEditorWidget
+from pride.widgets.large_file_view import LargeFileView
+
+_application = QApplication.instance() or QApplication([])
+
+
+def wait_until(condition, timeout: float = 60.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "condition not met in time"
+        _application.processEvents()
+
+
+def process_events_for(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        _application.processEvents()
+
+
+def test_file_loaded_again_during_loading(tmp_path):
+    path = str(tmp_path / "big.txt")
+    with open(path, 'w') as f:
+        f.write("".join("line {}\n".format(i) for i in range(400000)))
+
+    editor = CodeEditorWidget()
+    editor.load_file(path)
+    process_events_for(0.02)
+    assert editor.loading
+    editor.load_file(path)
+    wait_until(lambda: not editor.loading)
+    process_events_for(0.1)  # late chunks of the first loader would be inserted now
+
+    assert editor.get_document().blockCount() == 400001
+    assert editor.get_plain_text() == open(path).read()
+    assert not editor.is_modified()
+
+
+def test_large_file_opened_again_during_indexing(tmp_path):
+    path = str(tmp_path / "big.log")
+    with open(path, 'w') as f:
+        f.write("".join("line {}\n".format(i) for i in range(1000000)))
+
+    view = LargeFileView()
+    view.open(path)
+    process_events_for(0.01)
+    assert view.is_indexing()
+    view.open(path)
+    wait_until(lambda: not view.is_indexing())
+    process_events_for(0.1)  # late batches of the first indexer would be added now
+
+    assert view.line_count() == 1000001
+    assert view.line_text(123456) == "line 123456"
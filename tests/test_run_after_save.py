@@ -0,0 +1,79 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PyQt5.QtWidgets import QApplication, QMessageBox
+
+from pride.widgets import code_editor as code_editor_module
+from pride.widgets.main_window import MainWindow
+
+from test_file_loading import process_events_for, wait_until
+
+_application = QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def window():
+    window = MainWindow()
+    window.initialize_panels()
+    yield window
+    window.close()
+    window.deleteLater()
+    process_events_for(0.05)
+
+
+def _open_modified_file_changed_on_disk(window, tmp_path):
+    path = str(tmp_path / "script.py")
+    with open(path, 'w') as f:
+        f.write("print(1)\n")
+    window.code_editor.open_file(path)
+    editor = window.code_editor.get_current_widget()
+    wait_until(lambda: not editor.loading)
+    editor.get_cursor().insertText("x = 1\n")
+    with open(path, 'w') as f:
+        f.write("print(2)  # written by other program\n")
+    os.utime(path, ns=(0, 10 ** 9))
+    return path
+
+
+def _answer(monkeypatch, answer):
+    monkeypatch.setattr(code_editor_module.QMessageBox, "question", lambda *args, **kwargs: answer)
+
+
+@pytest.mark.parametrize("entry_point, panel, start", [
+    ("run_file", "run_console_widget", "run"),
+    ("profile_file", "profiler_widget", "profile"),
+])
+def test_declined_save_does_not_start_file_on_later_save(window, tmp_path, monkeypatch, entry_point, panel, start):
+    path = _open_modified_file_changed_on_disk(window, tmp_path)
+    started = []
+    monkeypatch.setattr(getattr(window, panel), start, started.append)
+
+    _answer(monkeypatch, QMessageBox.No)
+    getattr(window, entry_point)()
+    assert window.code_editor.get_current_widget().is_modified()
+
+    _answer(monkeypatch, QMessageBox.Yes)
+    window.save_file()
+    wait_until(lambda: not window.code_editor.get_current_widget().is_modified())
+    process_events_for(0.1)
+
+    assert started == []
+    assert open(path).read() == "print(1)\nx = 1\n"
+
+
+@pytest.mark.parametrize("entry_point, panel, start", [
+    ("run_file", "run_console_widget", "run"),
+    ("profile_file", "profiler_widget", "profile"),
+])
+def test_accepted_save_starts_file_when_written(window, tmp_path, monkeypatch, entry_point, panel, start):
+    path = _open_modified_file_changed_on_disk(window, tmp_path)
+    started = []
+    monkeypatch.setattr(getattr(window, panel), start, started.append)
+
+    _answer(monkeypatch, QMessageBox.Yes)
+    getattr(window, entry_point)()
+    wait_until(lambda: started)
+
+    assert started == [window.code_editor.document_registry.normalize(path)]
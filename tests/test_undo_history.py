@@ -0,0 +1,100 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import Qt, QEvent
+from PyQt5.QtGui import QKeyEvent, QTextCursor, QTextDocument
+from PyQt5.QtWidgets import QApplication
+
+from pride.widgets.code_editor import CodeEditorWidget
+
+_application = QApplication.instance() or QApplication([])
+
+
+def create_editor(text: str) -> CodeEditorWidget:
+    """
+    Create editor with unmodified text, like after loading of file.
+    """
+    editor = CodeEditorWidget()
+    editor.undo_history.suspend()
+    editor.get_document().setPlainText(text)
+    editor.undo_history.reset()
+    return editor
+
+
+def press(editor: CodeEditorWidget, key: int, text: str = "") -> None:
+    _application.sendEvent(editor._code_editor, QKeyEvent(QEvent.KeyPress, key, Qt.NoModifier, text))
+
+
+def type_text(editor: CodeEditorWidget, text: str) -> None:
+    for character in text:
+        press(editor, 0, character)
+
+
+def replay(text: str, changes: list) -> str:
+    document = QTextDocument()
+    document.setPlainText(text)
+    cursor = QTextCursor(document)
+    for position, removed, added in changes:
+        cursor.setPosition(position)
+        cursor.setPosition(position + removed, QTextCursor.KeepAnchor)
+        cursor.insertText(added)
+    return document.toPlainText()
+
+
+def test_typing_after_character_outside_of_basic_plane():
+    original = 'x = "\U0001F600"\ny = 1\n'
+    editor = create_editor(original)
+    changes = []
+    editor.undo_history.text_changed.connect(lambda *change: changes.append(change))
+
+    editor.go_to_line(1)
+    press(editor, Qt.Key_End)
+    type_text(editor, " # \U0001F600 smile")
+    editor.go_to_line(2)
+    press(editor, Qt.Key_End)
+    type_text(editor, "0")
+    press(editor, Qt.Key_Backspace)
+    press(editor, Qt.Key_Backspace)
+    type_text(editor, "2")
+    expected = 'x = "\U0001F600" # \U0001F600 smile\ny = 2\n'
+    assert editor.get_plain_text() == expected
+
+    # journal replays reported changes by positions of QTextCursor
+    assert replay(original, changes) == expected
+
+    while editor.undo_history.undo() is not None:
+        pass
+    assert editor.get_plain_text() == original
+    assert not editor.is_modified()
+    while editor.undo_history.redo() is not None:
+        pass
+    assert editor.get_plain_text() == expected
+
+
+def test_backspace_of_character_outside_of_basic_plane():
+    original = "a\U0001F600\U0001F600b"
+    editor = create_editor(original)
+    press(editor, Qt.Key_End)
+    press(editor, Qt.Key_Left)
+    press(editor, Qt.Key_Backspace)
+    press(editor, Qt.Key_Backspace)
+    assert editor.get_plain_text() == "ab"
+    assert editor.undo_history.undo_count() == 1
+
+    editor.undo_history.undo()
+    assert editor.get_plain_text() == original
+
+
+def test_selection_replaced_by_typing():
+    original = "first line\nsecond \U0001F600 line\nthird line"
+    editor = create_editor(original)
+    cursor = editor.get_cursor()
+    cursor.setPosition(6)
+    cursor.setPosition(len("first line\nsecond \U0001F600 li") + 1, QTextCursor.KeepAnchor)
+    editor._code_editor.setTextCursor(cursor)
+    type_text(editor, "X")
+    assert editor.get_plain_text() == "first Xne\nthird line"
+
+    editor.undo_history.undo()
+    assert editor.get_plain_text() == original